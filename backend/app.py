@@ -15,6 +15,8 @@ from routes.report_routes import report_bp
 from routes.tracker_routes import tracker_bp
 from routes.admin_routes import admin_bp
 from routes.status_routes import status_bp
+from utils.migrations import run_migrations
+from utils.skill_taxonomy import load_taxonomy, refresh_matcher
 
 
 
@@ -49,6 +51,16 @@ app.register_blueprint(status_bp)
 
 
 
+@app.before_request
+def reload_skill_taxonomy():
+    # Throttled version check; picks up taxonomy edits made by other processes
+    try:
+        refresh_matcher()
+    except Exception as e:
+        db.session.rollback()
+        app.logger.warning(f"Skill taxonomy refresh skipped: {e}")
+
+
 @app.route("/")
 def home():
     return "RadarX Backend is running! 🚀"
@@ -59,5 +71,6 @@ for rule in app.url_map.iter_rules():
 
 if __name__ == "__main__":
     with app.app_context():
-        db.create_all()
+        run_migrations()
+        load_taxonomy()
     app.run(debug=True)
@@ -0,0 +1,103 @@
+"""
+Recall / latency benchmark: HNSW profile index vs the exact cosine path.
+
+    python benchmarks/ann_recall.py --synthetic 100000 --dim 384
+    python benchmarks/ann_recall.py --from-db --queries 200
+
+Prints recall@k and mean query latency for each (M, ef_search) combination so
+`ann_m` / `ann_ef_search` can be picked from the Config table.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import hnswlib
+
+
+def load_db_vectors():
+    from app import app
+    from models import db, Profile
+    from utils.vector_codec import load_embedding
+
+    with app.app_context():
+        rows = db.session.query(
+            Profile.id, Profile.embedding_blob, Profile.embedding_dim, Profile.embedding_vector
+        ).all()
+        pairs = [(row.id, load_embedding(row)) for row in rows]
+    pairs = [(pid, vec) for pid, vec in pairs if vec is not None and len(vec)]
+    ids = np.asarray([pid for pid, _ in pairs], dtype=np.int64)
+    return ids, np.vstack([vec for _, vec in pairs]).astype(np.float32)
+
+
+def synthetic_vectors(n, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    # Clustered data behaves more like real embeddings than pure noise
+    centers = rng.normal(size=(max(n // 500, 8), dim)).astype(np.float32)
+    assignment = rng.integers(0, len(centers), size=n)
+    vectors = centers[assignment] + 0.35 * rng.normal(size=(n, dim)).astype(np.float32)
+    return np.arange(1, n + 1, dtype=np.int64), vectors
+
+
+def normalise(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def exact_topk(matrix, queries, k):
+    start = time.perf_counter()
+    sims = queries @ matrix.T
+    top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    elapsed = (time.perf_counter() - start) / len(queries)
+    return [set(row) for row in top], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--synthetic", type=int, metavar="N", help="benchmark on N random clustered vectors")
+    source.add_argument("--from-db", action="store_true", help="benchmark on stored profile embeddings")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--m", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--ef-construction", type=int, default=200)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[32, 64, 128, 256])
+    args = parser.parse_args()
+
+    ids, vectors = load_db_vectors() if args.from_db else synthetic_vectors(args.synthetic, args.dim)
+    matrix = normalise(vectors)
+    n, dim = matrix.shape
+    k = min(args.k, n)
+
+    rng = np.random.default_rng(1)
+    query_rows = rng.choice(n, size=min(args.queries, n), replace=False)
+    queries = normalise(matrix[query_rows] + 0.1 * rng.normal(size=(len(query_rows), dim)).astype(np.float32))
+
+    truth, exact_latency = exact_topk(matrix, queries, k)
+    print(f"Pool: {n} vectors × {dim} dims, {len(queries)} queries, k={k}")
+    print(f"exact            recall=1.000  latency={exact_latency * 1000:.2f} ms/query")
+
+    for m in args.m:
+        start = time.perf_counter()
+        index = hnswlib.Index(space="cosine", dim=dim)
+        index.init_index(max_elements=n, M=m, ef_construction=args.ef_construction)
+        index.add_items(matrix, np.arange(n))
+        build_seconds = time.perf_counter() - start
+
+        for ef in args.ef_search:
+            index.set_ef(max(ef, k))
+            start = time.perf_counter()
+            labels, _ = index.knn_query(queries, k=k, num_threads=1)
+            latency = (time.perf_counter() - start) / len(queries)
+            recall = np.mean([len(truth[i] & set(labels[i])) / k for i in range(len(queries))])
+            print(f"hnsw M={m:<3} ef={ef:<4} recall={recall:.3f}  latency={latency * 1000:.2f} ms/query"
+                  f"  (build {build_seconds:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
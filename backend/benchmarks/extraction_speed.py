@@ -0,0 +1,92 @@
+"""
+Text extraction benchmark: pages/sec per backend over a sample corpus.
+
+    python benchmarks/extraction_speed.py                       # repo sample PDFs + uploads/
+    python benchmarks/extraction_speed.py --corpus path/to/pdfs --repeat 3 --parallel
+
+For every installed PDF engine this reports pages/sec, chars/sec and how
+closely its text agrees with the reference engine (token Jaccard). Pick the
+fastest engine that is still close enough and set the `extract_pdf_engine`
+config key to it.
+"""
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.extractors import ENGINES, extract_document
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_CORPUS = [REPO_ROOT, os.path.join(REPO_ROOT, "backend", "uploads")]
+
+
+def find_pdfs(paths):
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(path)
+        else:
+            found.extend(glob.glob(os.path.join(path, "**", "*.pdf"), recursive=True))
+    return sorted(set(found))
+
+
+def tokens(text):
+    return set(re.findall(r"\w+", (text or "").lower()))
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / max(len(a | b), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", nargs="+", default=DEFAULT_CORPUS, help="PDF files or folders")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=0, help="0 = no page cap")
+    parser.add_argument("--parallel", action="store_true", help="allow page-parallel extraction")
+    parser.add_argument("--reference", default="pypdf2", help="engine whose output is the quality baseline")
+    args = parser.parse_args()
+
+    pdfs = find_pdfs(args.corpus)
+    if not pdfs:
+        sys.exit("No PDFs found in corpus")
+    engines = [e for e in ENGINES.values() if ".pdf" in e.extensions and e.available()]
+    print(f"{len(pdfs)} PDFs; engines: {', '.join(e.name for e in engines)}")
+
+    reference = {}
+    if ENGINES[args.reference].available():
+        reference = {p: tokens(extract_document(p, engine=args.reference, max_pages=args.max_pages,
+                                                max_chars=0, parallel=False)) for p in pdfs}
+
+    print(f"{'engine':>10} {'pages':>6} {'sec':>8} {'pages/s':>9} {'chars/s':>10} {'agree':>6} {'errors':>6}")
+    for engine in engines:
+        pages = chars = errors = 0
+        agreement = []
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for path in pdfs:
+                try:
+                    total = engine.page_count(path)
+                    text = extract_document(path, engine=engine.name, max_pages=args.max_pages,
+                                            max_chars=0, parallel=args.parallel)
+                except Exception:
+                    errors += 1
+                    continue
+                pages += min(total, args.max_pages) if args.max_pages else total
+                chars += len(text)
+                if path in reference:
+                    agreement.append(jaccard(tokens(text), reference[path]))
+        elapsed = time.perf_counter() - start
+        agree = sum(agreement) / len(agreement) if agreement else float("nan")
+        print(f"{engine.name:>10} {pages:>6} {elapsed:>8.3f} {pages / elapsed:>9.1f} {chars / elapsed:>10.0f} "
+              f"{agree:>6.2f} {errors:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Explanation concurrency benchmark against the local GenAI stub server.
+
+    python benchmarks/genai_concurrency.py --requests 20 --latency 1.0 --concurrency 1 4 8
+
+Starts benchmarks/genai_stub_server.py in-process and sends the same batch of
+prompts through GenAIClient at each concurrency level. With enough workers the
+batch takes about one call's latency instead of the sum of all of them.
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.genai_stub_server import make_server, StubHandler
+from utils.genai_client import GenAIClient, StubProvider
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests/second, 0 = unlimited")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = make_server(port=args.port, latency=args.latency, fail_rate=args.fail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    provider = StubProvider(f"http://127.0.0.1:{args.port}")
+    prompts = [f"prompt {i}" for i in range(args.requests)]
+
+    print(f"{'workers':>8} {'wall s':>8} {'serial s':>9} {'speedup':>8} {'ok':>4} {'failed':>6} {'peak':>5}")
+    for workers in args.concurrency:
+        StubHandler.stats.update(requests=0, failed=0, in_flight=0, max_in_flight=0)
+        client = GenAIClient(provider, max_concurrency=workers, rate_limit=args.rate_limit,
+                             timeout=args.timeout, max_retries=args.retries, backoff=0.1)
+        start = time.perf_counter()
+        results = client.complete_many(prompts)
+        wall = time.perf_counter() - start
+        client.close()
+
+        ok = sum(1 for r in results if not isinstance(r, Exception))
+        serial = args.latency * args.requests
+        print(f"{workers:>8} {wall:>8.2f} {serial:>9.2f} {serial / wall:>7.1f}x {ok:>4} "
+              f"{len(results) - ok:>6} {StubHandler.stats['max_in_flight']:>5}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
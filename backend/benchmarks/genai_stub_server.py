@@ -0,0 +1,95 @@
+"""
+Local stand-in for a GenAI chat provider, for testing explanation concurrency offline.
+
+    python benchmarks/genai_stub_server.py --port 8765 --latency 1.5 --fail-rate 0.1
+
+Point the app at it with the Config keys
+    genai_provider = stub
+    genai_base_url = http://127.0.0.1:8765
+    genai_enabled  = true
+
+POST /v1/chat {"prompt", "model"} → {"text"} after the configured latency.
+A fraction of requests can fail with 429 or 500 to exercise retries.
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 1.0
+    jitter = 0.0
+    fail_rate = 0.0
+    stats = {"requests": 0, "failed": 0, "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        if self.path != "/v1/chat":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+        try:
+            time.sleep(max(self.latency + random.uniform(-self.jitter, self.jitter), 0))
+            if random.random() < self.fail_rate:
+                with self.lock:
+                    self.stats["failed"] += 1
+                self.send_error(random.choice([429, 500]))
+                return
+            prompt = payload.get("prompt", "")
+            self._json(200, {"text": f"[stub {payload.get('model')}] {len(prompt)} prompt chars: good overall fit."})
+        finally:
+            with self.lock:
+                self.stats["in_flight"] -= 1
+
+    def do_GET(self):
+        if self.path == "/stats":
+            with self.lock:
+                self._json(200, dict(self.stats))
+        else:
+            self.send_error(404)
+
+    def _json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8765, latency=1.0, jitter=0.0, fail_rate=0.0):
+    StubHandler.latency, StubHandler.jitter, StubHandler.fail_rate = latency, jitter, fail_rate
+    return ThreadingHTTPServer((host, port), StubHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± seconds added to latency")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered 429/500")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency, args.jitter, args.fail_rate)
+    print(f"GenAI stub listening on http://{args.host}:{args.port} (latency {args.latency}s, fail rate {args.fail_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: single-pass compiled skill matcher vs the per-skill re.search loop.
+
+    python benchmarks/skill_matcher.py --iterations 200
+
+Runs both over the sample PDFs (or --corpus files) and prints mean time per
+document, speedup, and the documents where the two disagree. Differences are
+expected around c#, c++, .net and "c": those are the boundary cases the old
+\\b-based loop got wrong.
+"""
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.skill_extractor import ALL_SKILLS, extract_skills_contextual
+from utils.parser import extract_text
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def legacy_extract(text):
+    """The previous implementation: one uncompiled \\b search per skill."""
+    clean_text = text.lower()
+    detected = set()
+    for skill in ALL_SKILLS:
+        if re.search(rf"\b{re.escape(skill)}\b", clean_text):
+            detected.add(skill)
+    return sorted(detected)
+
+
+def load_corpus(paths):
+    texts = []
+    for path in paths:
+        files = [path] if os.path.isfile(path) else glob.glob(os.path.join(path, "**", "*.pdf"), recursive=True)
+        for f in files:
+            text = extract_text(f, settings={"engine": "auto", "max_pages": 0, "max_chars": 0}, parallel=False)
+            if text:
+                texts.append((os.path.basename(f), text))
+    return texts
+
+
+def timed(fn, texts, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for _, text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (iterations * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", nargs="+", default=[REPO_ROOT])
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    if not texts:
+        sys.exit("No documents found")
+    chars = sum(len(t) for _, t in texts) // len(texts)
+    print(f"{len(texts)} documents, {chars} chars on average, {len(ALL_SKILLS)} skills")
+
+    legacy = timed(legacy_extract, texts, args.iterations)
+    single = timed(extract_skills_contextual, texts, args.iterations)
+    print(f"per-skill re.search : {legacy * 1e6:9.1f} µs/doc")
+    print(f"single-pass matcher : {single * 1e6:9.1f} µs/doc  ({legacy / single:.1f}x)")
+
+    for name, text in texts:
+        old, new = set(legacy_extract(text)), set(extract_skills_contextual(text))
+        if old != new:
+            print(f"  {name}: only legacy {sorted(old - new)}, only new {sorted(new - old)}")
+
+
+if __name__ == "__main__":
+    main()
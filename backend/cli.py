@@ -0,0 +1,162 @@
+import argparse
+import multiprocessing
+from app import app
+from utils.migrations import run_migrations
+from models import db, Profile, Resume
+from utils.feature_store import FEATURE_VERSION, ensure_features
+from utils.skill_extractor import current_skill_version
+from utils.skill_taxonomy import load_taxonomy
+from utils.jd_facets import refresh_jd_facets
+
+# ─────────────────────────────────────────────
+# RadarX maintenance commands
+#   python cli.py migrate [--vacuum]
+#   python cli.py backfill-features [--batch-size N]
+#   python cli.py worker [--processes N]
+#   python cli.py ingest-zip resumes.zip roster.csv [--workers N]
+#   python cli.py watch-ingest [--path DIR] [--once]
+#   python cli.py backfill-fts [--no-optimize]
+# ─────────────────────────────────────────────
+
+
+def cmd_migrate(args):
+    with app.app_context():
+        results = run_migrations(vacuum=args.vacuum)
+        results["skill_taxonomy"] = load_taxonomy()
+    for step, result in results.items():
+        print(f"✅ {step}: {result}")
+
+
+def cmd_backfill_features(args):
+    with app.app_context():
+        load_taxonomy()
+        skills_version = current_skill_version()
+        for model in (Profile, Resume):
+            updated = 0
+            while True:
+                rows = model.query.filter(
+                    (model.feature_version.is_(None)) | (model.feature_version != FEATURE_VERSION) |
+                    (model.skills_version.is_(None)) | (model.skills_version != skills_version)
+                ).filter(model.extracted_text.isnot(None)).limit(args.batch_size).all()
+                if not rows:
+                    break
+                for row in rows:
+                    if ensure_features(row) is None:
+                        # nothing to extract from
+                        row.feature_version, row.skills_version = FEATURE_VERSION, skills_version
+                db.session.commit()
+                updated += len(rows)
+            print(f"✅ {model.__tablename__}: {updated} rows refreshed to feature v{FEATURE_VERSION}, "
+                  f"skill taxonomy v{skills_version}")
+        print(f"✅ jd: {refresh_jd_facets(args.batch_size)} rows refreshed to filter facets v{skills_version}")
+
+
+def cmd_worker(args):
+    from utils.job_queue import worker_process
+
+    with app.app_context():
+        run_migrations()
+        load_taxonomy()
+
+    processes = [
+        multiprocessing.Process(target=worker_process, args=(args.poll_interval,), daemon=False)
+        for _ in range(args.processes)
+    ]
+    for proc in processes:
+        proc.start()
+    print(f"🚀 Started {len(processes)} match worker(s). Ctrl+C to stop.")
+    try:
+        for proc in processes:
+            proc.join()
+    except KeyboardInterrupt:
+        # Running jobs are picked up again by the next worker once their heartbeat goes stale
+        for proc in processes:
+            proc.terminate()
+
+
+def cmd_ingest_zip(args):
+    from utils.bulk_ingest import ingest_archive
+
+    with app.app_context():
+        run_migrations()
+        load_taxonomy()
+        report = ingest_archive(
+            args.archive, args.roster, workers=args.workers, batch_size=args.batch_size,
+            commit_every=args.commit_every,
+            progress=lambda stage, done=None, total=None: print(f"… {stage}: {done}/{total}")
+        )
+    for failure in report["failures"]:
+        print(f"❌ {failure['file'] or '-'} ({failure['emp_id'] or '-'}): {failure['error']}")
+    print(f"✅ Ingested {report['ingested']} profiles, {report['failed']} failed, "
+          f"{report['docs_per_second']} docs/sec in {report['elapsed_seconds']}s {report['stage_seconds']}")
+
+
+def cmd_watch_ingest(args):
+    from utils.watch_ingest import watch
+
+    with app.app_context():
+        run_migrations()
+        load_taxonomy()
+        try:
+            totals = watch(args.path, workers=args.workers, batch_size=args.batch_size,
+                           queue_size=args.queue_size, poll_interval=args.poll_interval, once=args.once)
+            print(f"✅ Ingested {totals['ingested']} resumes, {totals['failed']} failed")
+        except KeyboardInterrupt:
+            # Committed batches are checkpointed; the next run resumes after them
+            print("⏹ Stopped")
+
+
+def cmd_backfill_fts(args):
+    from utils.fulltext import ensure_fulltext_tables, rebuild_fulltext
+
+    with app.app_context():
+        ensure_fulltext_tables()
+        counts = rebuild_fulltext(optimize=not args.no_optimize)
+    for table, count in counts.items():
+        print(f"✅ {table}: indexed {count} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RadarX maintenance commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    migrate = sub.add_parser("migrate", help="Apply schema and data migrations")
+    migrate.add_argument("--vacuum", action="store_true", help="Reclaim space after converting data")
+    migrate.set_defaults(func=cmd_migrate)
+
+    backfill = sub.add_parser("backfill-features", help="Compute stored scoring features for stale rows")
+    backfill.add_argument("--batch-size", type=int, default=200)
+    backfill.set_defaults(func=cmd_backfill_features)
+
+    worker = sub.add_parser("worker", help="Run background match workers")
+    worker.add_argument("--processes", type=int, default=2)
+    worker.add_argument("--poll-interval", type=float, default=1.0)
+    worker.set_defaults(func=cmd_worker)
+
+    ingest = sub.add_parser("ingest-zip", help="Bulk-ingest consultant resumes from a ZIP + CSV roster")
+    ingest.add_argument("archive", help="ZIP of resume files")
+    ingest.add_argument("roster", help="CSV with emp_id,email[,name,vertical,file,role,status,experience_years]")
+    ingest.add_argument("--workers", type=int, default=None, help="extraction processes (default: CPU count)")
+    ingest.add_argument("--batch-size", type=int, default=32, help="texts per encode call")
+    ingest.add_argument("--commit-every", type=int, default=100, help="profiles per commit")
+    ingest.set_defaults(func=cmd_ingest_zip)
+
+    watch = sub.add_parser("watch-ingest", help="Ingest resumes dropped into a folder (resumable)")
+    watch.add_argument("--path", default=None, help="folder to watch (default: uploads/incoming)")
+    watch.add_argument("--workers", type=int, default=None, help="extraction processes (default: CPU count)")
+    watch.add_argument("--batch-size", type=int, default=16, help="documents per encode call and commit")
+    watch.add_argument("--queue-size", type=int, default=4, help="batches buffered between stages")
+    watch.add_argument("--poll-interval", type=float, default=5.0)
+    watch.add_argument("--once", action="store_true", help="process what is there now and exit")
+    watch.set_defaults(func=cmd_watch_ingest)
+
+    fts = sub.add_parser("backfill-fts", help="Rebuild the full-text search indexes from profile / jd text")
+    fts.add_argument("--no-optimize", action="store_true", help="skip merging index segments afterwards")
+    fts.set_defaults(func=cmd_backfill_fts)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, ForeignKey, Index, LargeBinary, event
 
 db = SQLAlchemy()
 
@@ -23,13 +23,33 @@ class JD(db.Model):
     uploaded_by = Column(String)
     project_code = Column(String)
     job_title = Column(String)
+    content_hash = Column(String(64), index=True)  # sha256 of the uploaded file (utils/upload_store.py)
     extracted_text = Column(Text)
-    embedding_vector = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Filter facets computed once at upload (utils/jd_facets.py)
+    skills = Column(Text)  # comma-joined; mirrored into jd_skill for filtering
+    required_experience = Column(Integer, index=True)
+    is_fresher = Column(Boolean, index=True)
+    facets_version = Column(Integer, index=True)  # skill taxonomy version the facets were extracted with
+    embedding_vector = Column(Text)  # legacy JSON, superseded by embedding_blob
+    embedding_blob = Column(LargeBinary)  # raw float32 bytes
+    embedding_dim = Column(Integer)
+    embedding_model = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
  
-    status = Column(String, default="Pending")  # ✅ New column for tracking JD status
+    status = Column(String, default="Pending", index=True)  # ✅ New column for tracking JD status
  
     match_results = db.relationship('MatchResult', backref='jd', lazy=True)
+    skill_rows = db.relationship('JDSkill', cascade='all, delete-orphan', lazy=True)
+
+
+class JDSkill(db.Model):
+    __tablename__ = 'jd_skill'
+    jd_id = Column(Integer, ForeignKey('jd.id'), primary_key=True)
+    skill = Column(String, primary_key=True)  # canonical, lower-case
+    __table_args__ = (
+        Index('ix_jd_skill_skill', 'skill', 'jd_id'),
+    )
 
 
 # ─────────────── CONSULTANT PROFILES ────────────────
@@ -37,19 +57,62 @@ class Profile(db.Model):
     __tablename__ = 'profile'
     id = Column(Integer, primary_key=True)
     emp_id = Column(String, unique=True, nullable=False)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, index=True)
     email=Column(String,nullable=False)
     role=Column(String, nullable=False)
     status=Column(String,nullable=False)
-    vertical = Column(String)
-    skills = Column(Text)
-    experience_years = Column(Float)
+    vertical = Column(String)  # searched through ix_profile_vertical_nocase (utils/migrations.py)
+    skills = Column(Text)      # comma-joined; mirrored into profile_skill for search
+    experience_years = Column(Float, index=True)
     resume_path = Column(String)
+    content_hash = Column(String(64), index=True)
     extracted_text = Column(Text)
-    embedding_vector = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Scoring features computed once at upload (utils/feature_store.py)
+    projects = Column(Text)        # JSON list
+    certifications = Column(Text)  # JSON list
+    project_hits = Column(Integer)
+    cert_hits = Column(Integer)
+    human_signal_score = Column(Float)
+    inferred_vertical = Column(String)
+    feature_version = Column(Integer)
+    skills_version = Column(Integer)  # skill taxonomy version the skills column was extracted with
+    embedding_vector = Column(Text)  # legacy JSON, superseded by embedding_blob
+    embedding_blob = Column(LargeBinary)  # raw float32 bytes
+    embedding_dim = Column(Integer)
+    embedding_model = Column(String)
+    vector_revision = Column(Integer, index=True)  # change_counter value of the last embedding write (trigger-maintained)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     match_results = db.relationship('MatchResult', backref='profile', lazy=True)
+    skill_rows = db.relationship('ProfileSkill', cascade='all, delete-orphan', lazy=True)
+
+
+# Normalized skill → profile inverted index for /profiles/search. The primary
+# key serves profile → skills; ix_profile_skill_skill serves skill → profiles.
+class ProfileSkill(db.Model):
+    __tablename__ = 'profile_skill'
+    profile_id = Column(Integer, ForeignKey('profile.id'), primary_key=True)
+    skill = Column(String, primary_key=True)  # canonical, lower-case
+    __table_args__ = (
+        Index('ix_profile_skill_skill', 'skill', 'profile_id'),
+    )
+
+
+def split_skills(value):
+    """Distinct lower-case skills of a comma-joined skills column."""
+    return sorted({s.strip().lower() for s in (value or "").split(",") if s.strip()})
+
+
+@event.listens_for(Profile.skills, 'set')
+def _sync_profile_skills(target, value, oldvalue, initiator):
+    # Any write to Profile.skills (upload, bulk ingest, feature refresh) rewrites its index rows
+    target.skill_rows = [ProfileSkill(skill=s) for s in split_skills(value)]
+
+
+@event.listens_for(JD.skills, 'set')
+def _sync_jd_skills(target, value, oldvalue, initiator):
+    target.skill_rows = [JDSkill(skill=s) for s in split_skills(value)]
 
 
 # ─────────────── LEGACY RESUMES ────────────────
@@ -64,8 +127,17 @@ class Resume(db.Model):
     certifications = Column(Text)
     projects = Column(Text)
     domain = Column(String)
+    content_hash = Column(String(64), index=True)
     extracted_text = Column(Text)
-    embedding_vector = Column(Text)
+    project_hits = Column(Integer)
+    cert_hits = Column(Integer)
+    human_signal_score = Column(Float)
+    feature_version = Column(Integer)
+    skills_version = Column(Integer)
+    embedding_vector = Column(Text)  # legacy JSON, superseded by embedding_blob
+    embedding_blob = Column(LargeBinary)  # raw float32 bytes
+    embedding_dim = Column(Integer)
+    embedding_model = Column(String)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
 
     match_results = db.relationship('MatchResult', backref='resume', lazy=True)
@@ -84,6 +156,7 @@ class MatchResult(db.Model):
     method = Column(String)      # 'SBERT', 'GPT', etc.
     latency = Column(Float)
     explanation_latency = Column(Float)
+    job_id = Column(Integer, ForeignKey('match_job.id'), nullable=True, index=True)  # background job that wrote it
     created_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
@@ -168,3 +241,89 @@ class Prompt(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True)
     content = db.Column(db.Text)
+
+
+# ─────────────── BACKGROUND MATCH JOBS ────────────────
+class MatchJob(db.Model):
+    __tablename__ = 'match_job'
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)  # 'jd-to-resumes', 'resume-to-jds'
+    payload = Column(Text)                 # JSON request arguments
+    status = Column(String, default="queued", index=True)  # queued, running, done, failed
+    stage = Column(String)
+    progress_done = Column(Integer, default=0)
+    progress_total = Column(Integer, default=0)
+    result = Column(Text)                  # JSON response payload
+    result_status = Column(Integer)        # HTTP status the sync route would have returned
+    error = Column(Text)
+    attempts = Column(Integer, default=0)
+    worker_id = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+
+# ─────────────── GENAI RESPONSE CACHE ────────────────
+class GenAICache(db.Model):
+    __tablename__ = 'genai_cache'
+    id = Column(Integer, primary_key=True)
+    cache_key = Column(String(64), unique=True, nullable=False)  # sha256 of provider/model/prompt inputs
+    provider = Column(String)
+    model = Column(String)
+    response = Column(Text, nullable=False)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+# ─────────────── WATCH-FOLDER INGESTION CHECKPOINT ────────────────
+class IngestCheckpoint(db.Model):
+    __tablename__ = 'ingest_checkpoint'
+    id = Column(Integer, primary_key=True)
+    path = Column(String, unique=True, nullable=False)  # absolute path of the dropped file
+    size = Column(Integer)
+    mtime_ns = Column(Integer)
+    status = Column(String, index=True)                 # done, failed
+    resume_id = Column(Integer, ForeignKey('resume.id'), nullable=True)
+    error = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# ─────────────── CONTENT-ADDRESSED DOCUMENT CACHE ────────────────
+class DocumentCache(db.Model):
+    __tablename__ = 'document_cache'
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), unique=True, nullable=False)
+    extension = Column(String)
+    size = Column(Integer)
+    extracted_text = Column(Text)
+    features = Column(Text)          # JSON feature dict (utils/feature_store.py)
+    feature_version = Column(Integer)
+    embedding_blob = Column(LargeBinary)
+    embedding_dim = Column(Integer)
+    embedding_model = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+
+# ─────────────── SKILL TAXONOMY ────────────────
+class Skill(db.Model):
+    __tablename__ = 'skill'
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)  # canonical, lower-case
+    category = Column(String, index=True)               # language, framework, tool, cloud, library, soft
+    synonyms = Column(Text)                             # JSON list of alternative spellings
+    active = Column(Boolean, default=True)
+    revision = Column(Integer, nullable=False, default=1)  # taxonomy version of the last edit
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# ─────────────── CHANGE COUNTERS ────────────────
+# Bumped by SQLite triggers (utils/migrations.py) on every insert, delete and
+# embedding update of the named table, so in-memory indexes in any process
+# can tell that the table changed, even when a replaced row reuses its id.
+class ChangeCounter(db.Model):
+    __tablename__ = 'change_counter'
+    name = Column(String, primary_key=True)
+    revision = Column(Integer, nullable=False, default=0)
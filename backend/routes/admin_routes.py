@@ -1,20 +1,22 @@
 from flask import Blueprint, request, jsonify
-from models import db, Config, User
+from models import db, User
 from datetime import datetime
-from utils.admin_utils import save_or_update_config
+from utils.admin_utils import save_or_update_config, get_all_config_dict, ALLOWED_CONFIG_KEYS
 from models import Prompt
+from utils import config_cache
+from utils.skill_taxonomy import list_skills, save_skill, deactivate_skill
+from utils.job_queue import queue_facet_refresh
+from utils.utils import log_agent_error
 
 admin_bp = Blueprint('admin_bp', __name__)
 
 # ─────────────────────────────
 # CONFIGURATION ROUTES
 # ─────────────────────────────
-ALLOWED_CONFIG_KEYS = {"genai_key", "genai_provider", "genai_enabled", "genai_prompt","match_threshold"}
-
 
 @admin_bp.route('/admin/config', methods=['GET'])
 def get_all_configs():
-    existing = {conf.key: conf.value for conf in Config.query.all()}
+    existing = get_all_config_dict()
     for key in ALLOWED_CONFIG_KEYS:
         existing.setdefault(key, "")
     return jsonify([{"key": k, "value": v} for k, v in existing.items()])
@@ -44,8 +46,47 @@ def update_config():
 
     except Exception as e:
         print("❌ Server error:", e)
+        db.session.rollback()
+        config_cache.invalidate()
         return jsonify({"error": f"Unexpected server error: {str(e)}"}), 500
 
+# ─────────────────────────────
+# SKILL TAXONOMY ROUTES
+# ─────────────────────────────
+
+@admin_bp.route('/admin/skills', methods=['GET'])
+def get_skills():
+    include_inactive = request.args.get("include_inactive", "false").lower() == "true"
+    return jsonify(list_skills(include_inactive=include_inactive))
+
+@admin_bp.route('/admin/skills', methods=['POST'])
+def upsert_skill():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Missing JSON body"}), 400
+        result, status_code = save_skill(data)
+        if status_code < 400:
+            result["facet_refresh_job_id"] = queue_facet_refresh().id
+        return jsonify(result), status_code
+    except Exception as e:
+        db.session.rollback()
+        log_agent_error("SaveSkill", str(e), method="admin-skills")
+        return jsonify({"error": "Failed to save skill"}), 500
+
+@admin_bp.route('/admin/skills/<int:skill_id>', methods=['DELETE'])
+def remove_skill(skill_id):
+    try:
+        result, status_code = deactivate_skill(skill_id)
+        if status_code < 400:
+            result["facet_refresh_job_id"] = queue_facet_refresh().id
+        return jsonify(result), status_code
+    except Exception as e:
+        db.session.rollback()
+        log_agent_error("DeactivateSkill", str(e), method="admin-skills")
+        return jsonify({"error": "Failed to deactivate skill"}), 500
+
+# ─────────────────────────────
 # USER MANAGEMENT ROUTES
 # ─────────────────────────────
 
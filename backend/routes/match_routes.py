@@ -1,15 +1,16 @@
-import os
 import json
 import time
 from flask import Blueprint, request, jsonify
-from models import db, JD, Resume, Profile, MatchResult, MatchLearningCache, LiveStatusTracker, Config
-from utils.parser import extract_text
-from utils.matcher import compute_full_text_score
-from utils.explainer import generate_explanation
+from models import db, JD, Resume, Profile, MatchResult, MatchJob
+from utils.upload_store import document_text
+from utils.explainer import generate_explanation, generate_explanations
 from utils.utils import log_agent_error
 from utils.matcher import compute_full_text_score
-from utils.logger import logger
-
+from utils.vector_codec import load_embedding
+from utils.feature_store import ensure_features
+from utils.jd_features import get_jd_features
+from utils.match_service import run_jd_to_profiles, run_resume_to_jds, get_label
+from utils.job_queue import submit_job, job_to_dict
 
 match_bp = Blueprint('match_bp', __name__)
 
@@ -23,107 +24,15 @@ def truncate_explanation_fields(explanation):
 # ─────────────────────────────────────────────
 @match_bp.route('/match/jd-to-resumes', methods=['POST'])
 def match_jd_to_profiles():
-    jd_id = request.json.get('jd_id')
-    logger.info(f"JD-to-Resumes Match Request Received for JD ID: {jd_id}")
-
-    status = LiveStatusTracker.query.filter_by(jd_id=jd_id).first()
-    if status and status.compared and status.ranked:
-        logger.warning(f"⚠️ JD ID {jd_id} already matched. Ignoring duplicate call.")
-        return jsonify({"message": "Already matched", "top_matches": []}), 200
-
-    jd = JD.query.get(jd_id)
-    if not jd:
-        return jsonify({"error": "JD not found"}), 404
-
-    jd_text = jd.extracted_text or extract_text(jd.file_path)
-    if not jd_text:
-        return jsonify({"error": "Failed to extract JD text"}), 500
-
-    all_matches = []
-
-    with db.session.no_autoflush:
-        for profile in Profile.query.all():
-            try:
-                resume_text = profile.extracted_text or extract_text(profile.resume_path)
-                if not resume_text:
-                    continue
-
-                start_time = time.time()
-
-                score = compute_full_text_score(
-                    jd_embedding_str=jd.embedding_vector,
-                    profile_embedding_str=profile.embedding_vector,
-                    jd_text=jd_text,
-                    profile_text=resume_text,
-                    vertical=profile.vertical,
-                    experience_years=profile.experience_years,
-                    profile_skills=profile.skills,
-                    profile_projects=getattr(profile, 'projects', None),
-                    profile_certifications=getattr(profile, 'certifications', None)
-                )
-
-                explanation_start = time.time()
-                explanation = generate_explanation(jd_text, resume_text, use_gpt=True)
-                explanation_latency = round(time.time() - explanation_start, 4)
-                latency = round(time.time() - start_time, 4)
-
-                label = get_label(score)
-
-                match = MatchResult(
-                    jd_id=jd.id,
-                    profile_id=profile.id,
-                    resume_id=None,
-                    score=round(score, 4),
-                    explanation=json.dumps(truncate_explanation_fields(explanation)),
-                    match_type='jd-to-resume',
-                    method=explanation.get("source", "MultiScore"),
-                    latency=latency,
-                    explanation_latency=explanation_latency
-                )
-                db.session.add(match)
-
-                all_matches.append({
-                    "resume_id": None,
-                    "profile_id": profile.id,
-                    "emp_id": profile.emp_id,
-                    "name": profile.name,
-                    "email": profile.email,
-                    "vertical": profile.vertical,
-                    "role": profile.role,
-                    "status": profile.status,
-                    "resume_path": profile.resume_path,
-                    "score": round(score, 4),
-                    "label": label,
-                    "explanation": explanation,
-                    "latency": latency,
-                    "rank": len(all_matches) + 1
-                })
-
-            except Exception as e:
-                db.session.rollback()
-                log_agent_error("MatchError", str(e), method="jd-to-resume")
-                continue
-
-    try:
-        jd.status = "Review"
-        db.session.commit()
-    except Exception as e:
-        db.session.rollback()
-        log_agent_error("DBCommitError", str(e), method="jd-to-resume")
-        return jsonify({"error": "Database commit failed"}), 500
-
-    # Deduplicate by emp_id
-    seen_ids = set()
-    unique_matches = []
-    for match in all_matches:
-        if match["emp_id"] not in seen_ids:
-            seen_ids.add(match["emp_id"])
-            unique_matches.append(match)
+    data = request.json
+    jd_id = data.get('jd_id')
 
-    unique_matches.sort(key=lambda x: x["score"], reverse=True)
+    if data.get('async'):
+        job = submit_job("jd-to-resumes", {"jd_id": jd_id})
+        return jsonify({"job_id": job.id, "status": job.status, "status_url": f"/match/jobs/{job.id}"}), 202
 
-    logger.info(f"Matching complete. Returning top {min(3, len(unique_matches))} profiles.")
-    return jsonify({"top_matches": unique_matches[:3]})
+    payload, status_code = run_jd_to_profiles(jd_id)
+    return jsonify(payload), status_code
 
 
 # ─────────────────────────────────────────────
@@ -142,19 +51,22 @@ def one_to_one_match():
         if not jd or not resume:
             return jsonify({"error": "JD or Resume not found"}), 404
 
-        jd_text = jd.extracted_text or extract_text(jd.file_path)
-        resume_text = resume.extracted_text or extract_text(resume.file_path)
+        jd_text = document_text(jd, jd.file_path)
+        resume_text = document_text(resume, resume.file_path)
         if not jd_text or not resume_text:
             return jsonify({"error": "Missing text content"}), 500
 
         start = time.time()
+        resume_vec = load_embedding(resume)
         score = compute_full_text_score(
-    jd.embedding_vector,
-    resume.embedding_vector,
+    load_embedding(jd),
+    resume_vec,
     jd_text,
     resume_text,
     None,
-    None
+    None,
+    profile_features=ensure_features(resume, resume_text),
+    jd_features=get_jd_features(jd.id, jd_text)
 )
 
 
@@ -193,64 +105,113 @@ def match_resume_to_jds():
     resume_id = data.get('resume_id')
     profile_id = data.get('profile_id')
 
-    resume = Resume.query.get(resume_id) if resume_id else Profile.query.get(profile_id)
+    if data.get('async'):
+        job = submit_job("resume-to-jds", {"resume_id": resume_id, "profile_id": profile_id})
+        return jsonify({"job_id": job.id, "status": job.status, "status_url": f"/match/jobs/{job.id}"}), 202
 
-    if not resume:
-        return jsonify({"error": "Resume/Profile not found"}), 404
+    payload, status_code = run_resume_to_jds(resume_id=resume_id, profile_id=profile_id)
+    return jsonify(payload), status_code
 
-    resume_text = resume.extracted_text or extract_text(resume.resume_path)
-    all_matches = []
-    start_time = time.time()
 
-    for jd in JD.query.all():
-        try:
-            jd_text = jd.extracted_text or extract_text(jd.file_path)
-            score = compute_full_text_score(
-    jd.embedding_vector,
-    resume.embedding_vector,
-    jd_text,
-    resume_text,
-    None,
-    None
-)
+def _match_texts(match):
+    """(jd_text, candidate_text) for a MatchResult, or None when either side is gone/empty."""
+    jd = match.jd
+    candidate = match.profile or match.resume
+    if not jd or not candidate:
+        return None
+    jd_text = document_text(jd, jd.file_path)
+    candidate_text = document_text(
+        candidate, getattr(candidate, "resume_path", None) or getattr(candidate, "file_path", None)
+    )
+    if not jd_text or not candidate_text:
+        return None
+    return jd_text, candidate_text
 
-            all_matches.append({
-                "jd": jd,
-                "score": round(score, 4),
-                "jd_text": jd_text
-            })
-            latency = round(time.time() - start_time, 4)
-        except Exception as e:
-            log_agent_error("ResumeToJDMatchError", str(e), method="resume-to-jd")
-
-    results = []
-    for i, match in enumerate(sorted(all_matches, key=lambda x: x["score"], reverse=True)[:3], start=1):
-        jd = match["jd"]
-        explanation = generate_explanation(jd_text, resume_text, use_gpt=True)
-
-        db.session.add(MatchResult(
-            jd_id=jd.id,
-            resume_id=resume_id if resume_id else None,
-            score=match["score"],
-            explanation=json.dumps(truncate_explanation_fields(explanation)),
-            match_type='resume-to-jd',
-            method=explanation.get("source", "MultiScore"),
-            latency=latency,
-            explanation_latency=0
-        ))
 
-        results.append({
-            "jd_id": jd.id,
-            "jd_file": os.path.basename(jd.file_path),
-            "job_title": jd.job_title,
-            "score": round(score, 4),
-            "label": get_label(match["score"]),
-            "explanation": explanation,
-            "rank": i
+# ─────────────────────────────────────────────
+@match_bp.route('/match/explanation/<int:match_id>', methods=['GET'])
+def get_match_explanation(match_id):
+    """Explanation for one match: generated on first request, then served from MatchResult."""
+    match = MatchResult.query.get(match_id)
+    if not match:
+        return jsonify({"error": "Match not found"}), 404
+
+    if match.explanation:
+        return jsonify({"match_id": match.id, "explanation": json.loads(match.explanation), "cached": True})
+
+    try:
+        texts = _match_texts(match)
+        if not texts:
+            return jsonify({"error": "JD or candidate text no longer available"}), 404
+
+        start = time.time()
+        explanation = truncate_explanation_fields(generate_explanation(*texts, use_gpt=True))
+        match.explanation = json.dumps(explanation)
+        match.explanation_latency = round(time.time() - start, 4)
+        match.method = explanation.get("source", match.method)
+        db.session.commit()
+
+        return jsonify({"match_id": match.id, "explanation": explanation, "cached": False})
+
+    except Exception as e:
+        db.session.rollback()
+        log_agent_error("ExplanationError", str(e), method="match-explanation")
+        return jsonify({"error": "Failed to generate explanation"}), 500
+
+
+# ─────────────────────────────────────────────
+@match_bp.route('/match/explanations', methods=['POST'])
+def get_match_explanations():
+    """Batch variant: missing explanations are generated concurrently (GenAI calls run in parallel)."""
+    match_ids = (request.json or {}).get("match_ids") or []
+    if not isinstance(match_ids, list) or not match_ids:
+        return jsonify({"error": "match_ids must be a non-empty list"}), 400
+
+    try:
+        matches = MatchResult.query.filter(MatchResult.id.in_(match_ids)).all()
+        results = {m.id: {"match_id": m.id, "explanation": json.loads(m.explanation), "cached": True}
+                   for m in matches if m.explanation}
+
+        pending, pairs = [], []
+        for match in matches:
+            if match.explanation:
+                continue
+            texts = _match_texts(match)
+            if not texts:
+                results[match.id] = {"match_id": match.id, "error": "JD or candidate text no longer available"}
+                continue
+            pending.append(match)
+            pairs.append(texts)
+
+        start = time.time()
+        explanations = generate_explanations(pairs, use_gpt=True)
+        latency = round(time.time() - start, 4)
+        for match, explanation in zip(pending, explanations):
+            explanation = truncate_explanation_fields(explanation)
+            match.explanation = json.dumps(explanation)
+            match.explanation_latency = latency
+            match.method = explanation.get("source", match.method)
+            results[match.id] = {"match_id": match.id, "explanation": explanation, "cached": False}
+        db.session.commit()
+
+        return jsonify({
+            "explanations": [results.get(mid, {"match_id": mid, "error": "Match not found"}) for mid in match_ids],
+            "latency": latency
         })
 
-    db.session.commit()
-    return jsonify({"top_matches": results})
+    except Exception as e:
+        db.session.rollback()
+        log_agent_error("ExplanationError", str(e), method="match-explanations")
+        return jsonify({"error": "Failed to generate explanations"}), 500
+
+
+# ─────────────────────────────────────────────
+@match_bp.route('/match/jobs/<int:job_id>', methods=['GET'])
+def get_match_job(job_id):
+    job = MatchJob.query.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job_to_dict(job))
 
 
 # ─────────────────────────────────────────────
@@ -283,14 +244,3 @@ def get_existing_matches(jd_id):
 @match_bp.route('/match/health', methods=['GET'])
 def match_health():
     return jsonify({"status": "Match engine ready ✅"})
-
-
-def get_label(score):
-    if score >= 0.85:
-        return "✅ Highly Recommended"
-    elif score >= 0.70:
-        return "☑️ Recommended"
-    elif score >= 0.50:
-        return "🟡 Decent – Can Explore"
-    else:
-        return "🔴 Not Recommended"
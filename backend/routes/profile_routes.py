@@ -1,10 +1,13 @@
 from flask import Blueprint, request, jsonify
 
-from sqlalchemy import or_
+from sqlalchemy import or_, select, intersect
 
 
-from models import JD, MatchResult, Profile
-from sqlalchemy.orm import joinedload
+from models import JD, MatchResult, Profile, ProfileSkill
+from sqlalchemy.orm import joinedload, load_only
+from utils.skill_extractor import canonical_skill
+from utils.fulltext import timed_search, FullTextQueryError, DEFAULT_LIMIT, MAX_LIMIT
+from utils.utils import log_agent_error
 
 profile_bp = Blueprint('profile_bp', __name__)
 
@@ -16,6 +19,7 @@ def search_profiles():
     skills = request.args.get('skills', '').strip()
     min_exp = request.args.get('min_exp', type=float)
     max_exp = request.args.get('max_exp', type=float)
+    skill_mode = request.args.get('skill_mode', 'all').strip().lower()
 
     query = Profile.query
 
@@ -27,13 +31,20 @@ def search_profiles():
             Profile.emp_id.ilike(f"%{search_term}%")
         ))
 
+    # Case-insensitive exact match, served by ix_profile_vertical_nocase
     if vertical:
-        query = query.filter(Profile.vertical.ilike(f"%{vertical}%"))
-
-    if skills:
-        skill_list = [s.strip().lower() for s in skills.split(',') if s.strip()]
-        for skill in skill_list:
-            query = query.filter(Profile.skills.ilike(f"%{skill}%"))
+        query = query.filter(Profile.vertical.collate('NOCASE') == vertical)
+
+    # Exact skill matches through the profile_skill index: one index range
+    # per skill, intersected (skill_mode=all, default) or merged (any)
+    skill_list = sorted({canonical_skill(s) for s in skills.split(',') if s.strip()})
+    if skill_list:
+        if skill_mode == 'any':
+            matching = select(ProfileSkill.profile_id).where(ProfileSkill.skill.in_(skill_list))
+        else:
+            per_skill = [select(ProfileSkill.profile_id).where(ProfileSkill.skill == s) for s in skill_list]
+            matching = per_skill[0] if len(per_skill) == 1 else intersect(*per_skill)
+        query = query.filter(Profile.id.in_(matching))
 
     if min_exp is not None:
         query = query.filter(Profile.experience_years >= min_exp)
@@ -58,6 +69,58 @@ def search_profiles():
 
 
 
+@profile_bp.route('/search/fulltext', methods=['GET'])
+def search_fulltext():
+    """BM25-ranked free-text search over profile and/or JD text, with snippets."""
+    q = request.args.get('q', '').strip()
+    scope = request.args.get('scope', 'profiles').strip().lower()
+    mode = request.args.get('mode', 'all').strip().lower()
+    limit = min(request.args.get('limit', default=DEFAULT_LIMIT, type=int), MAX_LIMIT)
+
+    if not q:
+        return jsonify({"error": "Missing query parameter 'q'"}), 400
+    if scope not in ('profiles', 'jds', 'all'):
+        return jsonify({"error": "scope must be profiles, jds or all"}), 400
+
+    try:
+        response = {"query": q, "mode": mode}
+        if scope in ('profiles', 'all'):
+            hits, took_ms = timed_search('profile', q, limit=limit, mode=mode)
+            rows = {p.id: p for p in Profile.query.options(load_only(
+                Profile.emp_id, Profile.name, Profile.vertical, Profile.experience_years
+            )).filter(Profile.id.in_([h["id"] for h in hits])).all()}
+            response["profiles"] = [{
+                "id": h["id"],
+                "emp_id": rows[h["id"]].emp_id,
+                "name": rows[h["id"]].name,
+                "vertical": rows[h["id"]].vertical,
+                "experience_years": rows[h["id"]].experience_years,
+                "score": h["score"],
+                "snippet": h["snippet"]
+            } for h in hits if h["id"] in rows]
+            response["profiles_ms"] = took_ms
+        if scope in ('jds', 'all'):
+            hits, took_ms = timed_search('jd', q, limit=limit, mode=mode)
+            rows = {j.id: j for j in JD.query.options(load_only(
+                JD.job_title, JD.project_code, JD.status
+            )).filter(JD.id.in_([h["id"] for h in hits])).all()}
+            response["jds"] = [{
+                "id": h["id"],
+                "job_title": rows[h["id"]].job_title,
+                "project_code": rows[h["id"]].project_code,
+                "status": rows[h["id"]].status,
+                "score": h["score"],
+                "snippet": h["snippet"]
+            } for h in hits if h["id"] in rows]
+            response["jds_ms"] = took_ms
+        return jsonify(response)
+    except FullTextQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        log_agent_error("FullTextSearch", str(e), method="search-fulltext")
+        return jsonify({"error": "Full-text search failed"}), 500
+
+
 @profile_bp.route('/jd/<int:jd_id>/matches', methods=['GET'])
 def get_matches_for_jd(jd_id):
     jd = JD.query.get(jd_id)
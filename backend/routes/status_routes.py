@@ -1,5 +1,9 @@
 from flask import Blueprint, jsonify
 from models import JD, MatchResult, EmailLog
+from utils.model_registry import get_model_stats
+from utils.parser import get_nlp_stats
+from utils.genai_cache import cache_stats
+from utils.admin_utils import get_config_float
 
 status_bp = Blueprint('status_bp', __name__)
 
@@ -17,7 +21,8 @@ def get_jd_status(jd_id):
     ranked = MatchResult.query.filter_by(jd_id=jd_id).count() > 0
 
     # Check: any recommended matches
-    recommended_found = MatchResult.query.filter_by(jd_id=jd_id).filter(MatchResult.score >= 0.50).count() > 0
+    threshold = get_config_float("match_threshold", 0.5)
+    recommended_found = MatchResult.query.filter_by(jd_id=jd_id).filter(MatchResult.score >= threshold).count() > 0
 
     # Check: email sent
     from models import EmailLog
@@ -29,3 +34,15 @@ def get_jd_status(jd_id):
         "recommended": recommended_found,
         "emailed": emailed
     })
+
+
+@status_bp.route("/status/models", methods=["GET"])
+def get_models_status():
+    stats = get_model_stats()
+    stats["name_extraction"] = get_nlp_stats()
+    return jsonify(stats)
+
+
+@status_bp.route("/status/genai-cache", methods=["GET"])
+def get_genai_cache_status():
+    return jsonify(cache_stats())
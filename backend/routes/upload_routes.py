@@ -1,19 +1,22 @@
 import os
-import re
-import json
+import zipfile
 from flask import Blueprint, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
-from models import db, JD, Resume, Profile
-from utils.parser import extract_text, extract_experience
-from utils.embedding import generate_embedding
-from utils.skill_extractor import extract_skills_contextual
+from sqlalchemy import func, select, intersect
+from models import db, JD, JDSkill, Resume, Profile
+from utils.parser import extract_experience, extract_email
+from utils.vector_codec import pack_embedding
+from utils.ann_index import on_profile_upserted, on_profile_removed
+from utils.feature_store import profile_feature_columns, resume_feature_columns
+from utils.skill_extractor import canonical_skill
 from utils.utils import log_agent_error
-from sentence_transformers import SentenceTransformer, util
+from utils.bulk_ingest import stage_upload
+from utils.job_queue import submit_job
+from utils.upload_store import save_upload, process_upload
+from utils.pagination import keyset_page, page_size, InvalidCursor
+from utils.jd_facets import jd_facet_columns, display_skills
+from utils.concept_cache import concept_similarities
 from utils.matcher import CERTIFICATION_CONCEPTS, PROJECT_SIGNAL_CONCEPTS, VERTICAL_SIGNAL_CONCEPTS
-from utils.parser import extract_text, extract_experience,infer_domain_from_text
-import os
-import json
-from utils.parser import extract_certifications, extract_projects, extract_experience, extract_email
 
 
 
@@ -22,8 +25,6 @@ from utils.parser import extract_certifications, extract_projects, extract_exper
 UPLOAD_FOLDER = 'resumes'
 
 
-domain_model = SentenceTransformer("all-MiniLM-L6-v2")
-
 upload_bp = Blueprint('upload_bp', __name__)
 
 # ─────────────────────────────────────────────
@@ -53,23 +54,21 @@ def upload_jd():
         if not file:
             return jsonify({"error": "No JD file provided"}), 400
 
-        filename = secure_filename(file.filename or "jd.pdf")
-        save_path = os.path.join(UPLOAD_FOLDER_JD, filename)
-        file.save(save_path)
-
-        text = extract_text(save_path)
+        upload = save_upload(file, UPLOAD_FOLDER_JD, default_name="jd.pdf")
+        text, embedding, _ = process_upload(upload)
         if not text or len(text.strip()) == 0:
+            db.session.rollback()  # nothing worth caching; a re-upload extracts again
             return jsonify({"error": "Empty JD content"}), 400
 
-        embedding = generate_embedding(text)
-
         jd = JD(
-            file_path=f"/uploads/jds/{filename}",
+            file_path=f"/uploads/jds/{upload.filename}",
             uploaded_by=uploaded_by,
             project_code=project_code,
             job_title=job_title,
+            content_hash=upload.content_hash,
             extracted_text=text,
-            embedding_vector=json.dumps(embedding)
+            **jd_facet_columns(text),
+            **pack_embedding(embedding)
         )
 
         db.session.add(jd)
@@ -78,6 +77,7 @@ def upload_jd():
         return jsonify({"message": "JD uploaded", "jd_id": jd.id, "job_title": jd.job_title})
 
     except Exception as e:
+        db.session.rollback()
         log_agent_error("UploadJD", str(e), method="upload-jd")
         return jsonify({"error": "Failed to upload JD"}), 500
 
@@ -88,36 +88,25 @@ def upload_resume():
         if not file:
             return jsonify({"error": "No file uploaded"}), 400
 
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        file.save(filepath)
-
-        text = extract_text(filepath)
-        embedding = generate_embedding(text)
-        if not isinstance(embedding, list):
-            embedding = embedding.tolist()
+        upload = save_upload(file, UPLOAD_FOLDER)
+        text, embedding, features = process_upload(upload)
+        if not text:
+            raise ValueError("Resume unreadable or empty")
 
         email = extract_email(text) or "not available"  # fallback for debug
-        skills_list = extract_skills_contextual(text) or []
-        certifications = extract_certifications(text) or []
-        projects = extract_projects(text) or []
-        domain = infer_domain_from_text(text) or "Unknown"
 
         print("🧪 Extracted Email:", email)
-        print("🧪 Skills:", skills_list)
-        print("🧪 Domain:", domain)
+        print("🧪 Skills:", features["skills"])
+        print("🧪 Domain:", features["inferred_vertical"] or "Unknown")
 
         resume = Resume(
-            name=filename,
-            file_path=filepath,
+            name=secure_filename(upload.original_name),
+            file_path=upload.path,
             email=email,
-            skills=", ".join(skills_list),
-            certifications=", ".join(certifications[:5]),
-            projects=", ".join(projects[:3]),
-            domain=domain,
+            content_hash=upload.content_hash,
+            **resume_feature_columns(features),
             extracted_text=text,
-            embedding_vector=json.dumps(embedding)
+            **pack_embedding(embedding)
         )
         db.session.add(resume)
         db.session.commit()
@@ -152,17 +141,11 @@ def upload_profile():
         if not all([file, emp_id, name, email]):
             return jsonify({"error": "Missing emp_id, name, email or file"}), 400
 
-        filename = secure_filename(file.filename or f"{emp_id}_resume.pdf")
-        save_path = os.path.join(UPLOAD_FOLDER_RESUME, filename)
-        file.save(save_path)
-
-        text = extract_text(save_path)
+        upload = save_upload(file, UPLOAD_FOLDER_RESUME, default_name=f"{emp_id}_resume.pdf")
+        text, embedding, features = process_upload(upload)
         if not text or len(text.strip()) == 0:
             raise ValueError("Resume unreadable or empty")
 
-        embedding = generate_embedding(text)
-        skills_list = extract_skills_contextual(text)
-
         try:
             experience_years = float(manual_experience.strip()) if manual_experience else extract_experience(text)
         except:
@@ -170,8 +153,10 @@ def upload_profile():
 
         existing = Profile.query.filter_by(emp_id=emp_id).first()
         if existing:
+            replaced_id = existing.id
             db.session.delete(existing)
             db.session.commit()
+            on_profile_removed(replaced_id)
 
         profile = Profile(
             emp_id=emp_id,
@@ -180,31 +165,123 @@ def upload_profile():
             role=role,
             status=status,
             vertical=vertical,
-            skills=", ".join(skills_list),
+            **profile_feature_columns(features),
             experience_years=experience_years,
-            resume_path=f"/uploads/resumes/{filename}",
+            resume_path=f"/uploads/resumes/{upload.filename}",
+            content_hash=upload.content_hash,
             extracted_text=text,
-            embedding_vector=json.dumps(embedding)
+            **pack_embedding(embedding)
         )
 
         db.session.add(profile)
         db.session.commit()
+        on_profile_upserted(profile.id, embedding)
 
         return jsonify({"message": "Profile uploaded", "profile_id": profile.id})
 
     except Exception as e:
         import traceback
         traceback.print_exc()
+        db.session.rollback()
         log_agent_error("UploadProfile", str(e), method="upload-profile")
         return jsonify({"error": "Profile upload failed"}), 500
 
+# ─────────────────────────────────────────────
+# Bulk Consultant Upload (ZIP of resumes + CSV roster)
+@upload_bp.route('/upload-profiles/bulk', methods=['POST'])
+def upload_profiles_bulk():
+    try:
+        archive = request.files.get('archive')
+        roster = request.files.get('roster')
+        if not archive or not roster:
+            return jsonify({"error": "Missing archive (.zip) or roster (.csv)"}), 400
+
+        workers = request.form.get('workers', type=int)
+        batch_size = request.form.get('batch_size', default=32, type=int)
+
+        # Ingestion runs on a match worker (`cli.py worker`); poll the job for its report
+        archive_path, roster_path = stage_upload(archive, ".zip"), stage_upload(roster, ".csv")
+        if not zipfile.is_zipfile(archive_path):
+            os.remove(archive_path)
+            os.remove(roster_path)
+            return jsonify({"error": "Archive is not a valid ZIP file"}), 400
+
+        job = submit_job("bulk-ingest", {"archive": archive_path, "roster": roster_path,
+                                         "workers": workers, "batch_size": batch_size})
+        return jsonify({"job_id": job.id, "status": job.status, "status_url": f"/match/jobs/{job.id}"}), 202
+
+    except Exception as e:
+        db.session.rollback()
+        log_agent_error("BulkUploadProfiles", str(e), method="upload-profiles-bulk")
+        return jsonify({"error": "Bulk profile upload failed"}), 500
+
+# ─────────────────────────────────────────────
+# Listings
+# ─────────────────────────────────────────────
+# Both listings load only the columns their response needs. Without `limit` or
+# `cursor` they return the full list as before. With either, they return
+# keyset-paginated pages: {"items", "next_cursor", "limit"}. Pass next_cursor
+# back to get the following page.
+
+PROFILE_SORTS = {
+    "id": Profile.id,
+    "name": Profile.name,
+    "emp_id": Profile.emp_id,
+    "created_at": Profile.created_at
+}
+JD_SORTS = {
+    "id": JD.id,
+    "created_at": JD.created_at,
+    "job_title": func.coalesce(JD.job_title, ""),
+    "experience": func.coalesce(JD.required_experience, -1)  # NULL until facets are filled
+}
+FACET_SKILLS_LIMIT = 25
+
+
+def _listing_args(sorts, default_sort):
+    sort = request.args.get('sort', default_sort)
+    order = request.args.get('order', 'asc').lower()
+    if sort not in sorts:
+        raise ValueError(f"sort must be one of {sorted(sorts)}")
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be asc or desc")
+    paginated = 'limit' in request.args or 'cursor' in request.args
+    return sorts[sort], order == 'desc', paginated
+
+
+def _listing_response(items, next_cursor, limit, paginated, **extra):
+    if not paginated:
+        return jsonify(items)
+    return jsonify({"items": items, "next_cursor": next_cursor, "limit": limit, **extra})
+
 # ─────────────────────────────────────────────
 # Fetch All Profiles
 @upload_bp.route('/profiles/all', methods=['GET'])
 def get_all_profiles():
     try:
-        profiles = Profile.query.all()
-        return jsonify([
+        sort_expr, descending, paginated = _listing_args(PROFILE_SORTS, 'id')
+        query = db.session.query(
+            Profile.id.label("id"), sort_expr.label("sort_key"), Profile.name, Profile.emp_id,
+            Profile.email, Profile.role, Profile.status, Profile.resume_path
+        )
+        if request.args.get('status'):
+            query = query.filter(Profile.status == request.args['status'])
+        if request.args.get('role'):
+            query = query.filter(Profile.role == request.args['role'])
+        if request.args.get('vertical'):
+            query = query.filter(Profile.vertical.collate('NOCASE') == request.args['vertical'])
+        if request.args.get('q'):
+            term = request.args['q'].strip()
+            query = query.filter(Profile.name.ilike(f"%{term}%") | Profile.emp_id.ilike(f"%{term}%"))
+
+        limit = page_size(request.args.get('limit'))
+        if paginated:
+            profiles, next_cursor = keyset_page(query, sort_expr, Profile.id, limit,
+                                                cursor=request.args.get('cursor'), descending=descending)
+        else:
+            profiles, next_cursor = query.order_by(sort_expr.desc() if descending else sort_expr, Profile.id).all(), None
+
+        return _listing_response([
             {
                 "id": p.id,
                 "name": p.name,
@@ -214,59 +291,97 @@ def get_all_profiles():
                 "status": p.status,
                 "resume_path": p.resume_path
             } for p in profiles
-        ])
+        ], next_cursor, limit, paginated)
+    except (ValueError, InvalidCursor) as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         log_agent_error("FetchProfiles", str(e), method="get_all_profiles")
         return jsonify({"error": "Failed to fetch profiles"}), 500
 
 # ─────────────────────────────────────────────
 # JD Filter View
+# Facets are precomputed at upload (utils/jd_facets.py), so this is a query
+# over indexed columns: skill (comma-separated, all must match), min_exp,
+# max_exp, fresher, status, uploaded_by, project_code. facets=true adds counts
+# per skill, experience, fresher flag and status over the filtered set.
+
+def _jd_filters():
+    conditions = []
+    for column in ('status', 'uploaded_by', 'project_code'):
+        if request.args.get(column):
+            conditions.append(getattr(JD, column) == request.args[column])
+    if request.args.get('min_exp', type=int) is not None:
+        conditions.append(JD.required_experience >= request.args.get('min_exp', type=int))
+    if request.args.get('max_exp', type=int) is not None:
+        conditions.append(JD.required_experience <= request.args.get('max_exp', type=int))
+    if request.args.get('fresher'):
+        conditions.append(JD.is_fresher.is_(request.args['fresher'].lower() == 'true'))
+
+    skills = sorted({canonical_skill(s) for s in request.args.get('skill', '').split(',') if s.strip()})
+    if skills:
+        per_skill = [select(JDSkill.jd_id).where(JDSkill.skill == s) for s in skills]
+        conditions.append(JD.id.in_(per_skill[0] if len(per_skill) == 1 else intersect(*per_skill)))
+    return conditions
+
+
+def _jd_facet_counts(conditions):
+    matching = select(JD.id).where(*conditions)
+    skills = db.session.query(JDSkill.skill, func.count()).filter(JDSkill.jd_id.in_(matching)).group_by(
+        JDSkill.skill).order_by(func.count().desc(), JDSkill.skill).limit(FACET_SKILLS_LIMIT).all()
+
+    def counts(column):
+        return db.session.query(column, func.count()).filter(*conditions).group_by(column).order_by(column).all()
+
+    return {
+        "total": db.session.query(func.count(JD.id)).filter(*conditions).scalar(),
+        "skills": [{"skill": skill, "count": n} for skill, n in skills],
+        "experience": [{"experience": exp, "count": n} for exp, n in counts(JD.required_experience)],
+        "fresher": [{"fresher": bool(flag), "count": n} for flag, n in counts(JD.is_fresher) if flag is not None],
+        "status": [{"status": status or "Pending", "count": n} for status, n in counts(JD.status)]
+    }
+
+
 @upload_bp.route('/jds/filterable', methods=['GET'])
 def get_jds_for_filters():
     try:
-        clean_jds = []
-        for jd in JD.query.all():
-            jd_text = jd.extracted_text or extract_text(jd.file_path) or ""
-
-            skills = extract_skills_contextual(jd_text)
-            cleaned_skills = [s.lower() for s in skills if len(s) > 2 and s.isascii() and s.isalnum()]
-
-            experience_match = re.search(r'(\d+)\s*\+?\s*(years|yrs)', jd_text.lower())
-            if experience_match:
-                experience = int(experience_match.group(1))
-            elif "fresher" in jd_text.lower():
-                experience = 0
-            else:
-                experience = 3
-
-            clean_jds.append({
-                "id": jd.id,
-                "job_title": jd.job_title or "No Title",
-                "uploaded_by": jd.uploaded_by,
-                "project_code": jd.project_code,
-                "skills": cleaned_skills[:10],
-                "experience": experience,
-                "status": jd.status or "Pending",
-                "created_at": jd.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-        return jsonify(clean_jds)
-
+        sort_expr, descending, paginated = _listing_args(JD_SORTS, 'id')
+        with_facets = request.args.get('facets', 'false').lower() == 'true'
+        conditions = _jd_filters()
+        query = db.session.query(
+            JD.id.label("id"), sort_expr.label("sort_key"), JD.job_title, JD.uploaded_by, JD.project_code,
+            JD.skills, JD.required_experience, JD.status, JD.created_at
+        ).filter(*conditions)
+
+        limit = page_size(request.args.get('limit'))
+        if paginated:
+            jds, next_cursor = keyset_page(query, sort_expr, JD.id, limit, cursor=request.args.get('cursor'),
+                                           descending=descending)
+        else:
+            jds, next_cursor = query.order_by(sort_expr.desc() if descending else sort_expr, JD.id).all(), None
+
+        clean_jds = [{
+            "id": jd.id,
+            "job_title": jd.job_title or "No Title",
+            "uploaded_by": jd.uploaded_by,
+            "project_code": jd.project_code,
+            "skills": display_skills(jd.skills),
+            "experience": jd.required_experience,
+            "status": jd.status or "Pending",
+            "created_at": jd.created_at.strftime("%Y-%m-%d %H:%M:%S")
+        } for jd in jds]
+
+        extra = {"facets": _jd_facet_counts(conditions)} if with_facets else {}
+        return _listing_response(clean_jds, next_cursor, limit, paginated or with_facets, **extra)
+
+    except (ValueError, InvalidCursor) as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
+        db.session.rollback()
         log_agent_error("GetJDsForFilters", str(e), method="get_jds_for_filters")
         return jsonify({"error": "Failed to fetch JDs"}), 500
 
 
 def detect_resume_domain(text):
-    best_domain = "Unknown"
-    highest_score = 0.0
-    text_embed = domain_model.encode(text, convert_to_tensor=True)
-
-    for domain, concept in VERTICAL_SIGNAL_CONCEPTS.items():
-        concept_embed = domain_model.encode(concept, convert_to_tensor=True)
-        sim = float(util.cos_sim(text_embed, concept_embed)[0][0])
-        if sim > highest_score and sim >= 0.5:
-            best_domain = domain
-            highest_score = sim
-
-    return best_domain
\ No newline at end of file
+    labels, sims = concept_similarities(text, VERTICAL_SIGNAL_CONCEPTS)
+    best = int(sims.argmax())
+    return labels[best] if float(sims[best]) >= 0.5 else "Unknown"
\ No newline at end of file
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models import db  # noqa: E402
+from routes.profile_routes import profile_bp  # noqa: E402
+from utils.migrations import run_migrations  # noqa: E402
+from utils.skill_taxonomy import load_taxonomy  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    """The search blueprints on a fresh, fully migrated SQLite database."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + str(tmp_path / 'test.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    app.register_blueprint(profile_bp)
+    with app.app_context():
+        run_migrations()
+        load_taxonomy()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
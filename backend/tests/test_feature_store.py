@@ -0,0 +1,53 @@
+import pytest
+
+import utils.feature_store as feature_store
+from models import db, Profile
+from utils.feature_store import FEATURE_VERSION, ensure_features, features_fresh, skills_fresh
+from utils.skill_extractor import current_skill_version
+from utils.skill_taxonomy import save_skill
+
+TEXT = "Backend engineer: python, golang and kubernetes on aws."
+
+
+@pytest.fixture
+def profile(app):
+    row = Profile(emp_id="E1", name="Asha", email="a@x.com", role="Consultant", status="Available",
+                  skills="python, aws", project_hits=2, cert_hits=1, human_signal_score=0.4,
+                  feature_version=FEATURE_VERSION, skills_version=current_skill_version(),
+                  extracted_text=TEXT)
+    db.session.add(row)
+    db.session.commit()
+    return row
+
+
+def test_fresh_row_is_returned_as_stored(profile, monkeypatch):
+    monkeypatch.setattr(feature_store, "compute_features", pytest.fail)
+    assert ensure_features(profile)["skills"] == ["python", "aws"]
+
+
+def test_taxonomy_edit_reextracts_only_skills(profile, monkeypatch):
+    save_skill({"name": "golang"})
+    assert features_fresh(profile) and not skills_fresh(profile)
+
+    # The embedding-derived features must not be recomputed
+    monkeypatch.setattr(feature_store, "compute_features", pytest.fail)
+    features = ensure_features(profile)
+
+    assert "golang" in features["skills"]
+    assert features["human_signal_score"] == 0.4
+    assert profile.skills_version == current_skill_version()
+
+
+def test_feature_version_bump_recomputes_everything(profile, monkeypatch):
+    profile.feature_version = FEATURE_VERSION - 1
+    calls = []
+
+    def fake_compute(text, **kwargs):
+        calls.append(text)
+        return {"skills": ["python"], "skills_version": current_skill_version(), "projects": [],
+                "certifications": [], "project_hits": 0, "cert_hits": 0, "human_signal_score": 0.1,
+                "inferred_vertical": None, "feature_version": FEATURE_VERSION}
+
+    monkeypatch.setattr(feature_store, "compute_features", fake_compute)
+    assert ensure_features(profile)["human_signal_score"] == 0.1
+    assert calls == [TEXT]
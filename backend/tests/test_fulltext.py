@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import text
+
+import utils.fulltext as fulltext
+from models import db, Profile
+from utils.fulltext import FullTextQueryError, build_match_query, search
+
+
+def add_profile(emp_id, skills, body):
+    profile = Profile(emp_id=emp_id, name=f"Name {emp_id}", email=f"{emp_id}@x.com", role="Consultant",
+                      status="Available", skills=skills, extracted_text=body)
+    db.session.add(profile)
+    db.session.commit()
+    return profile
+
+
+def ids(hits):
+    return sorted(hit["id"] for hit in hits)
+
+
+# ─────────────── query building ───────────────
+
+@pytest.mark.parametrize("query, expected", [
+    ("python django", '"python" "django"'),
+    ("C# and C++", '"c#" "and" "c++"'),
+    ('"quoted" NEAR(x) -neg', '"quoted" "near" "x" "neg"'),
+    ("pyth*", '"pyth"*'),
+    ("", ""),
+    ("(*) : ^", ""),
+])
+def test_build_match_query_quotes_every_term(query, expected):
+    assert build_match_query(query) == expected
+
+
+def test_build_match_query_any_mode():
+    assert build_match_query("java spring", mode="any") == '"java" OR "spring"'
+
+
+# ─────────────── search ───────────────
+
+@pytest.fixture
+def indexed(app):
+    return {
+        "py": add_profile("E1", "python, django", "Built REST services with Django and Postgres.").id,
+        "cs": add_profile("E2", "c#, .net", "Maintained C# services on Azure.").id,
+        "cpp": add_profile("E3", "c++", "Low-latency C++ trading systems. NOT a python shop.").id,
+    }
+
+
+@pytest.mark.parametrize("query", ['c++ AND (python', 'NOT "python', 'NEAR(', 'skills:python', '^python'])
+def test_operator_text_never_breaks_the_query(indexed, query):
+    search("profile", query)  # must not raise
+
+
+def test_symbols_and_prefixes(indexed):
+    assert ids(search("profile", "c#")) == [indexed["cs"]]
+    assert ids(search("profile", "c++")) == [indexed["cpp"]]
+    assert ids(search("profile", "postgr*")) == [indexed["py"]]
+
+
+def test_all_and_any_modes(indexed):
+    assert ids(search("profile", "python django")) == [indexed["py"]]
+    assert ids(search("profile", "django azure", mode="any")) == sorted([indexed["py"], indexed["cs"]])
+    assert search("profile", "django azure") == []
+
+
+def test_skills_rank_above_body_text(indexed):
+    hits = search("profile", "python")
+    assert [hit["id"] for hit in hits] == [indexed["py"], indexed["cpp"]]
+
+
+def test_rejected_query_raises_query_error(indexed, monkeypatch):
+    monkeypatch.setattr(fulltext, "build_match_query", lambda query, mode="all": "AND AND")
+    with pytest.raises(FullTextQueryError):
+        search("profile", "anything")
+
+
+# ─────────────── trigger sync ───────────────
+
+def test_triggers_follow_insert_update_delete(app):
+    profile = add_profile("E9", "golang", "Kubernetes operators in Go.")
+    assert ids(search("profile", "golang")) == [profile.id]
+
+    profile.skills = "rust"
+    profile.extracted_text = "Embedded firmware."
+    db.session.commit()
+    assert search("profile", "golang") == []
+    assert search("profile", "kubernetes") == []
+    assert ids(search("profile", "rust firmware")) == [profile.id]
+
+    db.session.delete(profile)
+    db.session.commit()
+    assert search("profile", "rust") == []
+
+
+def test_raw_sql_writes_are_indexed_too(app):
+    profile = add_profile("E8", "java", "Spring services.")
+    db.session.execute(text("UPDATE profile SET skills = 'scala' WHERE id = :id"), {"id": profile.id})
+    db.session.commit()
+    assert ids(search("profile", "scala")) == [profile.id]
+    assert search("profile", "java") == []
+
+
+# ─────────────── endpoint ───────────────
+
+def test_endpoint_reports_a_rejected_query_as_400(client, indexed, monkeypatch):
+    monkeypatch.setattr(fulltext, "build_match_query", lambda query, mode="all": "AND AND")
+    response = client.get("/search/fulltext?q=python")
+    assert response.status_code == 400
+
+
+def test_endpoint_reports_a_broken_index_as_500(client, indexed):
+    db.session.execute(text("DROP TABLE profile_fts"))
+    db.session.commit()
+    response = client.get("/search/fulltext?q=python")
+    assert response.status_code == 500
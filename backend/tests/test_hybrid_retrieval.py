@@ -0,0 +1,46 @@
+import pytest
+
+from utils.hybrid_retrieval import reciprocal_rank_fusion
+
+
+def ids(fused):
+    return [item_id for item_id, _ in fused]
+
+
+def test_agreement_between_legs_ranks_first():
+    fused = reciprocal_rank_fusion([(1.0, [1, 2, 3]), (1.0, [4, 2, 5])])
+    assert ids(fused)[0] == 2
+    assert set(ids(fused)) == {1, 2, 3, 4, 5}
+
+
+def test_scores_follow_the_rrf_formula():
+    fused = dict(reciprocal_rank_fusion([(1.0, [1, 2]), (0.5, [2])], rrf_k=60))
+    assert fused[1] == pytest.approx(1 / 61)
+    assert fused[2] == pytest.approx(1 / 62 + 0.5 / 61)
+
+
+def test_single_leg_keeps_its_order():
+    assert ids(reciprocal_rank_fusion([(1.0, [7, 3, 9])])) == [7, 3, 9]
+
+
+def test_weight_decides_between_disagreeing_legs():
+    semantic, lexical = [1, 2], [2, 1]
+    assert ids(reciprocal_rank_fusion([(1.0, semantic), (0.5, lexical)])) == [1, 2]
+    assert ids(reciprocal_rank_fusion([(0.5, semantic), (1.0, lexical)])) == [2, 1]
+
+
+def test_disabled_leg_is_ignored():
+    fused = reciprocal_rank_fusion([(1.0, [1, 2]), (0.0, [3, 2, 1]), (-1.0, [4])])
+    assert ids(fused) == [1, 2]
+
+
+def test_smaller_k_favours_top_ranks():
+    # Items 1 and 3 each top one leg; item 2 is third in both
+    rankings = [(1.0, [1, 5, 2]), (1.0, [3, 6, 2])]
+    assert ids(reciprocal_rank_fusion(rankings, rrf_k=60))[0] == 2
+    assert ids(reciprocal_rank_fusion(rankings, rrf_k=0))[0] in (1, 3)
+
+
+def test_no_rankings():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([(1.0, [])]) == []
@@ -0,0 +1,25 @@
+from models import db, JD
+from utils.jd_facets import DEFAULT_EXPERIENCE, jd_facet_columns
+from utils.migrations import run_migrations
+from utils.skill_extractor import current_skill_version
+
+
+def test_facet_columns():
+    assert jd_facet_columns("Python developer, 5+ years")["required_experience"] == 5
+    fresher = jd_facet_columns("Freshers welcome to apply")
+    assert fresher["is_fresher"] and fresher["required_experience"] == 0
+    assert jd_facet_columns("")["required_experience"] == DEFAULT_EXPERIENCE
+
+
+def test_migrations_backfill_facets_of_existing_jds(app):
+    jd = JD(file_path="missing.pdf", job_title="Backend",
+            extracted_text="Backend role: python and aws, 4 years of experience.")
+    db.session.add(jd)
+    db.session.commit()
+    assert jd.facets_version is None
+
+    run_migrations()
+    db.session.refresh(jd)
+    assert jd.facets_version == current_skill_version()
+    assert jd.required_experience == 4 and jd.is_fresher is False
+    assert {"python", "aws"} <= {s.strip() for s in jd.skills.split(",")}
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+
+from models import db, Profile
+from utils.pagination import (
+    InvalidCursor, MAX_PAGE_SIZE, decode_cursor, encode_cursor, keyset_page, page_size
+)
+
+
+@pytest.mark.parametrize("sort_value", [
+    "Asha", 42, 3.5, None, datetime(2024, 5, 17, 9, 30, 12, 250000)
+])
+def test_cursor_round_trip(sort_value):
+    assert decode_cursor(encode_cursor(sort_value, 7)) == (sort_value, 7)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", "WzEsMiwzXQ"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_page_size_bounds():
+    assert page_size(None) == 50
+    assert page_size("abc", default=10) == 10
+    assert page_size("0") == 1
+    assert page_size(str(MAX_PAGE_SIZE + 1)) == MAX_PAGE_SIZE
+
+
+def _seed(names):
+    for i, name in enumerate(names):
+        db.session.add(Profile(emp_id=f"E{i}", name=name, email=f"e{i}@x.com",
+                               role="Consultant", status="Available"))
+    db.session.commit()
+
+
+def _walk(limit, descending=False, sort_expr=Profile.name):
+    query = db.session.query(Profile.id.label("id"), sort_expr.label("sort_key"))
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = keyset_page(query, sort_expr, Profile.id, limit, cursor=cursor, descending=descending)
+        assert len(rows) <= limit
+        seen.extend((row.sort_key, row.id) for row in rows)
+        pages += 1
+        if cursor is None:
+            return seen, pages
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 2, 3, 7])
+def test_pages_cover_every_row_once_with_id_tie_break(app, limit, descending):
+    # Repeated sort values straddle page boundaries; the id breaks the ties
+    _seed(["Ravi", "Asha", "Ravi", "Meera", "Asha", "Ravi", "Zoya"])
+    seen, pages = _walk(limit, descending)
+
+    expected = sorted(db.session.query(Profile.name, Profile.id).all(), reverse=descending)
+    assert seen == [tuple(row) for row in expected]
+    assert pages == -(-len(expected) // limit)
+
+
+def test_last_full_page_has_no_cursor(app):
+    _seed(["A", "B", "C", "D"])
+    query = db.session.query(Profile.id.label("id"), Profile.name.label("sort_key"))
+    rows, cursor = keyset_page(query, Profile.name, Profile.id, 4)
+    assert len(rows) == 4 and cursor is None
+
+
+def test_datetime_cursor_resumes_after_last_row(app):
+    _seed(["A", "B", "C"])
+    stamp = datetime(2024, 1, 1, 12, 0, 0)
+    Profile.query.update({Profile.created_at: stamp})
+    db.session.commit()
+
+    seen, _ = _walk(1, descending=True, sort_expr=Profile.created_at)
+    assert [row_id for _, row_id in seen] == [3, 2, 1]
+    assert {value for value, _ in seen} == {stamp}
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_null_sort_values_are_not_dropped(app, limit, descending):
+    _seed(["A", "B", "C", "D", "E", "F"])
+    Profile.query.filter(Profile.emp_id.in_(["E1", "E3", "E4"])).update(
+        {Profile.experience_years: None}, synchronize_session=False)
+    Profile.query.filter(Profile.emp_id.in_(["E0", "E2", "E5"])).update(
+        {Profile.experience_years: 5.0}, synchronize_session=False)
+    db.session.commit()
+
+    seen, _ = _walk(limit, descending, sort_expr=Profile.experience_years)
+    nulls, fives = [2, 4, 5], [1, 3, 6]
+    expected = (fives[::-1] + nulls[::-1]) if descending else (nulls + fives)
+    assert [row_id for _, row_id in seen] == expected
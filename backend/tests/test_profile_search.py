@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import text
+
+from models import db, Profile
+
+PROFILES = {
+    "E1": ("python, aws, django", "Banking"),
+    "E2": ("python, java", "Cloud"),
+    "E3": ("aws, kubernetes", "Cloud"),
+    "E4": ("c#, .net", "Insurance"),
+    "E5": ("c, c++", "GTT"),
+}
+
+
+@pytest.fixture
+def profiles(app):
+    for emp_id, (skills, vertical) in PROFILES.items():
+        db.session.add(Profile(emp_id=emp_id, name=f"Name {emp_id}", email=f"{emp_id}@x.com",
+                               role="Consultant", status="Available", vertical=vertical, skills=skills))
+    db.session.commit()
+
+
+def search(client, query):
+    response = client.get(f"/profiles/search?{query}")
+    assert response.status_code == 200
+    return sorted(p["emp_id"] for p in response.get_json())
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("skills=python", ["E1", "E2"]),
+    ("skills=python,aws", ["E1"]),
+    ("skills=python,aws&skill_mode=all", ["E1"]),
+    ("skills=python,kubernetes", []),
+    ("skills=python,aws&skill_mode=any", ["E1", "E2", "E3"]),
+    ("skills=java,c%23&skill_mode=any", ["E2", "E4"]),
+    ("skills=Python, AWS ", ["E1"]),
+])
+def test_and_or(client, profiles, query, expected):
+    assert search(client, query) == expected
+
+
+@pytest.mark.parametrize("query", ["skills=", "skills=,", "skills=%20,%20,", "skills=,&skill_mode=any"])
+def test_empty_skill_list_skips_the_filter(client, profiles, query):
+    assert search(client, query) == sorted(PROFILES)
+
+
+def test_symbols_match_exactly(client, profiles):
+    assert search(client, "skills=c%23") == ["E4"]
+    assert search(client, "skills=c") == ["E5"]
+    assert search(client, "skills=c%2B%2B") == ["E5"]
+    assert search(client, "skills=.net") == ["E4"]
+
+
+def test_synonyms_resolve_to_the_canonical_skill(client, profiles):
+    assert search(client, "skills=csharp") == ["E4"]
+    assert search(client, "skills=c sharp,.net") == ["E4"]
+
+
+def test_skill_filter_combines_with_vertical(client, profiles):
+    assert search(client, "skills=aws&skill_mode=any&vertical=cloud") == ["E3"]
+    assert search(client, "vertical=BANKING") == ["E1"]
+    assert search(client, "vertical=bank") == []
+
+
+def test_vertical_filter_uses_its_index(app):
+    query = db.session.query(Profile.id).filter(Profile.vertical.collate('NOCASE') == 'cloud')
+    sql = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    plan = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    assert any("ix_profile_vertical_nocase" in row[-1] for row in plan)
+
+
+def test_index_follows_skill_edits(client, profiles):
+    profile = Profile.query.filter_by(emp_id="E3").first()
+    profile.skills = "python, aws"
+    db.session.commit()
+    assert search(client, "skills=python,aws") == ["E1", "E3"]
+    assert search(client, "skills=kubernetes") == []
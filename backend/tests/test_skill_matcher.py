@@ -0,0 +1,42 @@
+import pytest
+
+from utils.skill_extractor import SkillMatcher
+
+VOCABULARY = ["c", "c#", "c++", ".net", "asp.net", "java", "javascript", "node.js", "go"]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher(VOCABULARY)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("C# developer", {"c#"}),
+    ("C and C++", {"c", "c++"}),
+    ("Senior C++/C# engineer", {"c++", "c#"}),
+    (".NET core and ASP.NET MVC", {".net", "asp.net"}),
+    ("c#.net", {"c#", ".net"}),
+    ("javascript only", {"javascript"}),
+    ("Java, JavaScript", {"java", "javascript"}),
+    ("Node.js, Go", {"node.js", "go"}),
+    ("category: good objectives", set()),
+])
+def test_symbol_boundaries(matcher, text, expected):
+    assert matcher.find(text) == expected
+
+
+def test_empty_text(matcher):
+    assert matcher.find("") == set()
+    assert matcher.find(None) == set()
+
+
+def test_synonym_does_not_imply_its_prefix():
+    matcher = SkillMatcher({"c": "c", "c#": "c#", "c sharp": "c#"})
+    assert matcher.find("C sharp developer") == {"c#"}
+    assert matcher.find("c, c sharp") == {"c", "c#"}
+
+
+def test_prefix_skill_found_inside_longer_term():
+    matcher = SkillMatcher(["google", "google cloud"])
+    assert matcher.find("Google Cloud certified") == {"google", "google cloud"}
+    assert matcher.find("googled it") == set()
@@ -1,20 +1,94 @@
 from models import db, Config, User
 from datetime import datetime
+from utils import config_cache
 
 # ─────────────────────────────
 # CONFIG UTILITIES
 # ─────────────────────────────
 
-ALLOWED_CONFIG_KEYS = {"genai_key", "genai_provider", "genai_enabled", "genai_prompt","match_threshold"}
+ALLOWED_CONFIG_KEYS = {"genai_key", "genai_provider", "genai_enabled", "genai_prompt","match_threshold",
+                       "match_candidate_pool", "vector_index_backend", "ann_min_profiles",
+                       "ann_ef_search", "ann_m", "ann_ef_construction", "explain_shortlist_size",
+                       "genai_model", "genai_base_url", "genai_max_concurrency", "genai_rate_limit",
+                       "genai_timeout_seconds", "genai_max_retries", "genai_cache_enabled",
+                       "genai_cache_ttl_hours", "genai_cache_max_entries", "extract_pdf_engine",
+                       "extract_max_pages", "extract_max_chars", "name_fast_path_enabled",
+                       "hybrid_retrieval_enabled", "hybrid_semantic_weight", "hybrid_lexical_weight",
+                       "hybrid_rrf_k", "hybrid_leg_depth"}
+
+INT_CONFIG_KEYS = {"match_candidate_pool", "ann_min_profiles", "ann_ef_search", "ann_m", "ann_ef_construction",
+                   "explain_shortlist_size", "genai_max_concurrency", "genai_cache_max_entries",
+                   "extract_max_pages", "extract_max_chars", "hybrid_rrf_k", "hybrid_leg_depth"}
+
+NON_NEGATIVE_INT_CONFIG_KEYS = {"genai_max_retries"}
+
+FLOAT_CONFIG_KEYS = {"genai_rate_limit", "genai_timeout_seconds", "genai_cache_ttl_hours", "match_threshold",
+                     "hybrid_semantic_weight", "hybrid_lexical_weight"}
+
+BOOL_CONFIG_KEYS = {"genai_enabled", "genai_cache_enabled", "name_fast_path_enabled", "hybrid_retrieval_enabled"}
+
+CHOICE_CONFIG_KEYS = {
+    "vector_index_backend": {"exact", "hnsw", "auto"},
+    "extract_pdf_engine": {"auto", "pymupdf", "pypdf2", "pdfminer"}
+}
+
+CONFIG_DEFAULTS = {
+    "match_threshold": "0.5",
+    "match_candidate_pool": "200",
+    "vector_index_backend": "auto",
+    "ann_min_profiles": "100000",
+    "ann_ef_search": "64",
+    "ann_m": "16",
+    "ann_ef_construction": "200",
+    "explain_shortlist_size": "3",
+    "genai_model": "command-r",
+    "genai_max_concurrency": "4",
+    "genai_rate_limit": "5",
+    "genai_timeout_seconds": "20",
+    "genai_max_retries": "2",
+    "genai_cache_enabled": "true",
+    "genai_cache_ttl_hours": "168",
+    "genai_cache_max_entries": "5000",
+    "extract_pdf_engine": "auto",
+    "extract_max_pages": "50",
+    "extract_max_chars": "100000",
+    "name_fast_path_enabled": "true",
+    "hybrid_retrieval_enabled": "true",
+    "hybrid_semantic_weight": "1.0",
+    "hybrid_lexical_weight": "1.0",
+    "hybrid_rrf_k": "60",
+    "hybrid_leg_depth": "400"
+}
 
 def get_all_config_dict():
-    """Return all configs as a dictionary."""
-    return {conf.key: conf.value for conf in Config.query.all()}
+    """Return all configs as a dictionary (served from the process-local config cache)."""
+    return dict(config_cache.get_all())
 
 def get_config_by_key(key):
     """Fetch a single config by key."""
     return Config.query.filter_by(key=key).first()
 
+def get_config_value(key, default=None):
+    """Raw config value, falling back to CONFIG_DEFAULTS / default."""
+    value = config_cache.get(key)
+    return value if value is not None else CONFIG_DEFAULTS.get(key, default)
+
+def get_config_int(key, default=None):
+    """Integer config value, falling back to CONFIG_DEFAULTS / default."""
+    raw = get_config_value(key, default)
+    try:
+        return int(str(raw).strip())
+    except (TypeError, ValueError):
+        return default
+
+def get_config_float(key, default=None):
+    """Float config value, falling back to CONFIG_DEFAULTS / default."""
+    raw = get_config_value(key, default)
+    try:
+        return float(str(raw).strip())
+    except (TypeError, ValueError):
+        return default
+
 def save_or_update_config(key, value):
     """Create or update a config key, with validation."""
 
@@ -34,10 +108,30 @@ def save_or_update_config(key, value):
     if value_str == "":
         return {"error": "Config value cannot be empty."}, 400
 
-    if key == "genai_enabled":
+    if key in BOOL_CONFIG_KEYS:
         if value_str.lower() not in {"true", "false"}:
-            return {"error": "genai_enabled must be 'true' or 'false'"}, 400
+            return {"error": f"{key} must be 'true' or 'false'"}, 400
+        value_str = value_str.lower()
+
+    if key in INT_CONFIG_KEYS:
+        if not value_str.isdigit() or int(value_str) <= 0:
+            return {"error": f"{key} must be a positive integer"}, 400
+
+    if key in NON_NEGATIVE_INT_CONFIG_KEYS:
+        if not value_str.isdigit():
+            return {"error": f"{key} must be a non-negative integer"}, 400
+
+    if key in FLOAT_CONFIG_KEYS:
+        try:
+            if float(value_str) < 0:
+                raise ValueError
+        except ValueError:
+            return {"error": f"{key} must be a non-negative number"}, 400
+
+    if key in CHOICE_CONFIG_KEYS:
         value_str = value_str.lower()
+        if value_str not in CHOICE_CONFIG_KEYS[key]:
+            return {"error": f"{key} must be one of {sorted(CHOICE_CONFIG_KEYS[key])}"}, 400
 
     config = Config.query.filter_by(key=key).first()
     if config:
@@ -48,6 +142,7 @@ def save_or_update_config(key, value):
         db.session.add(config)
 
     db.session.commit()
+    config_cache.invalidate()
     return {"message": f"✅ Config '{key}' saved."}, 200
 
 # ─────────────────────────────
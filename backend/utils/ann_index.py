@@ -0,0 +1,274 @@
+import os
+import json
+import time
+import atexit
+import tempfile
+import threading
+import numpy as np
+from models import db, Profile
+from utils.logger import logger
+from utils.vector_codec import load_embedding, as_vector
+from utils.profile_index import profile_index, profile_revision
+from utils.admin_utils import get_config_int, get_config_value
+
+# ─────────────────────────────────────────────
+# Approximate nearest-neighbour profile index (HNSW)
+# ─────────────────────────────────────────────
+# Optional dependency: hnswlib. When it is missing, or the pool is below
+# `ann_min_profiles`, matching uses the exact resident matrix instead.
+#
+# Tuning knobs (Config table):
+#   vector_index_backend  exact | hnsw | auto   (default auto)
+#   ann_min_profiles      pool size where auto switches to hnsw (default 100000)
+#   ann_ef_search         query-time beam width, recall ↑ latency ↑ (default 64)
+#   ann_m                 graph degree, recall ↑ memory ↑ (default 16)
+#   ann_ef_construction   build-time beam width (default 200)
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+INDEX_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "..", "indexes")
+INDEX_PATH = os.path.join(INDEX_DIR, "profiles_hnsw.bin")
+META_PATH = os.path.join(INDEX_DIR, "profiles_hnsw.json")
+
+SAVE_EVERY_UPDATES = 100
+SAVE_EVERY_SECONDS = 60
+
+
+class HnswProfileIndex:
+    def __init__(self, index_path=INDEX_PATH, meta_path=META_PATH):
+        self.index_path = index_path
+        self.meta_path = meta_path
+        self._lock = threading.RLock()
+        self._index = None
+        self._params = None
+        self._ids = set()
+        self._dirty = 0
+        self._last_save = time.time()
+        self._revision = None   # profile change counter the indexed vectors reflect
+        self._synced_at = None
+
+    # ─────────────── params ───────────────
+
+    @staticmethod
+    def current_params():
+        return {
+            "m": get_config_int("ann_m", 16),
+            "ef_construction": get_config_int("ann_ef_construction", 200),
+            "ef_search": get_config_int("ann_ef_search", 64)
+        }
+
+    # ─────────────── lifecycle ───────────────
+
+    def _new_index(self, dim, capacity, params):
+        index = hnswlib.Index(space="cosine", dim=dim)
+        index.init_index(max_elements=max(capacity, 1024), M=params["m"],
+                         ef_construction=params["ef_construction"])
+        index.set_ef(params["ef_search"])
+        return index
+
+    def _load_from_disk(self, params):
+        if not (os.path.exists(self.index_path) and os.path.exists(self.meta_path)):
+            return False
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            if meta.get("m") != params["m"] or meta.get("ef_construction") != params["ef_construction"]:
+                logger.info("HNSW build params changed, ignoring saved index")
+                return False
+            index = hnswlib.Index(space="cosine", dim=meta["dim"])
+            index.load_index(self.index_path, max_elements=meta["capacity"])
+            index.set_ef(params["ef_search"])
+            self._index = index
+            self._ids = set(meta["ids"])
+            self._revision = meta.get("revision")  # None: saved by an older version, re-add every vector
+            self._params = params
+            logger.info(f"HNSW index loaded from disk with {len(self._ids)} vectors")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load HNSW index ({e}), rebuilding")
+            return False
+
+    def save(self):
+        with self._lock:
+            if self._index is None:
+                return
+            os.makedirs(INDEX_DIR, exist_ok=True)
+            # Temp files are unique per save, so processes saving at once never share one
+            tmp_path = self._temp_path(self.index_path)
+            self._index.save_index(tmp_path)
+            os.replace(tmp_path, self.index_path)
+            meta = {
+                "dim": self._index.dim,
+                "capacity": self._index.get_max_elements(),
+                "m": self._params["m"],
+                "ef_construction": self._params["ef_construction"],
+                "revision": self._revision,
+                "ids": sorted(self._ids)
+            }
+            tmp_path = self._temp_path(self.meta_path)
+            with open(tmp_path, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, self.meta_path)
+            self._dirty = 0
+            self._last_save = time.time()
+
+    @staticmethod
+    def _temp_path(path):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".",
+                                        suffix=".tmp")
+        os.close(fd)
+        return tmp_path
+
+    def _maybe_save(self):
+        self._dirty += 1
+        if self._dirty >= SAVE_EVERY_UPDATES or time.time() - self._last_save >= SAVE_EVERY_SECONDS:
+            self.save()
+
+    def sync(self):
+        """
+        Bring the index in line with the profile table: load the saved index if
+        possible, then add missing profiles, re-add profiles whose embedding
+        changed since the last sync (vector_revision), and drop deleted ones.
+        """
+        with self._lock:
+            revision = profile_revision()  # read first, so a write during the sync triggers another one
+            params = self.current_params()
+            if self._index is None or self._params is None \
+                    or (params["m"], params["ef_construction"]) != (self._params["m"], self._params["ef_construction"]):
+                self._index = None
+                self._ids = set()
+                self._load_from_disk(params)
+            elif params["ef_search"] != self._params["ef_search"]:
+                self._index.set_ef(params["ef_search"])
+                self._params = params
+
+            revisions = dict(db.session.query(Profile.id, Profile.vector_revision).all())
+            db_ids = set(revisions)
+            stale = self._ids - db_ids
+            missing = db_ids - self._ids
+            changed = {pid for pid in db_ids & self._ids
+                       if self._revision is None or (revisions[pid] or 0) > self._revision}
+
+            for pid in stale:
+                self._mark_deleted(pid)
+
+            reload = missing | changed
+            if reload:
+                rows = db.session.query(
+                    Profile.id, Profile.embedding_blob, Profile.embedding_dim, Profile.embedding_vector
+                ).filter(Profile.id.in_(list(reload))).all()
+                batch_ids, batch_vecs = [], []
+                for row in rows:
+                    vec = load_embedding(row)
+                    if vec is not None and len(vec):
+                        batch_ids.append(row.id)
+                        batch_vecs.append(vec)
+                    elif row.id in self._ids:
+                        self._mark_deleted(row.id)
+                if batch_vecs:
+                    self._add(np.vstack(batch_vecs).astype(np.float32), batch_ids, params)
+
+            self._revision = revision
+            if stale or reload:
+                self.save()
+            self._synced_at = revision
+
+    def _add(self, vectors, ids, params):
+        if self._index is None:
+            self._index = self._new_index(vectors.shape[1], len(ids) * 2, params)
+            self._params = params
+        # Re-adding an existing (or deleted) id updates its slot in place
+        needed = self._index.get_current_count() + len(ids)
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, self._index.get_max_elements() * 2))
+        self._index.add_items(vectors, np.asarray(ids, dtype=np.int64))
+        self._ids.update(ids)
+
+    def _mark_deleted(self, profile_id):
+        self._index.mark_deleted(profile_id)
+        self._ids.discard(profile_id)
+
+    # ─────────────── incremental updates ───────────────
+
+    def upsert(self, profile_id, vec):
+        with self._lock:
+            if self._index is None:
+                return
+            vec = as_vector(vec)
+            if vec is not None and len(vec):
+                self._add(np.asarray(vec, dtype=np.float32).reshape(1, -1), [profile_id], self._params)
+            elif profile_id in self._ids:
+                self._mark_deleted(profile_id)
+            self._maybe_save()
+
+    def remove(self, profile_id):
+        with self._lock:
+            if self._index is None or profile_id not in self._ids:
+                return
+            self._mark_deleted(profile_id)
+            self._maybe_save()
+
+    # ─────────────── queries ───────────────
+
+    def ensure_fresh(self):
+        if self._index is None or self._synced_at != profile_revision():
+            self.sync()
+
+    def search(self, query_vec, k=None):
+        """Approximate top-k (profile_id, cosine) pairs, best first."""
+        self.ensure_fresh()
+        with self._lock:
+            if self._index is None or not self._ids:
+                return []
+            k = min(k or len(self._ids), len(self._ids))
+            self._index.set_ef(max(self._params["ef_search"], k))
+            query = np.asarray(as_vector(query_vec), dtype=np.float32).reshape(1, -1)
+            labels, distances = self._index.knn_query(query, k=k)
+            self._index.set_ef(self._params["ef_search"])
+            return [(int(pid), float(1.0 - dist)) for pid, dist in zip(labels[0], distances[0])]
+
+
+hnsw_index = HnswProfileIndex() if hnswlib is not None else None
+
+
+def _save_on_exit():
+    if hnsw_index is not None and hnsw_index._dirty:
+        hnsw_index.save()
+
+
+atexit.register(_save_on_exit)
+
+
+# ─────────────────────────────────────────────
+# Backend selection
+# ─────────────────────────────────────────────
+
+def active_index():
+    """Index used for profile retrieval, per the `vector_index_backend` config."""
+    backend = (get_config_value("vector_index_backend", "auto") or "auto").lower()
+    if hnsw_index is None or backend == "exact":
+        return profile_index
+    if backend == "hnsw":
+        return hnsw_index
+
+    pool_size = db.session.query(db.func.count(Profile.id)).scalar() or 0
+    return hnsw_index if pool_size >= get_config_int("ann_min_profiles", 100000) else profile_index
+
+
+def search_profiles(query_vec, k=None):
+    return active_index().search(query_vec, k=k)
+
+
+def on_profile_upserted(profile_id, vec):
+    profile_index.upsert(profile_id, vec)
+    if hnsw_index is not None:
+        hnsw_index.upsert(profile_id, vec)
+
+
+def on_profile_removed(profile_id):
+    profile_index.remove(profile_id)
+    if hnsw_index is not None:
+        hnsw_index.remove(profile_id)
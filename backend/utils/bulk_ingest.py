@@ -0,0 +1,353 @@
+import io
+import os
+import csv
+import time
+import zipfile
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from models import db, Profile
+from utils.logger import logger
+from utils.extractors import POOL_CONTEXT
+from utils.parser import extract_text, extract_experience, extract_email, extraction_settings, extract_names, name_fast_path_enabled
+from utils.skill_extractor import active_taxonomy, install_taxonomy
+from utils.embedding import generate_embeddings
+from utils.concept_cache import encode_texts
+from utils.vector_codec import pack_embedding
+from utils.feature_store import compute_text_features, compute_features, profile_feature_columns
+from utils.ann_index import on_profile_upserted, on_profile_removed
+from utils.upload_store import store_stream, cached_documents, cached_embedding, cached_features, remember
+
+# ─────────────────────────────────────────────
+# Bulk consultant ingestion (ZIP of resumes + CSV roster)
+# ─────────────────────────────────────────────
+# Stages:
+#   1. roster rows are matched to archive members and unpacked to uploads/resumes
+#      under their content hash (utils/upload_store.py)
+#   2. text extraction + regex/keyword parsing run across a process pool; files
+#      whose hash is already in document_cache reuse its text instead
+#   3. embeddings and feature vectors are encoded in batches (one encode per
+#      batch), again skipping whatever the document cache already holds
+#   4. profiles are written and committed in chunks, and the cache is filled
+# Every file that fails at any stage is reported with its reason; the rest continue.
+# The HTTP endpoint only stages the upload and queues a "bulk-ingest" job
+# (utils/job_queue.py); the pool runs in a worker or `cli.py ingest-zip`.
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+UPLOAD_FOLDER_RESUME = os.path.join(BASE_DIR, '..', 'uploads', 'resumes')
+BULK_FOLDER = os.path.join(BASE_DIR, '..', 'uploads', 'bulk')
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt", ".doc"}
+REQUIRED_COLUMNS = ("emp_id", "email")  # a missing name is read from the resume
+
+
+# ─────────────── roster ───────────────
+
+def read_roster(csv_source):
+    """
+    Parse the roster CSV (path, bytes or text). Columns: emp_id, email and
+    optionally name, vertical, file, role, status, experience_years.
+    Returns (rows, failures).
+    """
+    if isinstance(csv_source, bytes):
+        csv_source = csv_source.decode("utf-8-sig", errors="ignore")
+    if isinstance(csv_source, str) and os.path.exists(csv_source):
+        with open(csv_source, "r", encoding="utf-8-sig", errors="ignore") as f:
+            csv_source = f.read()
+
+    reader = csv.DictReader(io.StringIO(csv_source))
+    rows, failures = [], []
+    for line_no, raw in enumerate(reader, start=2):
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in raw.items()}
+        missing = [c for c in REQUIRED_COLUMNS if not row.get(c)]
+        if missing:
+            failures.append({"file": row.get("file"), "emp_id": row.get("emp_id"),
+                             "error": f"CSV line {line_no}: missing {', '.join(missing)}"})
+            continue
+        rows.append(row)
+    return rows, failures
+
+
+def _match_members(archive, rows):
+    """Pair roster rows with archive members by the 'file' column, else by an emp_id filename prefix."""
+    members = {}
+    for info in archive.infolist():
+        if info.is_dir() or os.path.basename(info.filename).startswith("."):
+            continue
+        members[os.path.basename(info.filename).lower()] = info
+
+    pairs, failures, used = [], [], set()
+    for row in rows:
+        info = None
+        if row.get("file"):
+            info = members.get(os.path.basename(row["file"]).lower())
+        else:
+            prefix = row["emp_id"].lower()
+            info = next((m for name, m in members.items()
+                         if os.path.splitext(name)[0] == prefix or name.startswith(prefix + "_")), None)
+        if info is None:
+            failures.append({"file": row.get("file"), "emp_id": row["emp_id"], "error": "No matching file in archive"})
+            continue
+        used.add(os.path.basename(info.filename).lower())
+        pairs.append((row, info))
+
+    for name, info in members.items():
+        if name not in used:
+            failures.append({"file": info.filename, "emp_id": None, "error": "No roster row for file"})
+    return pairs, failures
+
+
+# ─────────────── worker-process stage ───────────────
+
+def extraction_pool(workers):
+    """
+    Process pool for parse_document(). Spawned workers start with the built-in
+    skill vocabulary, so they are handed the taxonomy installed in this
+    process; their skills then carry its version and are not re-extracted.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT,
+                               initializer=install_taxonomy, initargs=active_taxonomy())
+
+
+def parse_text(path, text, text_features=True):
+    """Model-free parsing of extracted text."""
+    if not text or not text.strip():
+        return {"path": path, "error": "Resume unreadable or empty"}
+    return {
+        "path": path,
+        "text": text,
+        "experience_years": extract_experience(text),
+        "email": extract_email(text),
+        "text_features": compute_text_features(text) if text_features else None
+    }
+
+
+def parse_document(path, settings=None):
+    """Extraction + model-free parsing for one file. Runs in a pool worker, so it must stay picklable."""
+    try:
+        return parse_text(path, extract_text(path, settings=settings, parallel=False))
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+
+def _cached_document(path, entry):
+    """parse_document() for a file whose text (and maybe embedding / features) is already cached."""
+    features = cached_features(entry)
+    doc = parse_text(path, entry.extracted_text, text_features=features is None)
+    doc.update(embedding=cached_embedding(entry), features=features, cached=True)
+    return doc
+
+
+# ─────────────── driver ───────────────
+
+def ingest_archive(archive_source, roster_source, workers=None, batch_size=32, commit_every=100, progress=None):
+    """
+    Ingest a ZIP of resumes described by a CSV roster. Requires an app context.
+    Returns a report with per-file failures and throughput.
+    """
+    started = time.time()
+    stage_seconds = {}
+    progress = progress or (lambda stage, done=None, total=None: None)
+
+    rows, failures = read_roster(roster_source)
+
+    # 1. match + unpack
+    t = time.time()
+    os.makedirs(UPLOAD_FOLDER_RESUME, exist_ok=True)
+    jobs = []
+    with zipfile.ZipFile(archive_source) as archive:
+        pairs, match_failures = _match_members(archive, rows)
+        failures.extend(match_failures)
+        for row, info in pairs:
+            base = os.path.basename(info.filename)
+            if os.path.splitext(base)[1].lower() not in SUPPORTED_EXTENSIONS:
+                failures.append({"file": info.filename, "emp_id": row["emp_id"], "error": "Unsupported file type"})
+                continue
+            with archive.open(info) as src:
+                jobs.append((row, store_stream(src, UPLOAD_FOLDER_RESUME, base)))
+    stage_seconds["unpack"] = round(time.time() - t, 3)
+    progress("unpacked", len(jobs), len(jobs))
+
+    # 2. parallel extraction / parsing of the files the document cache has no text for
+    t = time.time()
+    workers = workers or os.cpu_count() or 1
+    cache = cached_documents(upload.content_hash for _, upload in jobs)
+    docs = {}
+    for _, upload in jobs:
+        entry = cache.get(upload.content_hash)
+        if entry is not None and entry.extracted_text and upload.path not in docs:
+            docs[upload.path] = _cached_document(upload.path, entry)
+    paths = sorted({upload.path for _, upload in jobs} - docs.keys())
+    settings = extraction_settings()
+    fast_path = name_fast_path_enabled()
+    if workers > 1 and len(paths) > 1:
+        with extraction_pool(workers) as pool:
+            parsed = list(pool.map(parse_document, paths, [settings] * len(paths),
+                                   chunksize=max(len(paths) // (workers * 4), 1)))
+    else:
+        parsed = [parse_document(p, settings) for p in paths]
+    docs.update(zip(paths, parsed))
+    stage_seconds["extract"] = round(time.time() - t, 3)
+    progress("extracted", len(jobs), len(jobs))
+
+    ready = []
+    for row, upload in jobs:
+        doc = docs[upload.path]
+        doc["content_hash"] = upload.content_hash
+        if "text" in doc and not doc.get("cached"):
+            remember(upload.content_hash, doc["text"], extension=os.path.splitext(upload.filename)[1],
+                     size=upload.size)
+            doc["cached"] = True
+        if doc.get("error"):
+            failures.append({"file": upload.original_name, "emp_id": row["emp_id"], "error": doc["error"]})
+        else:
+            ready.append((row, upload, doc))
+    db.session.commit()
+
+    # 3 + 4. batched encode (cached embeddings / features are reused), chunked commits
+    stage_seconds["encode"] = stage_seconds["store"] = 0.0
+    ingested, chunk = 0, []
+    for start in range(0, len(ready), batch_size):
+        batch = ready[start:start + batch_size]
+        # Rows sharing a file share its doc, which is encoded once
+        unique = list({id(doc): doc for _, _, doc in batch}.values())
+        need_embedding = [doc for doc in unique if not doc.get("embedding")]
+        need_features = [doc for doc in unique if doc.get("features") is None]
+
+        t = time.time()
+        try:
+            if need_embedding:
+                embeddings = generate_embeddings([doc["text"] for doc in need_embedding], batch_size=batch_size)
+                for doc, embedding in zip(need_embedding, embeddings):
+                    doc["embedding"] = embedding
+            if need_features:
+                text_vecs = encode_texts([doc["text"] for doc in need_features], batch_size=batch_size)
+                for doc, text_vec in zip(need_features, text_vecs):
+                    doc["features"] = compute_features(doc["text"], text_vec=text_vec,
+                                                       text_features=doc["text_features"])
+        except Exception as e:
+            failures.extend({"file": u.original_name, "emp_id": r["emp_id"], "error": f"Embedding failed: {e}"}
+                            for r, u, _ in batch)
+            continue
+        stage_seconds["encode"] += time.time() - t
+
+        # Names missing from the roster: one nlp.pipe pass per batch (header fast path first)
+        t = time.time()
+        unnamed = [row for row, _, _ in batch if not row.get("name")]
+        if unnamed:
+            names = extract_names([doc["text"] for row, _, doc in batch if not row.get("name")],
+                                  batch_size=batch_size, fast_path=fast_path)
+            for row, name in zip(unnamed, names):
+                row["name"] = name or row["emp_id"]
+        stage_seconds["nlp"] = stage_seconds.get("nlp", 0.0) + time.time() - t
+
+        t = time.time()
+        for doc in {id(doc): doc for doc in need_embedding + need_features}.values():
+            remember(doc["content_hash"], doc["text"], embedding=doc["embedding"], features=doc["features"])
+        for row, upload, doc in batch:
+            try:
+                try:
+                    experience_years = float(row["experience_years"]) if row.get("experience_years") \
+                        else doc["experience_years"]
+                except ValueError:
+                    experience_years = doc["experience_years"]
+                profile = Profile(
+                    emp_id=row["emp_id"],
+                    name=row["name"],
+                    email=row.get("email") or doc["email"],
+                    role=row.get("role") or "Consultant",
+                    status=row.get("status") or "Available",
+                    vertical=row.get("vertical") or "N/A",
+                    **profile_feature_columns(doc["features"]),
+                    experience_years=experience_years,
+                    resume_path=f"/uploads/resumes/{upload.filename}",
+                    content_hash=upload.content_hash,
+                    extracted_text=doc["text"],
+                    **pack_embedding(doc["embedding"])
+                )
+            except Exception as e:
+                failures.append({"file": upload.original_name, "emp_id": row["emp_id"], "error": str(e)})
+                continue
+            chunk.append((profile, upload.original_name, doc["embedding"]))
+            if len(chunk) >= commit_every:
+                ingested += _commit_chunk(chunk, failures)
+        stage_seconds["store"] += time.time() - t
+        progress("stored", ingested, len(ready))
+
+    if chunk:
+        t = time.time()
+        ingested += _commit_chunk(chunk, failures)
+        stage_seconds["store"] += time.time() - t
+        progress("stored", ingested, len(ready))
+
+    elapsed = time.time() - started
+    stage_seconds = {k: round(v, 3) for k, v in stage_seconds.items()}
+    report = {
+        "ingested": ingested,
+        "failed": len(failures),
+        "failures": failures,
+        "elapsed_seconds": round(elapsed, 3),
+        "docs_per_second": round(ingested / elapsed, 2) if elapsed > 0 else 0.0,
+        "stage_seconds": stage_seconds,
+        "workers": workers
+    }
+    logger.info(f"Bulk ingest: {ingested} profiles, {len(failures)} failures, "
+                f"{report['docs_per_second']} docs/sec ({stage_seconds})")
+    return report
+
+
+# ─────────────── queued ingestion ───────────────
+
+def stage_upload(file_storage, suffix):
+    """Save an uploaded archive / roster under uploads/bulk for a queued job. Returns its path."""
+    os.makedirs(BULK_FOLDER, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=BULK_FOLDER, prefix="bulk-", suffix=suffix)
+    os.close(fd)
+    file_storage.save(path)
+    return path
+
+
+def run_ingest_job(payload, progress=None):
+    """Runner of a queued bulk-ingest job. The staged files are removed once it finishes."""
+    try:
+        report = ingest_archive(payload["archive"], payload["roster"], workers=payload.get("workers"),
+                                batch_size=payload.get("batch_size") or 32, progress=progress)
+    finally:
+        for path in (payload["archive"], payload["roster"]):
+            if os.path.exists(path):
+                os.remove(path)
+    return {"message": f"Bulk upload: {report['ingested']} profiles ingested", **report}, 200
+
+
+def _commit_chunk(chunk, failures):
+    """
+    Write one chunk of profiles (replacing any existing emp_id) in a single
+    commit, then publish them to the vector indexes. A failed commit fails
+    the whole chunk. Clears `chunk`; returns the number committed.
+    """
+    latest = {}
+    for entry in chunk:
+        latest[entry[0].emp_id] = entry  # a repeated emp_id keeps its last roster row
+    chunk[:] = list(latest.values())
+    emp_ids = list(latest)
+    try:
+        existing = Profile.query.filter(Profile.emp_id.in_(emp_ids)).all()
+        removed = [p.id for p in existing]
+        for p in existing:
+            db.session.delete(p)
+        db.session.flush()
+        for profile, _, _ in chunk:
+            db.session.add(profile)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        failures.extend({"file": f, "emp_id": p.emp_id, "error": f"Commit failed: {e}"} for p, f, _ in chunk)
+        chunk.clear()
+        return 0
+
+    for profile_id in removed:
+        on_profile_removed(profile_id)
+    for profile, _, embedding in chunk:
+        on_profile_upserted(profile.id, embedding)
+    committed = len(chunk)
+    chunk.clear()
+    return committed
@@ -0,0 +1,63 @@
+import threading
+import numpy as np
+from utils.model_registry import get_sentence_model
+
+# ─────────────────────────────────────────────
+# Concept-embedding cache
+# ─────────────────────────────────────────────
+# Fixed concept lists (signal phrases, vertical descriptions) are encoded once
+# per process into a single normalised matrix. Scoring a text against a whole
+# concept set is then one encode of the text plus one matrix-vector product.
+
+_matrices = {}
+_lock = threading.Lock()
+
+
+def _key(concepts):
+    if isinstance(concepts, dict):
+        return ("dict",) + tuple(concepts.items())
+    return ("list",) + tuple(concepts)
+
+
+def concept_matrix(concepts):
+    """
+    (labels, matrix) for a concept list or {label: description} dict.
+    Rows of the matrix are L2-normalised float32 embeddings.
+    """
+    key = _key(concepts)
+    cached = _matrices.get(key)
+    if cached is not None:
+        return cached
+
+    with _lock:
+        cached = _matrices.get(key)
+        if cached is None:
+            if isinstance(concepts, dict):
+                labels, texts = list(concepts.keys()), list(concepts.values())
+            else:
+                labels, texts = list(concepts), list(concepts)
+            matrix = get_sentence_model().encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+            cached = (labels, np.asarray(matrix, dtype=np.float32))
+            _matrices[key] = cached
+    return cached
+
+
+def encode_text(text):
+    """Normalised float32 embedding of a raw text (no instruction prefix)."""
+    vec = get_sentence_model().encode(text, normalize_embeddings=True, convert_to_numpy=True)
+    return np.asarray(vec, dtype=np.float32)
+
+
+def encode_texts(texts, batch_size=32):
+    """Batched encode_text: (len(texts), dim) normalised float32 matrix."""
+    matrix = get_sentence_model().encode(list(texts), batch_size=batch_size, normalize_embeddings=True,
+                                         convert_to_numpy=True)
+    return np.asarray(matrix, dtype=np.float32)
+
+
+def concept_similarities(text=None, concepts=(), text_vec=None):
+    """Cosine similarity of a text (or its precomputed normalised embedding) to every concept."""
+    labels, matrix = concept_matrix(concepts)
+    if text_vec is None:
+        text_vec = encode_text(text)
+    return labels, matrix @ text_vec
@@ -0,0 +1,60 @@
+import time
+import threading
+from sqlalchemy import text
+from models import db
+
+# ─────────────────────────────────────────────
+# Process-local Config cache
+# ─────────────────────────────────────────────
+# All Config rows are loaded with one query and served from memory. Writes in
+# this process call invalidate(). Other processes (match workers, other app
+# instances) notice changes through a cheap version check, (row count,
+# max(updated_at)), which runs at most once every VERSION_CHECK_SECONDS.
+
+VERSION_CHECK_SECONDS = 2.0
+
+_values = None
+_version = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _current_version():
+    row = db.session.execute(text("SELECT COUNT(*), MAX(updated_at) FROM config")).fetchone()
+    return (row[0], str(row[1])) if row else (0, None)
+
+
+def _reload():
+    global _values, _version, _checked_at
+    version = _current_version()
+    rows = db.session.execute(text("SELECT key, value FROM config")).fetchall()
+    _values = {key: value for key, value in rows}
+    _version, _checked_at = version, time.monotonic()
+
+
+def get_all():
+    """Snapshot dict of every config key. Requires an app context on (re)load."""
+    global _checked_at
+    with _lock:
+        if _values is None:
+            _reload()
+        elif time.monotonic() - _checked_at >= VERSION_CHECK_SECONDS:
+            if _current_version() != _version:
+                _reload()
+            else:
+                _checked_at = time.monotonic()
+        return _values
+
+
+def get(key, default=None):
+    return get_all().get(key, default)
+
+
+def invalidate():
+    global _values, _version
+    with _lock:
+        _values, _version = None, None
+
+
+def cache_version():
+    return _version
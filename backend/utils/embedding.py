@@ -1,7 +1,4 @@
-from sentence_transformers import SentenceTransformer
-
-# Load BGE model (optimized for role-specific embeddings)
-model = SentenceTransformer("all-MiniLM-L6-v2")
+from utils.model_registry import get_sentence_model
 
 def generate_embedding(text, instruction="Represent this as a candidate profile"):
     """
@@ -18,4 +15,19 @@ def generate_embedding(text, instruction="Represent this as a candidate profile"
         return []
 
     prompt = f"{instruction}: {text.strip()}"
-    return model.encode(prompt, normalize_embeddings=True).tolist()
+    return get_sentence_model().encode(prompt, normalize_embeddings=True).tolist()
+
+
+def generate_embeddings(texts, instruction="Represent this as a candidate profile", batch_size=32):
+    """
+    Batched generate_embedding: one model.encode call for many texts.
+    Returns a list aligned with texts; empty texts map to [].
+    """
+    prompts = [(i, f"{instruction}: {t.strip()}") for i, t in enumerate(texts) if t and t.strip()]
+    result = [[] for _ in texts]
+    if not prompts:
+        return result
+    vectors = get_sentence_model().encode([p for _, p in prompts], batch_size=batch_size, normalize_embeddings=True)
+    for (i, _), vec in zip(prompts, vectors):
+        result[i] = vec.tolist()
+    return result
@@ -1,16 +1,22 @@
 import re
-import cohere
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 from utils.skill_extractor import extract_skills_contextual
 from utils.parser import extract_experience
 from utils.utils import log_agent_error
-from models import Config
-from flask import current_app as app
+from models import db
+from utils.model_registry import get_sentence_model
+from utils.concept_cache import concept_similarities, encode_text
+from utils.admin_utils import get_config_value, get_config_int, get_config_float
+from utils.genai_client import get_genai_client
+from utils import genai_cache
+from utils.logger import logger
 
-# ✅ Use BGE embedding model
-model = SentenceTransformer("all-MiniLM-L6-v2")
 MAX_SUMMARY_CHARS = 2000
 
+DEFAULT_GENAI_INSTRUCTION = "Summarize fit quality, skills match, experience, certifications, and any unique strength."
+
+GENAI_SOURCES = {"cohere": "Cohere", "stub": "Stub"}
+
 BONUS_SIGNALS = [
     "open source", "published", "mentored", "led team", "founded", "speaker",
     "initiated", "whitepaper", "conference"
@@ -31,18 +37,22 @@ PROJECT_SIGNALS = [
 # ─────────────────────────────────────
 
 def fetch_genai_config():
-    with app.app_context():
-        provider_cfg = Config.query.filter_by(key="genai_provider").first()
-        key_cfg = Config.query.filter_by(key="genai_key").first()
-        enabled_cfg = Config.query.filter_by(key="genai_enabled").first()
-        prompt_cfg = Config.query.filter_by(key="genai_prompt").first()
-
-        return {
-            "provider": (provider_cfg.value or "").strip().lower() if provider_cfg else "",
-            "api_key": (key_cfg.value or "").strip() if key_cfg else "",
-            "enabled": (enabled_cfg.value or "false").strip().lower() == "true" if enabled_cfg else False,
-            "prompt": (prompt_cfg.value or "").strip() if prompt_cfg else ""
-        }
+    """GenAI settings from the config cache: no queries unless the config version changed."""
+    return {
+        "provider": (get_config_value("genai_provider") or "").strip().lower(),
+        "api_key": (get_config_value("genai_key") or "").strip(),
+        "enabled": (get_config_value("genai_enabled") or "false").strip().lower() == "true",
+        "prompt": (get_config_value("genai_prompt") or "").strip(),
+        "model": (get_config_value("genai_model") or "").strip(),
+        "base_url": (get_config_value("genai_base_url") or "").strip(),
+        "max_concurrency": get_config_int("genai_max_concurrency", 4),
+        "rate_limit": get_config_float("genai_rate_limit", 0.0),
+        "timeout": get_config_float("genai_timeout_seconds", 20.0),
+        "max_retries": get_config_int("genai_max_retries", 2),
+        "cache_enabled": (get_config_value("genai_cache_enabled") or "true").strip().lower() == "true",
+        "cache_ttl_hours": get_config_float("genai_cache_ttl_hours", genai_cache.DEFAULT_TTL_HOURS),
+        "cache_max_entries": get_config_int("genai_cache_max_entries", genai_cache.DEFAULT_MAX_ENTRIES)
+    }
 
 def semantic_skill_score(jd_skills, resume_skills, threshold=0.5):
     if not jd_skills or not resume_skills:
@@ -51,6 +61,7 @@ def semantic_skill_score(jd_skills, resume_skills, threshold=0.5):
     jd_skills = [s.strip() for s in jd_skills if isinstance(s, str) and s.strip()]
     resume_skills = [s.strip() for s in resume_skills if isinstance(s, str) and s.strip()]
 
+    model = get_sentence_model()
     jd_emb = model.encode(jd_skills, convert_to_tensor=True)
     res_emb = model.encode(resume_skills, convert_to_tensor=True)
 
@@ -67,17 +78,11 @@ def semantic_skill_score(jd_skills, resume_skills, threshold=0.5):
     ratio = len(matched) / max(len(jd_skills), 1)
     return matched, round(ratio, 2)
 
-def semantic_signal_score(text, keywords, threshold=0.5):
-    if not text:
+def semantic_signal_score(text, keywords, threshold=0.5, text_vec=None):
+    if not text and text_vec is None:
         return []
-    found = []
-    text_emb = model.encode(text, convert_to_tensor=True)
-    for k in keywords:
-        k_emb = model.encode(k, convert_to_tensor=True)
-        sim = float(util.cos_sim(text_emb, k_emb)[0][0])
-        if sim >= threshold:
-            found.append(k)
-    return found
+    labels, sims = concept_similarities(text, keywords, text_vec=text_vec)
+    return [k for k, sim in zip(labels, sims) if sim >= threshold]
 def extract_sentences_with_keywords(text, keywords):
     lines = text.split('\n')
     found = []
@@ -130,7 +135,7 @@ def clean_highlights(lines):
 # Main Explanation Generator
 # ─────────────────────────────────────
 
-def generate_explanation(jd_text, resume_text, use_gpt=False):
+def build_local_explanation(jd_text, resume_text):
     jd_skills = extract_skills_contextual(jd_text)
     res_skills = extract_skills_contextual(resume_text)
 
@@ -143,14 +148,15 @@ def generate_explanation(jd_text, resume_text, use_gpt=False):
 
     semantic_pairs, semantic_ratio = semantic_skill_score(jd_skills, res_skills)
 
-    certs = semantic_signal_score(resume_text, CERT_SIGNALS)
-    bonus_signals = semantic_signal_score(resume_text, BONUS_SIGNALS)
-    project_signals = semantic_signal_score(resume_text, PROJECT_SIGNALS)
+    resume_vec = encode_text(resume_text)
+    certs = semantic_signal_score(resume_text, CERT_SIGNALS, text_vec=resume_vec)
+    bonus_signals = semantic_signal_score(resume_text, BONUS_SIGNALS, text_vec=resume_vec)
+    project_signals = semantic_signal_score(resume_text, PROJECT_SIGNALS, text_vec=resume_vec)
 
     raw_highlights = extract_sentences_with_keywords(resume_text, exact_match + certs + bonus_signals)
     highlights = clean_highlights(raw_highlights)
 
-    explanation = {
+    return {
         "summary": f"{len(exact_match)} exact, {len(semantic_pairs)} semantic skills. "
                    f"Experience: {res_exp} vs {jd_exp} yrs — {'✅ OK' if exp_match else '⚠️ Mismatch'}",
         "skills_matched": exact_match[:15],
@@ -165,29 +171,98 @@ def generate_explanation(jd_text, resume_text, use_gpt=False):
         "source": "BGE"
     }
 
-    try:
-        config = fetch_genai_config()
-        if use_gpt and config["enabled"] and config["provider"] == "cohere" and config["api_key"]:
-            co = cohere.Client(config["api_key"])
-            prompt = config["prompt"] or "Summarize fit quality, skills match, experience, certifications, and any unique strength."
-            final_prompt = f"""
+GENAI_PROMPT_TEMPLATE = """
 You are a technical recruiter. Analyze how well this resume matches the job.
 
 Job Description:
-{jd_text[:1500]}
+{jd_text}
 
 Resume:
-{resume_text[:1500]}
+{resume_text}
 
 Instruction:
-{prompt}
-            """.strip()
-            response = co.chat(message=final_prompt, model="command-r")
-            explanation["gpt_summary"] = response.text.strip()[:MAX_SUMMARY_CHARS] if hasattr(response, "text") else "⚠️ No GenAI output"
-            explanation["source"] = "Cohere"
-    except Exception as e:
-        log_agent_error("GenAIExplanationError", str(e), method="generate_explanation")
-        explanation["gpt_summary"] = f"⚠️ GenAI failed: {e}"
+{instruction}
+"""
+
+GENAI_TEXT_CHARS = 1500
+
+def build_genai_prompt(jd_text, resume_text, instruction=""):
+    return GENAI_PROMPT_TEMPLATE.format(
+        jd_text=jd_text[:GENAI_TEXT_CHARS],
+        resume_text=resume_text[:GENAI_TEXT_CHARS],
+        instruction=instruction or DEFAULT_GENAI_INSTRUCTION
+    ).strip()
+
+def genai_cache_key(config, jd_text, resume_text):
+    return genai_cache.make_cache_key(
+        config["provider"], config.get("model"), GENAI_PROMPT_TEMPLATE,
+        config["prompt"] or DEFAULT_GENAI_INSTRUCTION,
+        jd_text[:GENAI_TEXT_CHARS], resume_text[:GENAI_TEXT_CHARS]
+    )
+
+def _apply_genai_result(explanation, result, source):
+    if isinstance(result, Exception):
+        log_agent_error("GenAIExplanationError", str(result), method="generate_explanation")
+        explanation["gpt_summary"] = f"⚠️ GenAI failed: {result}"
         explanation["source"] = "BGE"
+        return
+    explanation["gpt_summary"] = result.strip()[:MAX_SUMMARY_CHARS] if result else "⚠️ No GenAI output"
+    explanation["source"] = source
+
+def generate_explanations(pairs, use_gpt=False):
+    """
+    Explain many (jd_text, resume_text) pairs. Summaries already in the GenAI
+    cache are reused; the rest are submitted up front and run concurrently on
+    the pooled client while the local explanations are computed, so the batch
+    waits for the slowest call only.
+    """
+    pairs = list(pairs)
+    futures = [None] * len(pairs)
+    cached = [None] * len(pairs)
+    keys = [None] * len(pairs)
+    client, config, source = None, None, "BGE"
+
+    if use_gpt and pairs:
+        try:
+            config = fetch_genai_config()
+            client = get_genai_client(config)
+            source = GENAI_SOURCES.get(config["provider"], "BGE")
+            if client is not None and config["cache_enabled"]:
+                keys = [genai_cache_key(config, jd, res) for jd, res in pairs]
+                hits = genai_cache.get_cached(keys, ttl_hours=config["cache_ttl_hours"])
+                cached = [hits.get(k) for k in keys]
+        except Exception as e:
+            log_agent_error("GenAIExplanationError", str(e), method="generate_explanation")
+        if client is not None:
+            futures = [None if cached[i] is not None else client.submit(build_genai_prompt(jd, res, config["prompt"]))
+                       for i, (jd, res) in enumerate(pairs)]
+
+    explanations = [build_local_explanation(jd, res) for jd, res in pairs]
+
+    if client is not None:
+        fresh = {}
+        for i, (explanation, future) in enumerate(zip(explanations, futures)):
+            if future is None:
+                _apply_genai_result(explanation, cached[i], source)
+                explanation["genai_cached"] = True
+                continue
+            try:
+                result = future.result()
+                if result and keys[i]:
+                    fresh[keys[i]] = result.strip()
+            except Exception as e:
+                result = e
+            _apply_genai_result(explanation, result, source)
+
+        if fresh:
+            try:
+                genai_cache.store(fresh, provider=config["provider"], model=config.get("model"),
+                                  max_entries=config["cache_max_entries"], ttl_hours=config["cache_ttl_hours"])
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"GenAI cache write failed: {e}")
+
+    return explanations
 
-    return explanation
+def generate_explanation(jd_text, resume_text, use_gpt=False):
+    return generate_explanations([(jd_text, resume_text)], use_gpt=use_gpt)[0]
@@ -0,0 +1,239 @@
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────
+# Document text extraction engines
+# ─────────────────────────────────────────────
+# Each engine handles some file extensions. PDF engines also expose page
+# counts and page ranges, which lets long PDFs be split across worker
+# processes. Optional backends (PyMuPDF, pdfminer.six, textract) are used
+# only when they are installed. Page and character caps bound the work spent
+# on oversized documents.
+#
+#   pypdf2    PyPDF2, pure python (always available, default)
+#   pymupdf   PyMuPDF / fitz, C library, usually the fastest
+#   pdfminer  pdfminer.six, slow but handles some layouts better
+#   docx      docx2txt
+#   text      plain .txt
+#   textract  legacy .doc via textract
+
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_CHARS = 100_000
+PARALLEL_MIN_PAGES = 16      # PDFs shorter than this are read in-process
+PAGES_PER_WORKER = 8
+
+
+class ExtractionEngine:
+    name = None
+    extensions = ()
+    paged = False
+
+    def available(self):
+        return True
+
+    def extract(self, path, max_pages=None):
+        raise NotImplementedError
+
+
+class PagedEngine(ExtractionEngine):
+    paged = True
+
+    def page_count(self, path):
+        raise NotImplementedError
+
+    def extract_pages(self, path, start, end):
+        """Text of pages [start, end) as a list of strings."""
+        raise NotImplementedError
+
+    def extract(self, path, max_pages=None):
+        total = self.page_count(path)
+        end = min(total, max_pages) if max_pages else total
+        return "\n".join(self.extract_pages(path, 0, end))
+
+
+# ─────────────── PDF engines ───────────────
+
+class PyPDF2Engine(PagedEngine):
+    name = "pypdf2"
+    extensions = (".pdf",)
+
+    def page_count(self, path):
+        import PyPDF2
+        with open(path, "rb") as f:
+            return len(PyPDF2.PdfReader(f).pages)
+
+    def extract_pages(self, path, start, end):
+        import PyPDF2
+        with open(path, "rb") as f:
+            reader = PyPDF2.PdfReader(f)
+            return [reader.pages[i].extract_text() or "" for i in range(start, min(end, len(reader.pages)))]
+
+
+class PyMuPDFEngine(PagedEngine):
+    name = "pymupdf"
+    extensions = (".pdf",)
+
+    def available(self):
+        try:
+            import fitz  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def page_count(self, path):
+        import fitz
+        with fitz.open(path) as doc:
+            return doc.page_count
+
+    def extract_pages(self, path, start, end):
+        import fitz
+        with fitz.open(path) as doc:
+            return [doc.load_page(i).get_text() for i in range(start, min(end, doc.page_count))]
+
+
+class PdfMinerEngine(PagedEngine):
+    name = "pdfminer"
+    extensions = (".pdf",)
+
+    def available(self):
+        try:
+            import pdfminer.high_level  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def page_count(self, path):
+        from pdfminer.pdfpage import PDFPage
+        with open(path, "rb") as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+
+    def extract_pages(self, path, start, end):
+        from pdfminer.high_level import extract_text
+        return [extract_text(path, page_numbers=[i]) or "" for i in range(start, end)]
+
+
+# ─────────────── other formats ───────────────
+
+class DocxEngine(ExtractionEngine):
+    name = "docx"
+    extensions = (".docx",)
+
+    def extract(self, path, max_pages=None):
+        import docx2txt
+        return docx2txt.process(path) or ""
+
+
+class TextEngine(ExtractionEngine):
+    name = "text"
+    extensions = (".txt",)
+
+    def extract(self, path, max_pages=None):
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read()
+
+
+class TextractEngine(ExtractionEngine):
+    name = "textract"
+    extensions = (".doc",)
+
+    def available(self):
+        try:
+            import textract  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def extract(self, path, max_pages=None):
+        import textract
+        return textract.process(path).decode("utf-8")
+
+
+ENGINES = {engine.name: engine for engine in (
+    PyMuPDFEngine(), PyPDF2Engine(), PdfMinerEngine(), DocxEngine(), TextEngine(), TextractEngine()
+)}
+
+# Preference order when no engine is configured
+AUTO_ORDER = {".pdf": ("pymupdf", "pypdf2", "pdfminer")}
+
+
+class UnsupportedDocument(ValueError):
+    pass
+
+
+def engine_for(ext, preferred=None):
+    """Engine for a file extension: the preferred one if it fits and is installed, else the first available."""
+    ext = ext.lower()
+    if preferred and preferred != "auto":
+        engine = ENGINES.get(preferred)
+        if engine and ext in engine.extensions and engine.available():
+            return engine
+    candidates = AUTO_ORDER.get(ext) or [e.name for e in ENGINES.values() if ext in e.extensions]
+    for name in candidates:
+        engine = ENGINES[name]
+        if engine.available():
+            return engine
+    if any(ext in e.extensions for e in ENGINES.values()):
+        raise UnsupportedDocument(f"No extraction backend installed for {ext}")
+    raise UnsupportedDocument("Unsupported file type")
+
+
+def available_engines():
+    return {name: engine.available() for name, engine in ENGINES.items()}
+
+
+# ─────────────── page-parallel PDF extraction ───────────────
+
+# Every extraction pool (this one, bulk and drop-folder ingestion) starts its
+# processes with "spawn": a forked child of a threaded parent (the Flask
+# server, a job worker with its heartbeat thread) can inherit a lock held by
+# another thread and hang.
+POOL_CONTEXT = multiprocessing.get_context("spawn")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _page_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max((os.cpu_count() or 2) - 1, 1), mp_context=POOL_CONTEXT)
+        return _pool
+
+
+def _extract_range(engine_name, path, start, end):
+    return ENGINES[engine_name].extract_pages(path, start, end)
+
+
+def extract_document(path, engine=None, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, parallel=True):
+    """
+    Raw text of a document. Long PDFs are split into page ranges and read in
+    worker processes when `parallel` is set (leave it off inside pool workers).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    chosen = engine_for(ext, engine)
+
+    if chosen.paged:
+        total = chosen.page_count(path)
+        end = min(total, max_pages) if max_pages else total
+        if parallel and end >= PARALLEL_MIN_PAGES:
+            step = max(PAGES_PER_WORKER, -(-end // (os.cpu_count() or 1)))
+            futures = [_page_pool().submit(_extract_range, chosen.name, path, s, min(s + step, end))
+                       for s in range(0, end, step)]
+            pages = [page for future in futures for page in future.result()]
+        else:
+            pages = chosen.extract_pages(path, 0, end)
+        text = "\n".join(pages)
+        if end < total:
+            logger.info(f"{os.path.basename(path)}: read {end} of {total} pages (max_pages={max_pages})")
+    else:
+        text = chosen.extract(path, max_pages=max_pages)
+
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars]
+    return text
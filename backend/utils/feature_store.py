@@ -0,0 +1,162 @@
+import json
+from utils.skill_extractor import extract_skills_contextual, current_skill_version
+from utils.parser import extract_certifications, extract_projects
+from utils.concept_cache import concept_similarities, encode_text
+from utils.matcher import (
+    HUMAN_SIGNAL_CONCEPTS, CERTIFICATION_CONCEPTS, PROJECT_SIGNAL_CONCEPTS, VERTICAL_SIGNAL_CONCEPTS,
+    count_signal_hits, semantic_signal_score
+)
+
+# ─────────────────────────────────────────────
+# Per-document scoring features
+# ─────────────────────────────────────────────
+# Everything compute_full_text_score needs from the profile side is derived once
+# at upload and persisted with FEATURE_VERSION. Bump the version whenever an
+# extractor or signal list changes so stale rows are recomputed on next use.
+# Skills also carry the skill taxonomy version (utils/skill_taxonomy.py). An
+# admin edit to the taxonomy only makes the skills stale: they are re-extracted
+# with one regex pass, and the embedding-derived features are kept.
+
+FEATURE_VERSION = 2
+
+
+def compute_text_features(text):
+    """The model-free part of compute_features (regex / keyword work); safe to run in a worker process."""
+    text = text or ""
+    projects = extract_projects(text) if text else []
+    certifications = extract_certifications(text) if text else []
+    return {
+        "skills": extract_skills_contextual(text) if text else [],
+        "skills_version": current_skill_version(),
+        "projects": projects,
+        "certifications": certifications,
+        "project_hits": count_signal_hits(projects, PROJECT_SIGNAL_CONCEPTS),
+        "cert_hits": count_signal_hits(certifications, CERTIFICATION_CONCEPTS)
+    }
+
+
+def compute_features(text, text_vec=None, text_features=None):
+    """Derive the stored scoring features from a resume's extracted text."""
+    text = text or ""
+    if text_vec is None and text:
+        text_vec = encode_text(text)
+
+    inferred_vertical = None
+    human_signal = 0.0
+    if text_vec is not None:
+        human_signal = semantic_signal_score(None, HUMAN_SIGNAL_CONCEPTS, text_vec=text_vec)
+        labels, sims = concept_similarities(concepts=VERTICAL_SIGNAL_CONCEPTS, text_vec=text_vec)
+        best = int(sims.argmax())
+        inferred_vertical = labels[best] if float(sims[best]) > 0.5 else None
+
+    features = dict(text_features or compute_text_features(text))
+    if features.get("skills_version") != current_skill_version():
+        # Extracted by a worker process holding an older taxonomy
+        features.update(skills=extract_skills_contextual(text) if text else [],
+                        skills_version=current_skill_version())
+    features.update(
+        human_signal_score=human_signal,
+        inferred_vertical=inferred_vertical,
+        feature_version=FEATURE_VERSION
+    )
+    return features
+
+
+# ─────────────────────────────────────────────
+# Profile / Resume column mapping
+# ─────────────────────────────────────────────
+
+def _split_skills(skills):
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        return [s.strip() for s in skills.split(",") if s.strip()]
+    return list(skills)
+
+
+def profile_feature_columns(features):
+    """Profile constructor / update kwargs for a feature dict."""
+    return {
+        "skills": ", ".join(features["skills"]),
+        "projects": json.dumps(features["projects"]),
+        "certifications": json.dumps(features["certifications"]),
+        "project_hits": features["project_hits"],
+        "cert_hits": features["cert_hits"],
+        "human_signal_score": features["human_signal_score"],
+        "inferred_vertical": features["inferred_vertical"],
+        "feature_version": features["feature_version"],
+        "skills_version": features.get("skills_version")
+    }
+
+
+def resume_feature_columns(features):
+    """Resume constructor / update kwargs (legacy comma-joined text columns)."""
+    return {
+        "skills": ", ".join(features["skills"]),
+        "certifications": ", ".join(features["certifications"][:5]),
+        "projects": ", ".join(features["projects"][:3]),
+        "domain": features["inferred_vertical"] or "Unknown",
+        "project_hits": features["project_hits"],
+        "cert_hits": features["cert_hits"],
+        "human_signal_score": features["human_signal_score"],
+        "feature_version": features["feature_version"],
+        "skills_version": features.get("skills_version")
+    }
+
+
+def _getter(row):
+    return row.get if isinstance(row, dict) else (lambda key: getattr(row, key, None))
+
+
+def features_fresh(row):
+    """Everything but the skills is current. `row` is a Profile / Resume or a stored feature dict."""
+    return _getter(row)("feature_version") == FEATURE_VERSION
+
+
+def skills_fresh(row):
+    return _getter(row)("skills_version") == current_skill_version()
+
+
+def is_fresh(row):
+    return features_fresh(row) and skills_fresh(row)
+
+
+def refresh_skills(text):
+    """Skills under the current taxonomy: the only features a taxonomy edit invalidates."""
+    return {"skills": extract_skills_contextual(text) if text else [], "skills_version": current_skill_version()}
+
+
+def stored_features(row):
+    """Scoring features as stored on a Profile / Resume row, or None if stale."""
+    if not is_fresh(row):
+        return None
+    return {
+        "skills": _split_skills(row.skills),
+        "project_hits": row.project_hits or 0,
+        "cert_hits": row.cert_hits or 0,
+        "human_signal_score": row.human_signal_score or 0.0
+    }
+
+
+def ensure_features(row, text=None):
+    """
+    Stored features for a row, recomputing and assigning them first if the row
+    predates the current FEATURE_VERSION, or only its skills if it predates the
+    current skill taxonomy. The caller commits the session.
+    """
+    features = stored_features(row)
+    if features is not None:
+        return features
+
+    text = text or row.extracted_text
+    if not text:
+        return None
+    if features_fresh(row):
+        skills = refresh_skills(text)
+        row.skills, row.skills_version = ", ".join(skills["skills"]), skills["skills_version"]
+        return stored_features(row)
+    computed = compute_features(text)
+    columns = resume_feature_columns(computed) if row.__tablename__ == "resume" else profile_feature_columns(computed)
+    for key, value in columns.items():
+        setattr(row, key, value)
+    return stored_features(row)
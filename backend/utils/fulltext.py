@@ -0,0 +1,155 @@
+import re
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from models import db
+from utils.logger import logger
+
+# ─────────────────────────────────────────────
+# Full-text search (SQLite FTS5)
+# ─────────────────────────────────────────────
+# profile_fts and jd_fts are external-content FTS5 tables over profile and
+# jd. They store only the inverted index; the text itself stays in the base
+# table. Triggers on the base tables keep the indexes in sync for every
+# writer: ORM, raw SQL and migrations alike. Results are ranked with BM25.
+# Skills and titles are weighted above body text. Each hit carries a snippet
+# of the best-matching passage.
+#
+# Tokenizer: porter stemming over unicode61, with '#' and '+' kept inside
+# tokens so "c#" and "c++" stay searchable.
+
+TOKENIZER = "porter unicode61 tokenchars '#+'"
+
+FTS_TABLES = {
+    "profile": {
+        "fts": "profile_fts",
+        "columns": ("name", "skills", "extracted_text"),
+        "weights": (2.0, 4.0, 1.0),
+        "snippet_column": 2
+    },
+    "jd": {
+        "fts": "jd_fts",
+        "columns": ("job_title", "extracted_text"),
+        "weights": (4.0, 1.0),
+        "snippet_column": 1
+    }
+}
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+SNIPPET_TOKENS = 16
+TERM_PATTERN = re.compile(r"[\w#+]+\*?")
+QUERY_ERROR_MARKERS = ("fts5: syntax error", "malformed match")
+
+
+class FullTextQueryError(ValueError):
+    """The MATCH expression was rejected by FTS5 (a client error, unlike a broken index)."""
+
+
+def _ddl(table, spec):
+    fts, cols = spec["fts"], spec["columns"]
+    col_list = ", ".join(cols)
+    new_values = ", ".join(f"new.{c}" for c in cols)
+    old_values = ", ".join(f"old.{c}" for c in cols)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{col_list}, content='{table}', content_rowid='id', tokenize=\"{TOKENIZER}\")",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def _exists(name):
+    return db.session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": name}).first() is not None
+
+
+def ensure_fulltext_tables():
+    """Create the FTS tables and triggers; a newly created index is filled from its base table."""
+    created = []
+    for table, spec in FTS_TABLES.items():
+        is_new = not _exists(spec["fts"])
+        for statement in _ddl(table, spec):
+            db.session.execute(text(statement))
+        if is_new:
+            db.session.execute(text(f"INSERT INTO {spec['fts']}({spec['fts']}) VALUES ('rebuild')"))
+            created.append(spec["fts"])
+    db.session.commit()
+    return created
+
+
+def rebuild_fulltext(optimize=True):
+    """Re-index every row from the base tables (backfill / repair). Returns row counts per table."""
+    counts = {}
+    for table, spec in FTS_TABLES.items():
+        fts = spec["fts"]
+        db.session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        if optimize:
+            db.session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('optimize')"))
+        counts[fts] = db.session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+    db.session.commit()
+    return counts
+
+
+# ─────────────── querying ───────────────
+
+def build_match_query(query, mode="all", max_terms=None):
+    """
+    FTS5 MATCH expression for free user text. Every term is quoted, so
+    punctuation and FTS operators in the input cannot break the query. A
+    trailing '*' keeps prefix search. mode='all' ANDs the terms, 'any' ORs them.
+    """
+    terms = []
+    for raw in TERM_PATTERN.findall((query or "").lower()):
+        prefix = raw.endswith("*")
+        term = raw.rstrip("*")
+        if term and term not in terms:
+            terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    if max_terms:
+        terms = terms[:max_terms]
+    return (" OR " if mode == "any" else " ").join(terms)
+
+
+def search(table, query, limit=DEFAULT_LIMIT, mode="all", with_snippets=True):
+    """
+    Rank rows of `table` ('profile' or 'jd') for `query`. Returns a list of
+    {"id", "score", "snippet"} dicts, best first. Higher scores are better
+    (negated BM25). Callers serving user requests cap `limit` at MAX_LIMIT.
+    Raises FullTextQueryError for a query FTS5 rejects; other database errors
+    (a missing or corrupt index) propagate unchanged.
+    """
+    spec = FTS_TABLES[table]
+    match = build_match_query(query, mode)
+    if not match:
+        return []
+    fts = spec["fts"]
+    weights = ", ".join(str(w) for w in spec["weights"])
+    snippet = (f"snippet({fts}, {spec['snippet_column']}, '<mark>', '</mark>', '…', {SNIPPET_TOKENS})"
+               if with_snippets else "NULL")
+    try:
+        rows = db.session.execute(text(
+            f"SELECT rowid, -bm25({fts}, {weights}) AS score, {snippet} FROM {fts} "
+            f"WHERE {fts} MATCH :match ORDER BY bm25({fts}, {weights}) LIMIT :limit"
+        ), {"match": match, "limit": max(1, int(limit))}).fetchall()
+    except OperationalError as e:
+        db.session.rollback()
+        if any(marker in str(e.orig).lower() for marker in QUERY_ERROR_MARKERS):
+            raise FullTextQueryError(f"Invalid search query: {e.orig}") from e
+        raise
+    return [{"id": row_id, "score": round(score, 4), "snippet": snip} for row_id, score, snip in rows]
+
+
+def timed_search(table, query, **kwargs):
+    """search() plus its duration in ms. Failures are logged and re-raised for the caller to report."""
+    start = time.perf_counter()
+    try:
+        hits = search(table, query, **kwargs)
+    except Exception as e:
+        logger.warning(f"Full-text search on {table} failed for {query!r}: {e}")
+        raise
+    return hits, round((time.perf_counter() - start) * 1000, 2)
@@ -0,0 +1,107 @@
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from models import db, GenAICache
+from utils.logger import logger
+
+# ─────────────────────────────────────────────
+# Persistent GenAI response cache
+# ─────────────────────────────────────────────
+# Summaries are stored in the genai_cache table under a sha256 of everything
+# that determines the provider output: provider, model, prompt template,
+# instruction and the truncated JD / resume text. A repeat match is answered
+# from the table with no provider call. Entries expire after a TTL, and the
+# table is trimmed back to a maximum size by least-recent use.
+
+DEFAULT_TTL_HOURS = 24 * 7
+DEFAULT_MAX_ENTRIES = 5000
+
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name, n=1):
+    with _stats_lock:
+        _stats[name] += n
+
+
+def make_cache_key(provider, model, template, instruction, jd_text, resume_text):
+    digest = hashlib.sha256()
+    for part in (provider, model, template, instruction, jd_text, resume_text):
+        digest.update((part or "").encode("utf-8", errors="ignore"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def get_cached(keys, ttl_hours=DEFAULT_TTL_HOURS):
+    """{key: response} for the unexpired keys among `keys`; bumps their hit counters."""
+    keys = [k for k in set(keys) if k]
+    if not keys:
+        return {}
+    cutoff = datetime.utcnow() - timedelta(hours=ttl_hours)
+    rows = GenAICache.query.filter(GenAICache.cache_key.in_(keys), GenAICache.created_at >= cutoff).all()
+
+    now = datetime.utcnow()
+    for row in rows:
+        row.hits = (row.hits or 0) + 1
+        row.last_used_at = now
+    if rows:
+        db.session.commit()
+
+    _count("hits", len(rows))
+    _count("misses", len(keys) - len(rows))
+    return {row.cache_key: row.response for row in rows}
+
+
+def store(entries, provider=None, model=None, max_entries=DEFAULT_MAX_ENTRIES, ttl_hours=DEFAULT_TTL_HOURS):
+    """Persist {key: response} (successful summaries only), then enforce TTL and size bounds."""
+    entries = {k: v for k, v in entries.items() if k and v}
+    if not entries:
+        return 0
+    now = datetime.utcnow()
+    existing = {row.cache_key: row for row in
+                GenAICache.query.filter(GenAICache.cache_key.in_(list(entries))).all()}
+    for key, response in entries.items():
+        row = existing.get(key)
+        if row is None:
+            db.session.add(GenAICache(cache_key=key, provider=provider, model=model, response=response,
+                                      hits=0, created_at=now, last_used_at=now))
+        else:
+            row.response, row.created_at, row.last_used_at = response, now, now
+    db.session.commit()
+    _count("stores", len(entries))
+    evict(max_entries=max_entries, ttl_hours=ttl_hours)
+    return len(entries)
+
+
+def evict(max_entries=DEFAULT_MAX_ENTRIES, ttl_hours=DEFAULT_TTL_HOURS):
+    cutoff = datetime.utcnow() - timedelta(hours=ttl_hours)
+    expired = db.session.execute(text("DELETE FROM genai_cache WHERE created_at < :cutoff"),
+                                 {"cutoff": cutoff}).rowcount
+    overflow = db.session.execute(text(
+        "DELETE FROM genai_cache WHERE id NOT IN "
+        "(SELECT id FROM genai_cache ORDER BY last_used_at DESC LIMIT :n)"
+    ), {"n": max(int(max_entries), 0)}).rowcount
+    db.session.commit()
+    removed = (expired or 0) + (overflow or 0)
+    if removed:
+        _count("evicted", removed)
+        logger.info(f"GenAI cache: evicted {expired} expired and {overflow} overflow entries")
+    return removed
+
+
+def clear():
+    removed = GenAICache.query.delete()
+    db.session.commit()
+    return removed
+
+
+def cache_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["entries"] = GenAICache.query.count()
+    stats["lifetime_hits"] = int(db.session.query(db.func.coalesce(db.func.sum(GenAICache.hits), 0)).scalar())
+    return stats
@@ -0,0 +1,213 @@
+import json
+import math
+import time
+import random
+import threading
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from utils.logger import logger
+
+# ─────────────────────────────────────────────
+# Pooled GenAI provider client
+# ─────────────────────────────────────────────
+# Summaries run on a bounded thread pool behind a shared token-bucket rate
+# limiter. Every call has a deadline and is retried with exponential backoff,
+# so a batch of explanations costs roughly the slowest call, not the sum.
+#
+# Providers:
+#   cohere  hosted Cohere chat API (api key required)
+#   stub    local stand-in server, see benchmarks/genai_stub_server.py
+
+DEFAULT_MODEL = "command-r"
+
+
+class GenAIError(Exception):
+    pass
+
+
+class RetryableGenAIError(GenAIError):
+    pass
+
+
+# ─────────────── rate limiting ───────────────
+
+class RateLimiter:
+    """Token bucket shared by every worker thread; rate <= 0 disables it."""
+
+    def __init__(self, rate_per_second, burst=None):
+        self.rate = float(rate_per_second or 0)
+        self.capacity = float(burst or max(self.rate, 1.0))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        if self.rate <= 0:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait = (1.0 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+# ─────────────── providers ───────────────
+
+class CohereProvider:
+    name = "cohere"
+    _clients = {}
+    _lock = threading.Lock()
+
+    def __init__(self, api_key, model=DEFAULT_MODEL):
+        self.api_key = api_key
+        self.model = model or DEFAULT_MODEL
+
+    def _client(self, timeout):
+        # One cohere.Client (and its HTTP connection pool) per key and timeout.
+        # The SDK takes whole seconds; round up so a short remainder never becomes 0.
+        seconds = max(1, math.ceil(timeout))
+        key = (self.api_key, seconds)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                import cohere
+                client = cohere.Client(self.api_key, timeout=seconds)
+                self._clients[key] = client
+        return client
+
+    def complete(self, prompt, timeout):
+        try:
+            response = self._client(timeout).chat(message=prompt, model=self.model)
+        except Exception as e:
+            status = getattr(e, "status_code", None) or getattr(e, "http_status", None)
+            if status in (400, 401, 403, 404):
+                raise GenAIError(str(e))
+            raise RetryableGenAIError(str(e))
+        return response.text if hasattr(response, "text") else None
+
+
+class StubProvider:
+    """Plain HTTP JSON provider: POST {"prompt", "model"} → {"text"}."""
+    name = "stub"
+
+    def __init__(self, base_url, model=DEFAULT_MODEL):
+        self.url = base_url.rstrip("/") + "/v1/chat"
+        self.model = model or DEFAULT_MODEL
+
+    def complete(self, prompt, timeout):
+        body = json.dumps({"prompt": prompt, "model": self.model}).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as resp:
+                return json.loads(resp.read().decode("utf-8")).get("text")
+        except urllib.error.HTTPError as e:
+            if e.code == 429 or e.code >= 500:
+                raise RetryableGenAIError(f"HTTP {e.code}")
+            raise GenAIError(f"HTTP {e.code}")
+        except (urllib.error.URLError, TimeoutError, OSError) as e:
+            raise RetryableGenAIError(str(e))
+
+
+def build_provider(config):
+    provider = config.get("provider")
+    if provider == "cohere" and config.get("api_key"):
+        return CohereProvider(config["api_key"], config.get("model"))
+    if provider == "stub" and config.get("base_url"):
+        return StubProvider(config["base_url"], config.get("model"))
+    return None
+
+
+# ─────────────── client ───────────────
+
+class GenAIClient:
+    def __init__(self, provider, max_concurrency=4, rate_limit=0, timeout=20.0, max_retries=2, backoff=0.5):
+        self.provider = provider
+        self.timeout = float(timeout)
+        self.max_retries = int(max_retries)
+        self.backoff = float(backoff)
+        self.limiter = RateLimiter(rate_limit)
+        self.executor = ThreadPoolExecutor(max_workers=max(int(max_concurrency), 1), thread_name_prefix="genai")
+
+    def complete(self, prompt):
+        """Blocking call with rate limiting, per-attempt timeout, retries and an overall deadline."""
+        deadline = time.monotonic() + self.timeout * (self.max_retries + 1)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.limiter.acquire(deadline):
+                break
+            remaining = deadline - time.monotonic()  # waiting on the limiter used some of it
+            if remaining <= 0:
+                break
+            try:
+                return self.provider.complete(prompt, timeout=min(self.timeout, remaining))
+            except RetryableGenAIError as e:
+                last_error = e
+                if attempt < self.max_retries:
+                    delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+                    logger.warning(f"GenAI call failed ({e}), retry {attempt + 1} in {delay:.2f}s")
+                    time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+        raise GenAIError(f"GenAI call failed after retries: {last_error or 'deadline exceeded'}")
+
+    def submit(self, prompt):
+        return self.executor.submit(self.complete, prompt)
+
+    def complete_many(self, prompts):
+        """
+        Run prompts concurrently. Returns a list aligned with prompts holding
+        either the response text or the exception raised for that prompt.
+        """
+        futures = [self.submit(p) for p in prompts]
+        overall = self.timeout * (self.max_retries + 1) + 1.0
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=overall))
+            except FutureTimeout:
+                future.cancel()
+                results.append(GenAIError("GenAI call exceeded its deadline"))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
+
+def get_genai_client(config):
+    """Process-wide client for the current GenAI settings; None when GenAI is off."""
+    global _client, _client_key
+    if not config.get("enabled"):
+        return None
+    key = (config.get("provider"), config.get("api_key"), config.get("base_url"), config.get("model"),
+           config.get("max_concurrency"), config.get("rate_limit"), config.get("timeout"), config.get("max_retries"))
+    with _client_lock:
+        if _client is not None and _client_key == key:
+            return _client
+        provider = build_provider(config)
+        if provider is None:
+            return None
+        if _client is not None:
+            _client.close()
+        _client = GenAIClient(
+            provider,
+            max_concurrency=config.get("max_concurrency", 4),
+            rate_limit=config.get("rate_limit", 0),
+            timeout=config.get("timeout", 20.0),
+            max_retries=config.get("max_retries", 2)
+        )
+        _client_key = key
+        return _client
@@ -0,0 +1,124 @@
+import re
+import time
+from collections import Counter
+import numpy as np
+from utils.logger import logger
+from utils.ann_index import search_profiles
+from utils.fulltext import search as fulltext_search
+from utils.vector_codec import as_vector
+from utils.admin_utils import get_config_int, get_config_float, get_config_value
+
+# ─────────────────────────────────────────────
+# Hybrid candidate retrieval for JD → profile matching
+# ─────────────────────────────────────────────
+# Two legs each rank the profile pool:
+#   semantic  embedding cosine (exact matrix or HNSW, utils/ann_index.py)
+#   lexical   BM25 over profile_fts (utils/fulltext.py), queried with the
+#             JD's skills and most frequent content words
+# Reciprocal-rank fusion merges the two rankings:
+#   score(p) = Σ weight_leg / (rrf_k + rank_leg(p))
+# It needs no score calibration between legs. A profile that is strong on exact
+# keywords but weaker on cosine (or the reverse) still makes the candidate
+# set. Only the fused top `match_candidate_pool` go on to full scoring.
+#
+# Tuning knobs (Config table):
+#   hybrid_retrieval_enabled  false → semantic leg only (previous behaviour)
+#   hybrid_semantic_weight    RRF weight of the embedding ranking (default 1.0)
+#   hybrid_lexical_weight     RRF weight of the BM25 ranking (default 1.0)
+#   hybrid_rrf_k              rank damping constant (default 60)
+#   hybrid_leg_depth          profiles taken from each leg before fusion (default 400)
+
+LEXICAL_MAX_TERMS = 24
+WORD_PATTERN = re.compile(r"[a-z][a-z0-9#+]{2,}")
+STOPWORDS = {
+    "and", "the", "for", "with", "you", "our", "are", "will", "have", "has", "this", "that", "from",
+    "your", "who", "can", "all", "any", "not", "but", "they", "their", "able", "must", "should",
+    "including", "within", "into", "about", "across", "well", "good", "strong", "work", "working",
+    "team", "role", "job", "candidate", "years", "year", "experience", "knowledge", "skills",
+    "required", "requirements", "responsibilities", "preferred", "plus", "etc", "using", "use"
+}
+
+
+def hybrid_settings():
+    return {
+        "enabled": str(get_config_value("hybrid_retrieval_enabled", "true")).lower() == "true",
+        "semantic_weight": get_config_float("hybrid_semantic_weight", 1.0),
+        "lexical_weight": get_config_float("hybrid_lexical_weight", 1.0),
+        "rrf_k": get_config_int("hybrid_rrf_k", 60),
+        "leg_depth": get_config_int("hybrid_leg_depth", 400)
+    }
+
+
+def lexical_query(jd_text, jd_skills=None, max_terms=LEXICAL_MAX_TERMS):
+    """OR-query terms for the BM25 leg: the JD's skills first, then its most frequent content words."""
+    terms = list(dict.fromkeys(s.lower() for s in (jd_skills or [])))
+    counts = Counter(w for w in WORD_PATTERN.findall((jd_text or "").lower()) if w not in STOPWORDS)
+    for word, _ in counts.most_common():
+        if len(terms) >= max_terms:
+            break
+        if word not in terms:
+            terms.append(word)
+    return " ".join(terms[:max_terms])
+
+
+def reciprocal_rank_fusion(rankings, rrf_k=60):
+    """rankings: [(weight, [id, ...best first]), ...] → [(id, fused score)], best first."""
+    fused = {}
+    for weight, ids in rankings:
+        if weight <= 0:
+            continue
+        for rank, item_id in enumerate(ids, start=1):
+            fused[item_id] = fused.get(item_id, 0.0) + weight / (rrf_k + rank)
+    return sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def retrieve_candidates(jd_vec, jd_text, jd_skills=None, k=200, settings=None):
+    """
+    Candidate profile ids for a JD. Returns (ids best first, cosine_by_id, stats).
+    cosine_by_id only covers ids the semantic leg returned. The caller fills in
+    lexical-only candidates with cosine_to().
+    """
+    settings = settings or hybrid_settings()
+    stats = {"mode": "hybrid" if settings["enabled"] else "semantic"}
+
+    start = time.perf_counter()
+    depth = max(k, settings["leg_depth"]) if settings["enabled"] else k
+    semantic = search_profiles(jd_vec, k=depth)
+    stats["semantic_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    stats["semantic_hits"] = len(semantic)
+    cosine_by_id = dict(semantic)
+
+    if not settings["enabled"]:
+        stats["candidates"] = min(len(semantic), k)
+        return [pid for pid, _ in semantic[:k]], cosine_by_id, stats
+
+    start = time.perf_counter()
+    try:
+        lexical = fulltext_search("profile", lexical_query(jd_text, jd_skills), limit=depth,
+                                  mode="any", with_snippets=False)
+    except Exception as e:
+        logger.warning(f"Lexical retrieval leg failed, using semantic only: {e}")
+        lexical = []
+    stats["lexical_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    stats["lexical_hits"] = len(lexical)
+
+    start = time.perf_counter()
+    fused = reciprocal_rank_fusion([
+        (settings["semantic_weight"], [pid for pid, _ in semantic]),
+        (settings["lexical_weight"], [hit["id"] for hit in lexical])
+    ], rrf_k=settings["rrf_k"])[:k]
+    stats["fusion_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+    lexical_ids = {hit["id"] for hit in lexical}
+    stats["candidates"] = len(fused)
+    stats["lexical_only"] = sum(1 for pid, _ in fused if pid not in cosine_by_id)
+    stats["both_legs"] = sum(1 for pid, _ in fused if pid in cosine_by_id and pid in lexical_ids)
+    return [pid for pid, _ in fused], cosine_by_id, stats
+
+
+def cosine_to(query_vec, vec):
+    if vec is None:
+        return 0.0
+    a, b = as_vector(query_vec), as_vector(vec)
+    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(a @ b) / denom if denom else 0.0
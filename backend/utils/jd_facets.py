@@ -0,0 +1,73 @@
+import re
+from sqlalchemy.orm import load_only
+from models import db, JD
+from utils.logger import logger
+from utils.skill_extractor import extract_skills_contextual, current_skill_version
+from utils.upload_store import document_text
+
+# ─────────────────────────────────────────────
+# Precomputed JD filter facets
+# ─────────────────────────────────────────────
+# The facets shown on the JD filter view are extracted once, at upload:
+#   skills               comma-joined, mirrored into jd_skill for indexed filtering
+#   required_experience  stated years; 0 for fresher roles, else DEFAULT_EXPERIENCE
+#   is_fresher           the JD mentions freshers
+# facets_version records the skill taxonomy version used. Rows from before
+# this change are backfilled by run_migrations() at startup; rows from before
+# a taxonomy edit are refreshed in batches by refresh_jd_facets(): a worker
+# job queued by every taxonomy edit (and at worker start when stale rows
+# exist), or `cli.py backfill-features`. Listings only read; rows stale after
+# an edit show their previous facets until then.
+
+DEFAULT_EXPERIENCE = 3
+EXPERIENCE_PATTERN = re.compile(r'(\d+)\s*\+?\s*(years|yrs)')
+DISPLAY_SKILLS = 10
+
+
+def jd_facet_columns(jd_text):
+    """JD constructor / update kwargs for the filter facets of a JD text."""
+    jd_text = jd_text or ""
+    lowered = jd_text.lower()
+    is_fresher = "fresher" in lowered
+    experience_match = EXPERIENCE_PATTERN.search(lowered)
+    if experience_match:
+        required_experience = int(experience_match.group(1))
+    elif is_fresher:
+        required_experience = 0
+    else:
+        required_experience = DEFAULT_EXPERIENCE
+    return {
+        "skills": ", ".join(extract_skills_contextual(jd_text)),
+        "required_experience": required_experience,
+        "is_fresher": is_fresher,
+        "facets_version": current_skill_version()
+    }
+
+
+def display_skills(skills):
+    """The short, alphanumeric skill list the filter view shows."""
+    names = [s.strip().lower() for s in (skills or "").split(",") if s.strip()]
+    return [s for s in names if len(s) > 2 and s.isascii() and s.isalnum()][:DISPLAY_SKILLS]
+
+
+def stale_facets_filter():
+    version = current_skill_version()
+    return JD.facets_version.is_(None) | (JD.facets_version != version)
+
+
+def refresh_jd_facets(batch_size=200):
+    """Recompute facets for every JD whose facets are missing or stale. Returns the number refreshed."""
+    refreshed = 0
+    while True:
+        jds = JD.query.options(load_only(JD.file_path, JD.content_hash, JD.extracted_text)).filter(
+            stale_facets_filter()).order_by(JD.id).limit(batch_size).all()
+        if not jds:
+            break
+        for jd in jds:
+            for key, value in jd_facet_columns(document_text(jd, jd.file_path)).items():
+                setattr(jd, key, value)
+        db.session.commit()
+        refreshed += len(jds)
+    if refreshed:
+        logger.info(f"Refreshed filter facets of {refreshed} JDs (skill taxonomy v{current_skill_version()})")
+    return refreshed
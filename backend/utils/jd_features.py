@@ -0,0 +1,63 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from utils.concept_cache import encode_text
+from utils.skill_extractor import extract_skills_contextual, current_skill_version
+from utils.matcher import jd_tokens_of, extract_required_years, vertical_similarities
+
+# ─────────────────────────────────────────────
+# Per-JD feature cache
+# ─────────────────────────────────────────────
+# JD-side inputs to the subscores are computed once per JD and reused across
+# the whole profile loop (and across requests). Entries are keyed by JD id, a
+# hash of the text and the skill taxonomy version, so neither an edited JD nor
+# an edited taxonomy serves stale features.
+
+MAX_CACHED_JDS = 512
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def text_hash(text):
+    return hashlib.sha1((text or "").encode("utf-8", errors="ignore")).hexdigest()
+
+
+def compute_jd_features(jd_text):
+    embedding = encode_text(jd_text)
+    return {
+        "text_hash": text_hash(jd_text),
+        "embedding": embedding,
+        "vertical_similarities": vertical_similarities(text_vec=embedding),
+        "tokens": jd_tokens_of(jd_text),
+        "required_years": extract_required_years(jd_text),
+        "skills": extract_skills_contextual(jd_text)
+    }
+
+
+def get_jd_features(jd_id, jd_text):
+    """Cached JD features for (jd_id, text hash, taxonomy version); computed on first use."""
+    if not jd_text:
+        return None
+    key = (jd_id, text_hash(jd_text), current_skill_version())
+
+    with _lock:
+        features = _cache.get(key)
+        if features is not None:
+            _cache.move_to_end(key)
+            return features
+
+    features = compute_jd_features(jd_text)
+
+    with _lock:
+        _cache[key] = features
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_JDS:
+            _cache.popitem(last=False)
+    return features
+
+
+def invalidate_jd_features(jd_id):
+    with _lock:
+        for key in [k for k in _cache if k[0] == jd_id]:
+            del _cache[key]
@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import socket
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import text
+from models import db, MatchJob, JD
+from utils.logger import logger
+from utils.match_service import run_jd_to_profiles, run_resume_to_jds
+from utils.skill_taxonomy import refresh_matcher
+from utils.jd_facets import refresh_jd_facets, stale_facets_filter
+from utils.bulk_ingest import run_ingest_job
+
+# ─────────────────────────────────────────────
+# Persistent match job queue (SQLite-backed)
+# ─────────────────────────────────────────────
+# Jobs live in the match_job table, so they survive restarts. Workers claim
+# jobs with a conditional UPDATE, heartbeat while running, and any job whose
+# heartbeat goes stale (crashed or restarted worker) is put back in the queue.
+# A re-run job first deletes the match results its earlier attempt wrote
+# (match_result.job_id), so a requeue never duplicates results.
+# The queue also runs the JD filter facet refresh a skill taxonomy edit
+# calls for, so no request handler has to.
+
+STALE_AFTER_SECONDS = 120
+HEARTBEAT_SECONDS = 15
+PROGRESS_WRITE_SECONDS = 1.0
+MAX_ATTEMPTS = 3
+
+JOB_RUNNERS = {
+    "jd-to-resumes": lambda payload, progress, job_id: run_jd_to_profiles(
+        payload.get("jd_id"), progress=progress, job_id=job_id
+    ),
+    "resume-to-jds": lambda payload, progress, job_id: run_resume_to_jds(
+        resume_id=payload.get("resume_id"), profile_id=payload.get("profile_id"), progress=progress, job_id=job_id
+    ),
+    "bulk-ingest": lambda payload, progress, job_id: run_ingest_job(payload, progress=progress),
+    "refresh-jd-facets": lambda payload, progress, job_id: (
+        {"refreshed": refresh_jd_facets(payload.get("batch_size", 200))}, 200
+    ),
+}
+
+
+# ─────────────────────────────────────────────
+# Submission / status
+# ─────────────────────────────────────────────
+
+def submit_job(kind, payload):
+    if kind not in JOB_RUNNERS:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    job = MatchJob(kind=kind, payload=json.dumps(payload), status="queued")
+    db.session.add(job)
+    db.session.commit()
+    logger.info(f"Queued {kind} job {job.id}: {payload}")
+    return job
+
+
+def queue_facet_refresh():
+    """Queue a JD facet refresh (after a taxonomy edit) unless one is already waiting."""
+    pending = MatchJob.query.filter_by(kind="refresh-jd-facets", status="queued").first()
+    return pending or submit_job("refresh-jd-facets", {})
+
+
+def job_to_dict(job):
+    data = {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": {"done": job.progress_done or 0, "total": job.progress_total or 0},
+        "attempts": job.attempts,
+        "created_at": job.created_at.strftime("%Y-%m-%d %H:%M:%S") if job.created_at else None,
+        "finished_at": job.finished_at.strftime("%Y-%m-%d %H:%M:%S") if job.finished_at else None
+    }
+    if job.status in ("done", "failed"):
+        data["result"] = json.loads(job.result) if job.result else None
+        data["result_status"] = job.result_status
+        data["error"] = job.error
+    return data
+
+
+# ─────────────────────────────────────────────
+# Worker side
+# ─────────────────────────────────────────────
+# Progress and heartbeats go through their own short engine transactions so
+# they never flush or commit the match results pending in db.session.
+
+def _write(sql, params):
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(text(sql), params)
+    except Exception as e:
+        logger.warning(f"Job bookkeeping write failed: {e}")
+
+
+def claim_next_job(worker_id):
+    """Atomically move the oldest queued job to running. Returns its id or None."""
+    while True:
+        with db.engine.begin() as conn:
+            job_id = conn.execute(text(
+                "SELECT id FROM match_job WHERE status = 'queued' ORDER BY id LIMIT 1"
+            )).scalar()
+            if job_id is None:
+                return None
+            now = datetime.utcnow()
+            claimed = conn.execute(text(
+                "UPDATE match_job SET status = 'running', worker_id = :worker, attempts = attempts + 1, "
+                "started_at = :now, heartbeat_at = :now WHERE id = :id AND status = 'queued'"
+            ), {"worker": worker_id, "now": now, "id": job_id}).rowcount
+        if claimed:
+            return job_id
+
+
+def requeue_stale_jobs():
+    """Return jobs orphaned by a dead worker to the queue (or fail them after MAX_ATTEMPTS)."""
+    cutoff = datetime.utcnow() - timedelta(seconds=STALE_AFTER_SECONDS)
+    with db.engine.begin() as conn:
+        failed = conn.execute(text(
+            "UPDATE match_job SET status = 'failed', error = 'Worker lost too many times', finished_at = :now "
+            "WHERE status = 'running' AND heartbeat_at < :cutoff AND attempts >= :max"
+        ), {"now": datetime.utcnow(), "cutoff": cutoff, "max": MAX_ATTEMPTS}).rowcount
+        requeued = conn.execute(text(
+            "UPDATE match_job SET status = 'queued', worker_id = NULL "
+            "WHERE status = 'running' AND heartbeat_at < :cutoff"
+        ), {"cutoff": cutoff}).rowcount
+    if requeued or failed:
+        logger.warning(f"Requeued {requeued} stale job(s), failed {failed}")
+    return requeued
+
+
+class _JobProgress:
+    """progress(stage, done, total) callback writing to match_job and LiveStatusTracker."""
+
+    def __init__(self, job_id, jd_id=None):
+        self.job_id = job_id
+        self.jd_id = jd_id
+        self._last_stage = None
+        self._last_write = 0.0
+
+    def __call__(self, stage, done=None, total=None):
+        now = time.time()
+        if stage == self._last_stage and now - self._last_write < PROGRESS_WRITE_SECONDS:
+            return
+        self._last_stage, self._last_write = stage, now
+
+        _write(
+            "UPDATE match_job SET stage = :stage, progress_done = :done, progress_total = :total, "
+            "heartbeat_at = :now WHERE id = :id",
+            {"stage": stage, "done": done or 0, "total": total or 0, "now": datetime.utcnow(), "id": self.job_id}
+        )
+        if self.jd_id is not None and stage in ("compared", "ranked"):
+            _write(
+                f"INSERT INTO live_status_tracker (jd_id, compared, ranked, emailed, created_at, updated_at) "
+                f"VALUES (:jd_id, 1, :ranked, 0, :now, :now) "
+                f"ON CONFLICT(jd_id) DO UPDATE SET {stage} = 1, updated_at = :now",
+                {"jd_id": self.jd_id, "ranked": 1 if stage == "ranked" else 0, "now": datetime.utcnow()}
+            )
+
+
+def _heartbeat(app, job_id, stop):
+    # Runs in its own thread, which has no app context unless given one
+    with app.app_context():
+        while not stop.wait(HEARTBEAT_SECONDS):
+            _write("UPDATE match_job SET heartbeat_at = :now WHERE id = :id",
+                   {"now": datetime.utcnow(), "id": job_id})
+
+
+def run_job(job_id):
+    job = MatchJob.query.get(job_id)
+    payload = json.loads(job.payload or "{}")
+    runner = JOB_RUNNERS.get(job.kind)
+    progress = _JobProgress(job_id, jd_id=payload.get("jd_id") if job.kind == "jd-to-resumes" else None)
+
+    stop = threading.Event()
+    app = current_app._get_current_object()
+    beat = threading.Thread(target=_heartbeat, args=(app, job_id, stop), daemon=True)
+    beat.start()
+    start = time.time()
+    try:
+        result, status_code = runner(payload, progress, job_id)
+        error = result.get("error") if status_code >= 400 else None
+        final = {"status": "failed" if error else "done", "result": json.dumps(result),
+                 "result_status": status_code, "error": error}
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Job {job_id} crashed")
+        final = {"status": "failed", "result": None, "result_status": 500, "error": str(e)}
+    finally:
+        stop.set()
+        beat.join()
+
+    job = MatchJob.query.get(job_id)
+    for key, value in final.items():
+        setattr(job, key, value)
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    logger.info(f"Job {job_id} ({job.kind}) {job.status} in {round(time.time() - start, 2)}s")
+
+
+def worker_process(poll_interval=1.0):
+    """Entry point of one worker process: claim and run jobs until killed."""
+    from app import app
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    with app.app_context():
+        logger.info(f"Match worker {worker_id} started")
+        refresh_matcher()
+        if JD.query.filter(stale_facets_filter()).first() is not None:
+            queue_facet_refresh()  # JDs from before the facet columns, or a taxonomy edit missed
+        last_sweep = 0.0
+        while True:
+            if time.time() - last_sweep >= STALE_AFTER_SECONDS / 2:
+                requeue_stale_jobs()
+                last_sweep = time.time()
+
+            job_id = claim_next_job(worker_id)
+            if job_id is None:
+                time.sleep(poll_interval)
+                continue
+            try:
+                refresh_matcher()
+                run_job(job_id)
+            finally:
+                db.session.remove()
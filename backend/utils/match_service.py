@@ -0,0 +1,258 @@
+import os
+import time
+from models import db, JD, Resume, Profile, MatchResult, LiveStatusTracker
+from utils.upload_store import document_text
+from utils.matcher import compute_full_text_score
+from utils.utils import log_agent_error
+from utils.logger import logger
+from utils.vector_codec import load_embedding
+from utils.hybrid_retrieval import retrieve_candidates, cosine_to
+from utils.admin_utils import get_config_int
+from utils.feature_store import ensure_features
+from utils.jd_features import get_jd_features
+
+# ─────────────────────────────────────────────
+# Matching service
+# ─────────────────────────────────────────────
+# Shared by the synchronous match routes and the background job worker
+# (utils/job_queue.py). Each entry point returns (payload, http_status) and
+# reports progress through an optional progress(stage, done, total) callback.
+
+
+def _no_progress(stage, done=None, total=None):
+    pass
+
+
+def _discard_job_results(job_id):
+    """A requeued job runs again from scratch; drop what its earlier attempt wrote first."""
+    if job_id is None:
+        return
+    removed = MatchResult.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+    db.session.commit()
+    if removed:
+        logger.info(f"Job {job_id}: discarded {removed} match results from an earlier attempt")
+
+
+def get_label(score):
+    if score >= 0.85:
+        return "✅ Highly Recommended"
+    elif score >= 0.70:
+        return "☑️ Recommended"
+    elif score >= 0.50:
+        return "🟡 Decent – Can Explore"
+    else:
+        return "🔴 Not Recommended"
+
+
+# ─────────────────────────────────────────────
+def run_jd_to_profiles(jd_id, progress=None, job_id=None):
+    """Rank consultant profiles for a JD. Returns (payload, http_status)."""
+    progress = progress or _no_progress
+    logger.info(f"JD-to-Resumes Match Request Received for JD ID: {jd_id}")
+
+    status = LiveStatusTracker.query.filter_by(jd_id=jd_id).first()
+    if status and status.compared and status.ranked:
+        logger.warning(f"⚠️ JD ID {jd_id} already matched. Ignoring duplicate call.")
+        return {"message": "Already matched", "top_matches": []}, 200
+
+    jd = JD.query.get(jd_id)
+    if not jd:
+        return {"error": "JD not found"}, 404
+
+    jd_text = document_text(jd, jd.file_path)
+    if not jd_text:
+        return {"error": "Failed to extract JD text"}, 500
+
+    jd_vec = load_embedding(jd)
+    if jd_vec is None:
+        return {"error": "JD has no embedding"}, 500
+
+    _discard_job_results(job_id)
+    jd_features = get_jd_features(jd.id, jd_text)
+
+    # Hybrid retrieval (embedding + BM25, rank-fused), then full scoring for the top-k only
+    candidate_pool = get_config_int("match_candidate_pool", 200)
+    candidate_ids, cosine_by_id, retrieval = retrieve_candidates(
+        jd_vec, jd_text, jd_skills=jd_features["skills"] if jd_features else None, k=candidate_pool
+    )
+    by_id = {p.id: p for p in Profile.query.filter(Profile.id.in_(candidate_ids)).all()} if candidate_ids else {}
+    candidates = [by_id[pid] for pid in candidate_ids if pid in by_id]
+    for profile in candidates:
+        if profile.id not in cosine_by_id:  # found by the lexical leg only
+            cosine_by_id[profile.id] = cosine_to(jd_vec, load_embedding(profile))
+    logger.info(f"Retrieved {len(candidates)} candidate profiles: {retrieval}")
+    progress("retrieved", 0, len(candidates))
+
+    scored = []
+
+    # Stage 1: cheap scoring over the whole candidate pool
+    with db.session.no_autoflush:
+        for done, profile in enumerate(candidates, start=1):
+            progress("scoring", done, len(candidates))
+            try:
+                resume_text = document_text(profile, profile.resume_path)
+                if not resume_text:
+                    continue
+
+                start_time = time.time()
+
+                score = compute_full_text_score(
+                    jd_embedding=jd_vec,
+                    profile_embedding=None,
+                    jd_text=jd_text,
+                    profile_text=resume_text,
+                    vertical=profile.vertical,
+                    experience_years=profile.experience_years,
+                    profile_skills=profile.skills,
+                    profile_projects=getattr(profile, 'projects', None),
+                    profile_certifications=getattr(profile, 'certifications', None),
+                    cosine_score=cosine_by_id[profile.id],
+                    profile_features=ensure_features(profile, resume_text),
+                    jd_features=jd_features
+                )
+                latency = round(time.time() - start_time, 4)
+
+                match = MatchResult(
+                    jd_id=jd.id,
+                    profile_id=profile.id,
+                    resume_id=None,
+                    score=round(score, 4),
+                    explanation=None,
+                    match_type='jd-to-resume',
+                    method="MultiScore",
+                    latency=latency,
+                    explanation_latency=0,
+                    job_id=job_id
+                )
+                db.session.add(match)
+                scored.append((profile, resume_text, match))
+
+            except Exception as e:
+                db.session.rollback()
+                log_agent_error("MatchError", str(e), method="jd-to-resume")
+                continue
+
+    progress("compared", len(scored), len(candidates))
+
+    # Deduplicate by emp_id and keep the configured shortlist for the response
+    shortlist_size = get_config_int("explain_shortlist_size", 3)
+    scored.sort(key=lambda x: x[2].score, reverse=True)
+    seen_ids = set()
+    shortlist = []
+    for profile, resume_text, match in scored:
+        if profile.emp_id in seen_ids:
+            continue
+        seen_ids.add(profile.emp_id)
+        shortlist.append((profile, resume_text, match))
+        if len(shortlist) >= shortlist_size:
+            break
+
+    try:
+        jd.status = "Review"
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        log_agent_error("DBCommitError", str(e), method="jd-to-resume")
+        return {"error": "Database commit failed"}, 500
+    progress("ranked", len(scored), len(candidates))
+
+    # Scores only — explanations are generated on demand via /match/explanation/<match_id>
+    top_matches = [{
+        "match_id": match.id,
+        "resume_id": None,
+        "profile_id": profile.id,
+        "emp_id": profile.emp_id,
+        "name": profile.name,
+        "email": profile.email,
+        "vertical": profile.vertical,
+        "role": profile.role,
+        "status": profile.status,
+        "resume_path": profile.resume_path,
+        "score": match.score,
+        "label": get_label(match.score),
+        "latency": match.latency,
+        "rank": rank
+    } for rank, (profile, _, match) in enumerate(shortlist, start=1)]
+
+    logger.info(f"Matching complete. Scored {len(scored)} profiles, returning top {len(top_matches)}.")
+    return {"top_matches": top_matches, "retrieval": retrieval}, 200
+
+
+# ─────────────────────────────────────────────
+def run_resume_to_jds(resume_id=None, profile_id=None, progress=None, job_id=None):
+    """Rank JDs for a legacy resume or a consultant profile. Returns (payload, http_status)."""
+    progress = progress or _no_progress
+
+    resume = Resume.query.get(resume_id) if resume_id else Profile.query.get(profile_id)
+
+    if not resume:
+        return {"error": "Resume/Profile not found"}, 404
+
+    _discard_job_results(job_id)
+    resume_text = document_text(
+        resume, getattr(resume, "resume_path", None) or getattr(resume, "file_path", None)
+    )
+    resume_vec = load_embedding(resume)
+    resume_features = ensure_features(resume, resume_text)
+    all_matches = []
+    start_time = time.time()
+
+    jds = JD.query.all()
+    for done, jd in enumerate(jds, start=1):
+        progress("scoring", done, len(jds))
+        try:
+            jd_text = document_text(jd, jd.file_path)
+            score = compute_full_text_score(
+    load_embedding(jd),
+    resume_vec,
+    jd_text,
+    resume_text,
+    None,
+    None,
+    profile_features=resume_features,
+    jd_features=get_jd_features(jd.id, jd_text)
+)
+
+            all_matches.append({
+                "jd": jd,
+                "score": round(score, 4),
+                "jd_text": jd_text
+            })
+        except Exception as e:
+            log_agent_error("ResumeToJDMatchError", str(e), method="resume-to-jd")
+
+    latency = round(time.time() - start_time, 4)
+    progress("compared", len(all_matches), len(jds))
+
+    shortlist_size = get_config_int("explain_shortlist_size", 3)
+    ranked = []
+    for i, match in enumerate(sorted(all_matches, key=lambda x: x["score"], reverse=True)[:shortlist_size], start=1):
+        row = MatchResult(
+            jd_id=match["jd"].id,
+            resume_id=resume_id if resume_id else None,
+            profile_id=None if resume_id else profile_id,
+            score=match["score"],
+            explanation=None,
+            match_type='resume-to-jd',
+            method="MultiScore",
+            latency=latency,
+            explanation_latency=0,
+            job_id=job_id
+        )
+        db.session.add(row)
+        ranked.append((i, match, row))
+
+    db.session.commit()
+    progress("ranked", len(all_matches), len(jds))
+
+    # Scores only — explanations are generated on demand via /match/explanation/<match_id>
+    results = [{
+        "match_id": row.id,
+        "jd_id": match["jd"].id,
+        "jd_file": os.path.basename(match["jd"].file_path),
+        "job_title": match["jd"].job_title,
+        "score": match["score"],
+        "label": get_label(match["score"]),
+        "rank": i
+    } for i, match, row in ranked]
+    return {"top_matches": results}, 200
@@ -1,13 +1,10 @@
-import json
-import torch
 import re
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
 from utils.utils import log_agent_error
 from utils.skill_extractor import extract_skills_contextual
 from utils.parser import extract_certifications, extract_projects
-
-
-model = SentenceTransformer("all-MiniLM-L6-v2")
+from utils.concept_cache import concept_similarities
+from utils.vector_codec import as_vector
 
 # ──────────────────────────────────────
 # Boost Categories
@@ -38,41 +35,54 @@ VERTICAL_SIGNAL_CONCEPTS = {
     "Global Travel": "travel booking, ifs erp, flight scheduling, international systems"
 }
 
+EXPERIENCE_PATTERN = re.compile(r'(\d{1,2})\+?\s?(?:years?|yrs?)')
+
 # ──────────────────────────────────────
 # Main Matching Function
 # ──────────────────────────────────────
 def compute_full_text_score(
-    jd_embedding_str,
-    profile_embedding_str,
+    jd_embedding,
+    profile_embedding,
     jd_text=None,
     profile_text=None,
     vertical=None,
     experience_years=None,
     profile_skills=None,
     profile_projects=None,
-    profile_certifications=None
+    profile_certifications=None,
+    cosine_score=None,
+    profile_features=None,
+    jd_features=None
 ):
     try:
-        jd_vec = torch.tensor([float(x) for x in json.loads(jd_embedding_str)]).unsqueeze(0)
-        profile_vec = torch.tensor([float(x) for x in json.loads(profile_embedding_str)]).unsqueeze(0)
-
-        cosine_score = float(util.cos_sim(jd_vec, profile_vec)[0][0])
-
-        # Fall back to extractors if needed
-        if not profile_skills and profile_text:
-            profile_skills = extract_skills_contextual(profile_text)
-        if not profile_projects and profile_text:
-            profile_projects = extract_projects(profile_text)
-        if not profile_certifications and profile_text:
-            profile_certifications = extract_certifications(profile_text)
+        if cosine_score is None:
+            cosine_score = cosine_similarity(as_vector(jd_embedding), as_vector(profile_embedding))
+
+        if profile_features:
+            # Precomputed at upload time (utils/feature_store.py) — no text work here
+            # Caller-supplied skills (the profile's comma-joined column) keep
+            # precedence, as before; the stored list replaces the extraction fallback
+            profile_skills = profile_skills or profile_features["skills"]
+            project_alignment = signal_hits_score(profile_features["project_hits"])
+            certification_boost = signal_hits_score(profile_features["cert_hits"])
+            uniqueness_score = profile_features["human_signal_score"]
+        else:
+            # Fall back to extractors if needed
+            if not profile_skills and profile_text:
+                profile_skills = extract_skills_contextual(profile_text)
+            if not profile_projects and profile_text:
+                profile_projects = extract_projects(profile_text)
+            if not profile_certifications and profile_text:
+                profile_certifications = extract_certifications(profile_text)
+
+            project_alignment = compute_project_alignment(profile_projects)
+            certification_boost = compute_certification_boost(profile_certifications)
+            uniqueness_score = semantic_signal_score(profile_text, HUMAN_SIGNAL_CONCEPTS)
 
         # Boost scores
-        skill_score = compute_skill_overlap(jd_text, profile_skills)
-        experience_score = compute_experience_alignment(jd_text, experience_years)
-        project_alignment = compute_project_alignment(profile_projects)
-        certification_boost = compute_certification_boost(profile_certifications)
-        uniqueness_score = semantic_signal_score(profile_text, HUMAN_SIGNAL_CONCEPTS)
-        vertical_boost = vertical_signal_score(jd_text, vertical)
+        skill_score = compute_skill_overlap(jd_text, profile_skills, jd_features=jd_features)
+        experience_score = compute_experience_alignment(jd_text, experience_years, jd_features=jd_features)
+        vertical_boost = vertical_signal_score(jd_text, vertical, jd_features=jd_features)
 
 
 
@@ -102,6 +112,12 @@ def compute_full_text_score(
         log_agent_error("ScoringError", str(e), method="compute_full_text_score")
         return 0.0
 
+def cosine_similarity(a, b):
+    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+    if denom == 0.0:
+        return 0.0
+    return float(np.dot(a, b)) / denom
+
 # ──────────────────────────────────────
 # Label Generator
 # ──────────────────────────────────────
@@ -120,10 +136,17 @@ def get_label(score):
 # Subscore Helpers
 # ──────────────────────────────────────
 
-def compute_skill_overlap(jd_text, profile_input):
+def jd_tokens_of(jd_text):
+    return set(jd_text.lower().split())
+
+def extract_required_years(jd_text):
+    match = EXPERIENCE_PATTERN.search(jd_text.lower())
+    return int(match.group(1)) if match else None
+
+def compute_skill_overlap(jd_text, profile_input, jd_features=None):
     if not jd_text or not profile_input:
         return 0.0
-    jd_tokens = set(jd_text.lower().split())
+    jd_tokens = jd_features["tokens"] if jd_features else jd_tokens_of(jd_text)
     if isinstance(profile_input, str):
         profile_tokens = set(profile_input.lower().split())
     else:
@@ -131,60 +154,57 @@ def compute_skill_overlap(jd_text, profile_input):
     match = jd_tokens & profile_tokens
     return min(len(match) / 15.0, 1.0)
 
-def compute_experience_alignment(jd_text, experience_years):
+def compute_experience_alignment(jd_text, experience_years, jd_features=None):
     if not jd_text or not experience_years:
         return 0.0
     try:
-        match = re.search(r'(\d{1,2})\+?\s?(?:years?|yrs?)', jd_text.lower())
-        if match:
-            required = int(match.group(1))
+        required = jd_features["required_years"] if jd_features else extract_required_years(jd_text)
+        if required is not None:
             ratio = experience_years / required
             return min(max(ratio, 0.0), 1.2) - 0.2
     except:
         pass
     return 0.0
 
+def count_signal_hits(lines, signals):
+    if not lines:
+        return 0
+    if isinstance(lines, str):
+        lines = [lines]
+    return sum(1 for line in lines for signal in signals if signal.lower() in line.lower())
+
+def signal_hits_score(hits):
+    return min((hits or 0) * 0.05, 0.15)
+
 def compute_project_alignment(projects):
-    if not projects:
-        return 0.0
-    if isinstance(projects, str):
-        projects = [projects]
-    hits = sum(1 for p in projects for signal in PROJECT_SIGNAL_CONCEPTS if signal.lower() in p.lower())
-    return min(hits * 0.05, 0.15)
+    return signal_hits_score(count_signal_hits(projects, PROJECT_SIGNAL_CONCEPTS))
 
 def compute_certification_boost(certs):
-    if not certs:
-        return 0.0
-    if isinstance(certs, str):
-        certs = [certs]
-    hits = sum(1 for c in certs for signal in CERTIFICATION_CONCEPTS if signal.lower() in c.lower())
-    return min(hits * 0.05, 0.15)
+    return signal_hits_score(count_signal_hits(certs, CERTIFICATION_CONCEPTS))
 
-def semantic_signal_score(text, concepts):
-    if not text:
+def semantic_signal_score(text, concepts, text_vec=None):
+    if not text and text_vec is None:
         return 0.0
     try:
-        text_embed = model.encode(text, convert_to_tensor=True)
-        count = 0
-        for concept in concepts:
-            concept_embed = model.encode(concept, convert_to_tensor=True)
-            sim = float(util.cos_sim(text_embed, concept_embed)[0][0])
-            if sim >= 0.5:
-                count += 1
+        _, sims = concept_similarities(text, concepts, text_vec=text_vec)
+        count = int((sims >= 0.5).sum())
         return min(count * 0.05, 0.15)
     except:
         return 0.0
 
-def vertical_signal_score(jd_text, vertical):
+def vertical_similarities(jd_text=None, text_vec=None):
+    labels, sims = concept_similarities(jd_text, VERTICAL_SIGNAL_CONCEPTS, text_vec=text_vec)
+    return {label: float(sim) for label, sim in zip(labels, sims)}
+
+def vertical_signal_score(jd_text, vertical, jd_features=None):
     if not jd_text or not vertical:
         return 0.0
     vertical_concept = VERTICAL_SIGNAL_CONCEPTS.get(vertical, None)
     if not vertical_concept:
         return 0.0
     try:
-        jd_embed = model.encode(jd_text, convert_to_tensor=True)
-        concept_embed = model.encode(vertical_concept, convert_to_tensor=True)
-        sim = float(util.cos_sim(jd_embed, concept_embed)[0][0])
+        sims = jd_features["vertical_similarities"] if jd_features else vertical_similarities(jd_text)
+        sim = sims[vertical]
         return min(max(sim, 0.0), 1.0) * 0.15 if sim > 0.5 else 0.0
     except:
         return 0.0
@@ -0,0 +1,250 @@
+import json
+from sqlalchemy import text
+from models import db
+from utils.logger import logger
+from utils.vector_codec import encode_vector
+from utils.model_registry import SENTENCE_MODEL_NAME
+
+# ─────────────────────────────────────────────
+# Lightweight schema migrations (SQLite)
+# ─────────────────────────────────────────────
+# db.create_all() only creates missing tables, so new columns on existing
+# tables are added here. Every step is idempotent and safe to re-run.
+
+
+def _columns(table):
+    rows = db.session.execute(text(f"PRAGMA table_info({table})")).fetchall()
+    return {r[1] for r in rows}
+
+
+def add_column_if_missing(table, column, ddl_type):
+    if column in _columns(table):
+        return False
+    db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+    logger.info(f"Migration: added {table}.{column}")
+    return True
+
+
+# ─────────────────────────────────────────────
+# Steps
+# ─────────────────────────────────────────────
+
+EMBEDDING_TABLES = ("jd", "profile", "resume")
+
+
+def migrate_binary_embeddings(batch_size=500):
+    """Convert JSON embedding_vector columns into float32 embedding_blob."""
+    for table in EMBEDDING_TABLES:
+        add_column_if_missing(table, "embedding_blob", "BLOB")
+        add_column_if_missing(table, "embedding_dim", "INTEGER")
+        add_column_if_missing(table, "embedding_model", "VARCHAR")
+    db.session.commit()
+
+    converted = 0
+    for table in EMBEDDING_TABLES:
+        while True:
+            rows = db.session.execute(text(
+                f"SELECT id, embedding_vector FROM {table} "
+                f"WHERE embedding_blob IS NULL AND embedding_vector IS NOT NULL LIMIT :n"
+            ), {"n": batch_size}).fetchall()
+            if not rows:
+                break
+
+            for row_id, raw in rows:
+                try:
+                    vec = json.loads(raw) if raw else []
+                except ValueError:
+                    vec = []
+                params = {"id": row_id, "blob": None, "dim": None, "model": None}
+                if vec:
+                    params.update(blob=encode_vector(vec), dim=len(vec), model=SENTENCE_MODEL_NAME)
+                db.session.execute(text(
+                    f"UPDATE {table} SET embedding_blob = :blob, embedding_dim = :dim, "
+                    f"embedding_model = :model, embedding_vector = NULL WHERE id = :id"
+                ), params)
+                converted += 1
+            db.session.commit()
+
+    if converted:
+        logger.info(f"Migration: converted {converted} JSON embeddings to float32 blobs")
+    return converted
+
+
+def migrate_feature_columns():
+    """Columns for the upload-time scoring features (utils/feature_store.py)."""
+    added = []
+    for column, ddl_type in (("projects", "TEXT"), ("certifications", "TEXT"), ("project_hits", "INTEGER"),
+                             ("cert_hits", "INTEGER"), ("human_signal_score", "FLOAT"),
+                             ("inferred_vertical", "VARCHAR"), ("feature_version", "INTEGER")):
+        if add_column_if_missing("profile", column, ddl_type):
+            added.append(f"profile.{column}")
+    for column, ddl_type in (("project_hits", "INTEGER"), ("cert_hits", "INTEGER"),
+                             ("human_signal_score", "FLOAT"), ("feature_version", "INTEGER")):
+        if add_column_if_missing("resume", column, ddl_type):
+            added.append(f"resume.{column}")
+    db.session.commit()
+    return added
+
+
+def migrate_content_hash_columns():
+    """content_hash links uploads to the document_cache (utils/upload_store.py)."""
+    added = []
+    for table in EMBEDDING_TABLES:
+        if add_column_if_missing(table, "content_hash", "VARCHAR(64)"):
+            added.append(f"{table}.content_hash")
+        db.session.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_content_hash ON {table} (content_hash)"
+        ))
+    db.session.commit()
+    return added
+
+
+def migrate_skill_taxonomy():
+    """skills_version columns, plus a skill table seeded from the built-in vocabularies."""
+    from utils.skill_taxonomy import seed_taxonomy
+
+    added = []
+    for table in ("profile", "resume"):
+        if add_column_if_missing(table, "skills_version", "INTEGER"):
+            added.append(f"{table}.skills_version")
+    db.session.commit()
+    return {"added": added, "seeded": seed_taxonomy()}
+
+
+def migrate_profile_search_index(batch_size=1000):
+    """Indexes behind /profiles/search, and profile_skill rows for profiles stored before it existed."""
+    from models import split_skills
+
+    for ddl in (
+        "CREATE INDEX IF NOT EXISTS ix_profile_experience_years ON profile (experience_years)",
+        "CREATE INDEX IF NOT EXISTS ix_profile_created_at ON profile (created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_profile_vertical_nocase ON profile (vertical COLLATE NOCASE)",
+    ):
+        db.session.execute(text(ddl))
+    db.session.commit()
+
+    indexed, last_id = 0, 0
+    while True:
+        rows = db.session.execute(text(
+            "SELECT id, skills FROM profile p WHERE id > :last AND skills IS NOT NULL AND skills != '' "
+            "AND NOT EXISTS (SELECT 1 FROM profile_skill ps WHERE ps.profile_id = p.id) ORDER BY id LIMIT :n"
+        ), {"last": last_id, "n": batch_size}).fetchall()
+        if not rows:
+            break
+        params = [{"pid": pid, "skill": skill} for pid, skills in rows for skill in split_skills(skills)]
+        if params:
+            db.session.execute(text(
+                "INSERT OR IGNORE INTO profile_skill (profile_id, skill) VALUES (:pid, :skill)"
+            ), params)
+        db.session.commit()
+        indexed += len(rows)
+        last_id = rows[-1][0]
+
+    if indexed:
+        logger.info(f"Migration: indexed skills of {indexed} profiles")
+    return indexed
+
+
+def migrate_fulltext_search():
+    """FTS5 indexes over profile / jd text, kept in sync by triggers (utils/fulltext.py)."""
+    from utils.fulltext import ensure_fulltext_tables
+    return ensure_fulltext_tables()
+
+
+def migrate_listing_indexes():
+    """Sort / filter indexes behind the keyset-paginated /profiles/all and /jds/filterable."""
+    for ddl in (
+        "CREATE INDEX IF NOT EXISTS ix_profile_name ON profile (name)",
+        "CREATE INDEX IF NOT EXISTS ix_jd_created_at ON jd (created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_jd_status ON jd (status)",
+    ):
+        db.session.execute(text(ddl))
+    db.session.commit()
+    return True
+
+
+def migrate_jd_facet_columns():
+    """Filter facet columns on jd (utils/jd_facets.py); rows are filled by migrate_jd_facet_rows()."""
+    added = []
+    for column, ddl_type in (("skills", "TEXT"), ("required_experience", "INTEGER"),
+                             ("is_fresher", "BOOLEAN"), ("facets_version", "INTEGER")):
+        if add_column_if_missing("jd", column, ddl_type):
+            added.append(f"jd.{column}")
+        if column != "skills":
+            db.session.execute(text(f"CREATE INDEX IF NOT EXISTS ix_jd_{column} ON jd ({column})"))
+    db.session.commit()
+    return added
+
+
+PROFILE_REVISION_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS profile_revision_ai AFTER INSERT ON profile BEGIN "
+    "UPDATE change_counter SET revision = revision + 1 WHERE name = 'profile'; "
+    "UPDATE profile SET vector_revision = (SELECT revision FROM change_counter WHERE name = 'profile') "
+    "WHERE id = new.id; END",
+    "CREATE TRIGGER IF NOT EXISTS profile_revision_au AFTER UPDATE OF embedding_blob, embedding_vector ON profile "
+    "BEGIN UPDATE change_counter SET revision = revision + 1 WHERE name = 'profile'; "
+    "UPDATE profile SET vector_revision = (SELECT revision FROM change_counter WHERE name = 'profile') "
+    "WHERE id = new.id; END",
+    "CREATE TRIGGER IF NOT EXISTS profile_revision_ad AFTER DELETE ON profile BEGIN "
+    "UPDATE change_counter SET revision = revision + 1 WHERE name = 'profile'; END",
+)
+
+
+def migrate_profile_revision():
+    """
+    Change marker for the in-memory profile indexes (utils/profile_index.py,
+    utils/ann_index.py). (row count, max id) cannot see a profile that was
+    deleted and re-inserted under the same id; this counter can.
+    """
+    added = add_column_if_missing("profile", "vector_revision", "INTEGER")
+    db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_profile_vector_revision ON profile (vector_revision)"))
+    db.session.execute(text("INSERT OR IGNORE INTO change_counter (name, revision) VALUES ('profile', 0)"))
+    db.session.execute(text("UPDATE profile SET vector_revision = 0 WHERE vector_revision IS NULL"))
+    for ddl in PROFILE_REVISION_TRIGGERS:
+        db.session.execute(text(ddl))
+    db.session.commit()
+    return ["profile.vector_revision"] if added else []
+
+
+def migrate_match_result_job_id():
+    """match_result.job_id lets a re-run job replace the results of its earlier attempt (utils/job_queue.py)."""
+    added = add_column_if_missing("match_result", "job_id", "INTEGER REFERENCES match_job(id)")
+    db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_match_result_job_id ON match_result (job_id)"))
+    db.session.commit()
+    return ["match_result.job_id"] if added else []
+
+
+def migrate_jd_facet_rows(batch_size=200):
+    """Facets for JDs stored before the facet columns, or under an older skill taxonomy."""
+    from utils.skill_taxonomy import refresh_matcher
+    from utils.jd_facets import refresh_jd_facets
+
+    refresh_matcher(force=True)  # facets must be extracted with the stored taxonomy
+    return refresh_jd_facets(batch_size)
+
+
+MIGRATIONS = [
+    migrate_binary_embeddings,
+    migrate_feature_columns,
+    migrate_content_hash_columns,
+    migrate_skill_taxonomy,
+    migrate_profile_search_index,
+    migrate_fulltext_search,
+    migrate_listing_indexes,
+    migrate_jd_facet_columns,
+    migrate_profile_revision,
+    migrate_match_result_job_id,
+    migrate_jd_facet_rows,
+]
+
+
+def run_migrations(vacuum=False):
+    """Apply every migration step in order. Requires an app context."""
+    db.create_all()
+    results = {}
+    for step in MIGRATIONS:
+        results[step.__name__] = step()
+    if vacuum:
+        db.session.execute(text("VACUUM"))
+        db.session.commit()
+    return results
@@ -0,0 +1,104 @@
+import os
+import time
+import threading
+from utils.logger import logger
+
+# ─────────────────────────────────────────────
+# Process-wide model registry
+# ─────────────────────────────────────────────
+# Every module asks the registry for its model instead of loading its own copy.
+# Models load on first use and are shared for the lifetime of the process.
+
+SENTENCE_MODEL_NAME = os.environ.get("RADARX_SENTENCE_MODEL", "all-MiniLM-L6-v2")
+SPACY_MODEL_NAME = os.environ.get("RADARX_SPACY_MODEL", "en_core_web_sm")
+
+_models = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+def _rss_bytes():
+    """Best-effort resident set size of the current process."""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _param_bytes(model):
+    """Size of the weights for torch-backed models, None otherwise."""
+    try:
+        return sum(p.numel() * p.element_size() for p in model.parameters())
+    except Exception:
+        return None
+
+
+def _load(name, loader):
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(name)
+        if model is not None:
+            return model
+
+        rss_before = _rss_bytes()
+        start = time.time()
+        model = loader()
+        load_seconds = round(time.time() - start, 3)
+        rss_after = _rss_bytes()
+
+        _stats[name] = {
+            "load_seconds": load_seconds,
+            "param_bytes": _param_bytes(model),
+            "rss_delta_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+            "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "pid": os.getpid()
+        }
+        _models[name] = model
+        logger.info(f"Model '{name}' loaded in {load_seconds}s (pid {os.getpid()})")
+        return model
+
+
+def get_sentence_model():
+    """Shared SentenceTransformer used for every embedding in the app."""
+    def loader():
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(SENTENCE_MODEL_NAME)
+    return _load(f"sentence:{SENTENCE_MODEL_NAME}", loader)
+
+
+# Components the name extractor does not need. Only NER is kept; in the
+# en_core_web_* CNN pipelines it has its own tok2vec, so the shared one goes too.
+NER_EXCLUDE = ("tok2vec", "tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer")
+
+
+def get_ner_nlp():
+    """Lean spaCy pipeline with only the entity recognizer, for PERSON lookups."""
+    def loader():
+        import spacy
+        try:
+            nlp = spacy.load(SPACY_MODEL_NAME, exclude=list(NER_EXCLUDE))
+            nlp("Smoke test")
+        except Exception:
+            # e.g. transformer pipelines, where NER listens to a shared encoder
+            nlp = spacy.load(SPACY_MODEL_NAME)
+            nlp.select_pipes(enable=[p for p in nlp.pipe_names if p in ("ner", "transformer", "tok2vec")])
+        return nlp
+    return _load(f"spacy-ner:{SPACY_MODEL_NAME}", loader)
+
+
+def get_model_stats():
+    """Load time and memory footprint of every model loaded in this process."""
+    return {
+        "pid": os.getpid(),
+        "rss_bytes": _rss_bytes(),
+        "models": {name: dict(stats) for name, stats in _stats.items()}
+    }
@@ -0,0 +1,78 @@
+import json
+import base64
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+# ─────────────────────────────────────────────
+# Keyset pagination for listing endpoints
+# ─────────────────────────────────────────────
+# Pages are addressed by the (sort value, id) of the last row already seen,
+# not by OFFSET. Every page is then one index range scan, however deep the
+# client pages, and rows inserted meanwhile never shift or repeat a page.
+# The cursor is opaque to clients: base64 JSON of [sort value, id].
+# NULL sort values are paged in SQLite's order (first ascending, last
+# descending); a plain comparison with NULL would drop every later row.
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode_value(value):
+    return {"dt": value.isoformat()} if isinstance(value, datetime) else value
+
+
+def _decode_value(value):
+    return datetime.fromisoformat(value["dt"]) if isinstance(value, dict) and "dt" in value else value
+
+
+def encode_cursor(sort_value, row_id):
+    raw = json.dumps([_encode_value(sort_value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        sort_value, row_id = json.loads(raw)
+        return _decode_value(sort_value), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def page_size(value, default=DEFAULT_PAGE_SIZE):
+    try:
+        size = int(value) if value not in (None, "") else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_page(query, sort_expr, id_column, limit, cursor=None, descending=False, key=None):
+    """
+    One page of `query` ordered by (sort_expr, id). `key(row)` gives a row's
+    (sort value, id); by default rows are read as selecting sort_expr labelled
+    "sort_key" and the id labelled "id". Returns (rows, next_cursor or None).
+    """
+    if cursor:
+        last_value, last_id = decode_cursor(cursor)
+        after_id = id_column < last_id if descending else id_column > last_id
+        if last_value is None:
+            same_then_after = and_(sort_expr.is_(None), after_id)
+            query = query.filter(same_then_after if descending else or_(sort_expr.isnot(None), same_then_after))
+        elif descending:
+            query = query.filter(or_(sort_expr < last_value, and_(sort_expr == last_value, after_id),
+                                     sort_expr.is_(None)))
+        else:
+            query = query.filter(or_(sort_expr > last_value, and_(sort_expr == last_value, after_id)))
+
+    order = (sort_expr.desc(), id_column.desc()) if descending else (sort_expr.asc(), id_column.asc())
+    rows = query.order_by(*order).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    key = key or (lambda row: (row.sort_key, row.id))
+    return rows, encode_cursor(*key(rows[-1]))
@@ -1,20 +1,18 @@
 import os
 import re
-import docx2txt
-import PyPDF2
-import spacy
+import time
 import logging
-from sentence_transformers import SentenceTransformer, util
+import threading
+from utils.extractors import extract_document, DEFAULT_MAX_PAGES, DEFAULT_MAX_CHARS
+from utils.model_registry import get_ner_nlp
+from utils.concept_cache import concept_similarities
 
-nlp = spacy.load("en_core_web_sm")
 logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────
 # Extract Raw Text from Resume or JD
 # ─────────────────────────────────────────────
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
-
 VERTICAL_SIGNAL_CONCEPTS = {
     "GEN-AI": "generative ai, prompt engineering, llm applications",
     "Banking": "financial domain, credit risk, investment platforms",
@@ -25,33 +23,38 @@ VERTICAL_SIGNAL_CONCEPTS = {
     "Hexavarsity": "training platform, student management, internal lms",
     "Global Travel": "travel booking, ifs erp, flight scheduling, international systems"
 }
-def extract_text(path):
-    ext = os.path.splitext(path)[1].lower()
-    text = ""
 
+def extraction_settings():
+    """Engine and caps from Config; module defaults outside an app context (e.g. pool workers)."""
+    try:
+        from utils.admin_utils import get_config_value, get_config_int
+        return {
+            "engine": (get_config_value("extract_pdf_engine", "auto") or "auto").lower(),
+            "max_pages": get_config_int("extract_max_pages", DEFAULT_MAX_PAGES),
+            "max_chars": get_config_int("extract_max_chars", DEFAULT_MAX_CHARS)
+        }
+    except Exception:
+        return {"engine": "auto", "max_pages": DEFAULT_MAX_PAGES, "max_chars": DEFAULT_MAX_CHARS}
+
+
+def name_fast_path_enabled():
+    """The name_fast_path_enabled switch from Config; on outside an app context."""
     try:
-        if ext == ".pdf":
-            with open(path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                all_text = [page.extract_text() or "" for page in reader.pages]
-                text = " ".join(all_text)
-
-        elif ext == ".docx":
-            text = docx2txt.process(path)
-
-        elif ext == ".txt":
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                text = f.read()
-
-        elif ext == ".doc":
-            try:
-                import textract
-                text = textract.process(path).decode("utf-8")
-            except ImportError:
-                logger.warning("textract not installed. Skipping .doc file.")
-                return None
-        else:
-            raise ValueError("Unsupported file type")
+        from utils.admin_utils import get_config_value
+        return (get_config_value("name_fast_path_enabled", "true") or "true").lower() == "true"
+    except Exception:
+        return True
+
+
+def extract_text(path, settings=None, parallel=True):
+    """
+    Cleaned text of a resume / JD file, or None if unreadable or too short.
+    `settings` is an extraction_settings() dict; pass it explicitly from worker
+    processes, and set parallel=False there so pages are not fanned out again.
+    """
+    settings = settings or extraction_settings()
+    try:
+        text = extract_document(path, parallel=parallel, **settings)
 
         # Optional UTF-8 sanitization
         text = text.encode("utf-8", errors="ignore").decode("utf-8")
@@ -76,25 +79,75 @@ def clean_text(text):
 # ─────────────────────────────────────────────
 # Extract Name and Email
 # ─────────────────────────────────────────────
+# A header line like "Priya Sharma" or "RAVI KUMAR" is taken as the name without running NER
+NAME_HEADER_PATTERN = re.compile(r"^[A-Za-z][A-Za-z'\.\-]*(?:\s+[A-Za-z][A-Za-z'\.\-]*){1,3}$")
+NAME_HEADER_STOPWORDS = {
+    "resume", "curriculum", "vitae", "cv", "profile", "summary", "objective", "contact",
+    "developer", "engineer", "consultant", "manager", "analyst", "architect", "experience"
+}
+NER_HEAD_CHARS = 500
+
+_nlp_stats = {"docs": 0, "fast_path_docs": 0, "ner_docs": 0, "ner_seconds": 0.0}
+_nlp_stats_lock = threading.Lock()
+
+
+def _header_name(text):
+    for line in text.strip().split("\n")[:3]:
+        line = line.strip()
+        if not line:
+            continue
+        words = {w.lower().strip(".") for w in line.split()}
+        if NAME_HEADER_PATTERN.match(line) and not words & NAME_HEADER_STOPWORDS:
+            return line.title() if line.isupper() else line
+        return None
+    return None
+
+
+def extract_names(texts, batch_size=32, fast_path=True):
+    """
+    Candidate names for many documents. Obvious header lines skip NER; the rest
+    go through the lean NER pipeline in nlp.pipe batches. Falls back to the
+    first line when no PERSON entity is found.
+    """
+    texts = [t or "" for t in texts]
+    names = [(_header_name(t) if fast_path else None) for t in texts]
+    pending = [i for i, name in enumerate(names) if name is None and texts[i].strip()]
+
+    ner_seconds = 0.0
+    if pending:
+        start = time.perf_counter()
+        try:
+            docs = get_ner_nlp().pipe((texts[i][:NER_HEAD_CHARS] for i in pending), batch_size=batch_size)
+            for i, doc in zip(pending, docs):
+                names[i] = next((ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"), None)
+        except Exception as e:
+            logger.warning(f"NER name extraction failed: {e}")
+        ner_seconds = time.perf_counter() - start
+
+    with _nlp_stats_lock:
+        _nlp_stats["docs"] += len(texts)
+        _nlp_stats["fast_path_docs"] += len(texts) - len(pending)
+        _nlp_stats["ner_docs"] += len(pending)
+        _nlp_stats["ner_seconds"] += ner_seconds
+
+    return [name or (t.strip().split("\n")[0] if t.strip() else None) for name, t in zip(names, texts)]
+
+
+def get_nlp_stats():
+    """Name-extraction NLP cost: documents seen, fast-path share and mean NER time per document."""
+    with _nlp_stats_lock:
+        stats = dict(_nlp_stats)
+    stats["ner_seconds"] = round(stats["ner_seconds"], 4)
+    stats["ner_ms_per_doc"] = round(1000 * stats["ner_seconds"] / stats["ner_docs"], 3) if stats["ner_docs"] else None
+    return stats
+
+
 def extract_basic_info(text):
     email_match = re.search(r'\b[\w\.-]+@[\w\.-]+\.\w+\b', text)
     email = email_match.group(0) if email_match else None
 
-    name = None
-    try:
-        doc = nlp(text[:500])
-        for ent in doc.ents:
-            if ent.label_ == "PERSON":
-                name = ent.text.strip()
-                break
-    except:
-        pass
-
-    if not name:
-        name = text.strip().split("\n")[0]
-
     return {
-        "name": name,
+        "name": extract_names([text], fast_path=name_fast_path_enabled())[0],
         "email": email
     }
 
@@ -164,17 +217,8 @@ def infer_domain_from_text(text):
         return None
 
     try:
-        text_embed = model.encode(text, convert_to_tensor=True)
-        best_match = None
-        best_score = 0.0
-
-        for domain, concept in VERTICAL_SIGNAL_CONCEPTS.items():
-            concept_embed = model.encode(concept, convert_to_tensor=True)
-            sim = float(util.cos_sim(text_embed, concept_embed)[0][0])
-            if sim > best_score:
-                best_score = sim
-                best_match = domain
-
-        return best_match if best_score > 0.5 else None
+        labels, sims = concept_similarities(text, VERTICAL_SIGNAL_CONCEPTS)
+        best = int(sims.argmax())
+        return labels[best] if float(sims[best]) > 0.5 else None
     except:
         return None
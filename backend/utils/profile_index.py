@@ -0,0 +1,170 @@
+import threading
+import numpy as np
+from sqlalchemy import text
+from models import db, Profile
+from utils.logger import logger
+from utils.vector_codec import load_embedding, as_vector
+
+# ─────────────────────────────────────────────
+# Resident profile embedding matrix
+# ─────────────────────────────────────────────
+# Rows are L2-normalised so cosine similarity for the whole pool is a single
+# matrix-vector product. The matrix grows in place (amortised doubling) and a
+# removed row is back-filled with the last row, so updates never copy the pool.
+# Changes made by other processes are detected through the trigger-maintained
+# profile change counter (utils/migrations.py: migrate_profile_revision).
+
+_INITIAL_CAPACITY = 1024
+
+
+def profile_revision():
+    """Current value of the profile change counter; bumped on every insert, delete and embedding update."""
+    return db.session.execute(text("SELECT revision FROM change_counter WHERE name = 'profile'")).scalar() or 0
+
+
+def _normalise(vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+class ProfileEmbeddingIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._matrix = None
+        self._ids = None
+        self._pos = {}
+        self._size = 0
+        self._dim = None
+        self._signature = None
+        self._built = False
+
+    # ─────────────── bookkeeping ───────────────
+
+    def __len__(self):
+        return self._size
+
+    def _db_signature(self):
+        return profile_revision()
+
+    def _reset(self, dim, capacity=_INITIAL_CAPACITY):
+        self._dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._pos = {}
+        self._size = 0
+
+    def _grow(self):
+        capacity = max(self._matrix.shape[0] * 2, _INITIAL_CAPACITY)
+        matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+        ids = np.zeros(capacity, dtype=np.int64)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix, self._ids = matrix, ids
+
+    # ─────────────── mutations ───────────────
+
+    def rebuild(self):
+        """Load every profile embedding from the database."""
+        with self._lock:
+            signature = self._db_signature()  # read first, so a write during the load triggers another rebuild
+            rows = db.session.query(
+                Profile.id, Profile.embedding_blob, Profile.embedding_dim, Profile.embedding_vector
+            ).all()
+
+            self._dim = None
+            self._matrix = None
+            self._pos = {}
+            self._size = 0
+            for row in rows:
+                try:
+                    vec = load_embedding(row)
+                except Exception as e:
+                    logger.warning(f"Profile {row.id}: unreadable embedding ({e})")
+                    continue
+                if vec is not None and len(vec):
+                    self._upsert(row.id, vec)
+
+            self._signature = signature
+            self._built = True
+            logger.info(f"Profile index built with {self._size} vectors")
+
+    def upsert(self, profile_id, vec):
+        with self._lock:
+            if not self._built:
+                return
+            vec = as_vector(vec)
+            if vec is None or not len(vec):
+                self._remove(profile_id)
+            else:
+                self._upsert(profile_id, vec)
+            self._signature = self._db_signature()
+
+    def remove(self, profile_id):
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(profile_id)
+            self._signature = self._db_signature()
+
+    def _upsert(self, profile_id, vec):
+        if self._dim is None:
+            self._reset(len(vec))
+        if len(vec) != self._dim:
+            logger.warning(f"Profile {profile_id}: embedding dim {len(vec)} != index dim {self._dim}, skipped")
+            return
+
+        row = self._pos.get(profile_id)
+        if row is None:
+            if self._size == self._matrix.shape[0]:
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._pos[profile_id] = row
+            self._ids[row] = profile_id
+        self._matrix[row] = _normalise(vec)
+
+    def _remove(self, profile_id):
+        row = self._pos.pop(profile_id, None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            moved_id = int(self._ids[last])
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved_id
+            self._pos[moved_id] = row
+        self._size = last
+
+    def ensure_fresh(self):
+        """Rebuild if another process changed the profile table since our last sync."""
+        with self._lock:
+            if not self._built or self._db_signature() != self._signature:
+                self.rebuild()
+
+    # ─────────────── queries ───────────────
+
+    def scores(self, query_vec):
+        """Cosine similarity of query_vec against every profile: (ids, scores)."""
+        self.ensure_fresh()
+        with self._lock:
+            if not self._size:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+            query = _normalise(as_vector(query_vec))
+            sims = self._matrix[:self._size] @ query
+            return self._ids[:self._size].copy(), sims
+
+    def search(self, query_vec, k=None):
+        """Top-k (profile_id, cosine) pairs, best first."""
+        ids, sims = self.scores(query_vec)
+        if not len(ids):
+            return []
+        if k is not None and k < len(ids):
+            top = np.argpartition(-sims, k - 1)[:k]
+        else:
+            top = np.arange(len(ids))
+        top = top[np.argsort(-sims[top], kind="stable")]
+        return [(int(ids[i]), float(sims[i])) for i in top]
+
+
+profile_index = ProfileEmbeddingIndex()
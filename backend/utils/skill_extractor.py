@@ -1,7 +1,8 @@
 import re
 from collections import defaultdict
 
-# Controlled vocabularies — can be expanded
+# Built-in vocabularies. They seed the `skill` table (utils/skill_taxonomy.py)
+# and serve as the matcher until the taxonomy is loaded from the database.
 LANGUAGES = {"python", "java", "c#", "c++", "typescript", "javascript", "html", "css", "sql", "c"}
 FRAMEWORKS = {"react", "django", ".net", "asp.net", "spring", "flask", "express", "tailwind", "nunit"}
 TOOLS = {"postman", "swagger", "vscode", "eclipse", "jupyter", "powerbi", "figma", "github"}
@@ -11,12 +12,112 @@ SOFT = {"public speaking", "mentoring", "technical writing", "community", "event
 
 ALL_SKILLS = LANGUAGES | FRAMEWORKS | TOOLS | CLOUDS | LIBRARIES | SOFT
 
-def extract_skills_contextual(text):
-    clean_text = text.lower()
-    detected = set()
+# ─────────────────────────────────────────────
+# Single-pass skill matcher
+# ─────────────────────────────────────────────
+# The whole vocabulary is compiled into one trie-shaped regex that is scanned
+# once per text. Boundaries are symbol-aware rather than \b:
+#   - a skill that starts with a letter/digit must not follow one ("java" ≠ "ajava")
+#   - no skill may be followed by a letter/digit, '#' or '+', so "c" is not found
+#     inside "c#" / "c++" and "java" is not found inside "javascript"
+# \b got these wrong: "c#" and "c++" were only found when a letter came right
+# after them, " .net" was never found, and "c" was reported for every "c#".
+
+RIGHT_BOUNDARY = r"(?![\w#+])"
+
+
+def _trie_pattern(words):
+    """Regex alternation for `words` shaped as a trie; greedy, so longer words are tried first."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        end = node.get("") is True
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if end else body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """
+    Finds every vocabulary skill in a text with one regex scan.
+    `vocabulary` is an iterable of skills or a {term: canonical skill} dict (synonyms).
+    """
+
+    def __init__(self, vocabulary):
+        if not isinstance(vocabulary, dict):
+            vocabulary = {s: s for s in vocabulary}
+        self.terms = {t.lower().strip(): c.lower().strip() for t, c in vocabulary.items() if t and t.strip()}
+        self.skills = frozenset(self.terms.values())
+        word_start = [t for t in self.terms if re.match(r"\w", t)]
+        symbol_start = [t for t in self.terms if not re.match(r"\w", t)]
+
+        branches = []
+        if word_start:
+            branches.append(r"(?<!\w)(?=(" + _trie_pattern(word_start) + ")" + RIGHT_BOUNDARY + ")")
+        if symbol_start:
+            branches.append(r"(?=(" + _trie_pattern(symbol_start) + ")" + RIGHT_BOUNDARY + ")")
+        self.pattern = re.compile("|".join(branches)) if branches else None
+
+        # The scan reports the longest term at each position; shorter terms that
+        # are prefixes of it ("google" in "google cloud") are checked explicitly.
+        # A synonym only ever names its own skill ("c sharp" does not imply "c").
+        self._prefixes = {t: [p for p in self.terms if p != t and t.startswith(p)] if self.terms[t] == t else []
+                          for t in self.terms}
+        self._boundary = re.compile(RIGHT_BOUNDARY)
+
+    def find(self, text):
+        if not text or self.pattern is None:
+            return set()
+        clean_text = text.lower()
+        detected = set()
+        for match in self.pattern.finditer(clean_text):
+            term = next(group for group in match.groups() if group)
+            detected.add(self.terms[term])
+            for prefix in self._prefixes[term]:
+                if self._boundary.match(clean_text, match.start() + len(prefix)):
+                    detected.add(self.terms[prefix])
+        return detected
+
 
-    for skill in ALL_SKILLS:
-        if re.search(rf"\b{re.escape(skill)}\b", clean_text):
-            detected.add(skill)
+# (matcher, taxonomy version) swapped as one tuple so readers never see a mix.
+# Version 0 is the built-in vocabulary above.
+_active = (SkillMatcher(ALL_SKILLS), 0)
 
-    return sorted(detected)
+
+def install_matcher(matcher, version):
+    global _active
+    _active = (matcher, version)
+
+
+def current_skill_version():
+    return _active[1]
+
+
+def active_taxonomy():
+    """(vocabulary, version) of the installed matcher, to hand to worker processes."""
+    matcher, version = _active
+    return dict(matcher.terms), version
+
+
+def install_taxonomy(vocabulary, version):
+    """Process-pool initializer: compile and install a taxonomy from active_taxonomy()."""
+    install_matcher(SkillMatcher(vocabulary), version)
+
+
+def canonical_skill(term):
+    """The canonical skill a term or synonym names ("cpp" → "c++"); unknown terms come back normalized."""
+    term = " ".join(str(term or "").lower().split())
+    return _active[0].terms.get(term, term)
+
+
+def extract_skills_contextual(text):
+    return sorted(_active[0].find(text))
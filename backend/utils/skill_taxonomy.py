@@ -0,0 +1,195 @@
+import json
+import time
+import threading
+from datetime import datetime
+from sqlalchemy import text
+from models import db, Skill
+from utils.logger import logger
+from utils.skill_extractor import (
+    LANGUAGES, FRAMEWORKS, TOOLS, CLOUDS, LIBRARIES, SOFT,
+    SkillMatcher, install_matcher, current_skill_version
+)
+
+# ─────────────────────────────────────────────
+# Database-backed skill taxonomy
+# ─────────────────────────────────────────────
+# Skills, their category and their synonyms live in the `skill` table. The
+# active rows are compiled into one SkillMatcher, and install_matcher swaps it
+# in with a single assignment, so extraction never sees a half-built
+# vocabulary. Each edit stamps its row with revision = MAX(revision) + 1, and
+# that number is the taxonomy version. Profiles and resumes record the version
+# their skills were extracted with, and feature_store treats any other version
+# as stale. Other processes pick up edits through a throttled version check,
+# the same way config_cache does.
+
+VERSION_CHECK_SECONDS = 2.0
+
+SEED_CATEGORIES = {
+    "language": LANGUAGES,
+    "framework": FRAMEWORKS,
+    "tool": TOOLS,
+    "cloud": CLOUDS,
+    "library": LIBRARIES,
+    "soft": SOFT
+}
+SEED_SYNONYMS = {
+    "c#": ["c sharp", "csharp"],
+    "c++": ["cpp"],
+    ".net": ["dotnet"],
+    "powerbi": ["power bi"],
+    "vscode": ["vs code"],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud platform"]
+}
+
+_signature = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _normalize(term):
+    return " ".join(str(term or "").lower().split())
+
+
+def _synonyms(skill):
+    try:
+        return json.loads(skill.synonyms) if skill.synonyms else []
+    except ValueError:
+        return []
+
+
+def seed_taxonomy():
+    """Fill an empty skill table from the built-in vocabularies. Returns the number of rows added."""
+    if Skill.query.first() is not None:
+        return 0
+    for category, names in SEED_CATEGORIES.items():
+        for name in sorted(names):
+            db.session.add(Skill(name=name, category=category,
+                                 synonyms=json.dumps(SEED_SYNONYMS.get(name, [])), revision=1))
+    db.session.commit()
+    return sum(len(names) for names in SEED_CATEGORIES.values())
+
+
+def taxonomy_version():
+    return db.session.execute(text("SELECT MAX(revision) FROM skill")).scalar() or 0
+
+
+def _current_signature():
+    # The revision alone can miss a concurrent edit that reused the same number
+    row = db.session.execute(text("SELECT MAX(revision), COUNT(*), MAX(updated_at) FROM skill")).fetchone()
+    return (row[0] or 0, row[1], str(row[2]))
+
+
+def _build():
+    vocabulary = {}
+    for skill in Skill.query.filter(Skill.active.is_(True)).all():
+        vocabulary[skill.name] = skill.name
+        for synonym in _synonyms(skill):
+            vocabulary.setdefault(_normalize(synonym), skill.name)
+    return SkillMatcher(vocabulary)
+
+
+def refresh_matcher(force=False):
+    """
+    Recompile the matcher when the taxonomy changed. Cheap to call per request:
+    the version query runs at most once every VERSION_CHECK_SECONDS unless
+    `force` is set. Requires an app context.
+    """
+    global _signature, _checked_at
+    with _lock:
+        if not force and _signature is not None and time.monotonic() - _checked_at < VERSION_CHECK_SECONDS:
+            return False
+        signature = _current_signature()
+        _checked_at = time.monotonic()
+        if signature == _signature:
+            return False
+        matcher = _build()
+        install_matcher(matcher, signature[0])
+        _signature = signature
+    logger.info(f"Skill taxonomy v{signature[0]} loaded ({len(matcher.skills)} skills, {len(matcher.terms)} terms)")
+    return True
+
+
+def load_taxonomy():
+    """Seed if empty, then compile the matcher. Called at startup after migrations."""
+    seeded = seed_taxonomy()
+    refresh_matcher(force=True)
+    return {"seeded": seeded, "version": current_skill_version()}
+
+
+# ─────────────── admin edits ───────────────
+
+def skill_to_dict(skill):
+    return {
+        "id": skill.id,
+        "name": skill.name,
+        "category": skill.category,
+        "synonyms": _synonyms(skill),
+        "active": bool(skill.active),
+        "revision": skill.revision,
+        "updated_at": skill.updated_at.strftime("%Y-%m-%d %H:%M:%S") if skill.updated_at else None
+    }
+
+
+def list_skills(include_inactive=False):
+    query = Skill.query
+    if not include_inactive:
+        query = query.filter(Skill.active.is_(True))
+    return {
+        "version": taxonomy_version(),
+        "skills": [skill_to_dict(s) for s in query.order_by(Skill.category, Skill.name).all()]
+    }
+
+
+def _commit_edit(skill):
+    skill.revision = taxonomy_version() + 1
+    skill.updated_at = datetime.utcnow()
+    db.session.add(skill)
+    db.session.commit()
+    refresh_matcher(force=True)
+
+
+def save_skill(data):
+    """Create or update a skill from {name, category?, synonyms?, active?}. Returns (body, status)."""
+    name = _normalize(data.get("name"))
+    if not name:
+        return {"error": "Missing skill name"}, 400
+
+    synonyms = data.get("synonyms")
+    if synonyms is not None:
+        if isinstance(synonyms, str):
+            synonyms = synonyms.split(",")
+        if not isinstance(synonyms, list):
+            return {"error": "synonyms must be a list or comma-separated string"}, 400
+        synonyms = sorted({_normalize(s) for s in synonyms if _normalize(s)} - {name})
+
+        # A term may only ever resolve to one canonical skill
+        for other in Skill.query.filter(Skill.name != name, Skill.active.is_(True)).all():
+            clash = set(synonyms) & ({other.name} | set(_synonyms(other)))
+            if clash:
+                return {"error": f"'{sorted(clash)[0]}' already belongs to skill '{other.name}'"}, 409
+
+    skill = Skill.query.filter_by(name=name).first()
+    created = skill is None
+    if created:
+        skill = Skill(name=name, synonyms="[]", active=True)
+    if "category" in data:
+        skill.category = _normalize(data.get("category")) or None
+    if synonyms is not None:
+        skill.synonyms = json.dumps(synonyms)
+    if "active" in data:
+        skill.active = str(data.get("active")).lower() in ("1", "true", "yes", "on")
+
+    _commit_edit(skill)
+    return {"message": f"Skill '{name}' {'created' if created else 'updated'}",
+            "skill": skill_to_dict(skill), "version": current_skill_version()}, 201 if created else 200
+
+
+def deactivate_skill(skill_id):
+    """Soft delete: the row stays so the edit bumps the version and can be undone."""
+    skill = Skill.query.get(skill_id)
+    if skill is None:
+        return {"error": "Skill not found"}, 404
+    skill.active = False
+    _commit_edit(skill)
+    return {"message": f"Skill '{skill.name}' deactivated", "version": current_skill_version()}, 200
@@ -0,0 +1,198 @@
+import os
+import json
+import hashlib
+import tempfile
+from collections import namedtuple
+from datetime import datetime
+from models import db, DocumentCache
+from utils.logger import logger
+from utils.parser import extract_text
+from utils.embedding import generate_embedding
+from utils.vector_codec import pack_embedding, load_embedding
+from utils.model_registry import SENTENCE_MODEL_NAME
+from utils.feature_store import FEATURE_VERSION, compute_features, features_fresh, skills_fresh, refresh_skills
+
+# ─────────────────────────────────────────────
+# Content-addressed upload store
+# ─────────────────────────────────────────────
+# Uploads are hashed (sha256) while they stream to disk and saved as
+# <hash><ext>. Two different files can no longer overwrite each other because
+# they share a name, and an identical re-upload lands on the file already
+# stored. Extracted text, scoring features and the embedding are cached per
+# hash in document_cache. A repeat upload, or a match that needs a row's text
+# again, skips parsing and encoding entirely. Bulk and drop-folder ingestion
+# hash their files too and share the same cache.
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CHUNK_SIZE = 1024 * 1024
+
+StoredUpload = namedtuple("StoredUpload", "content_hash filename path size original_name")
+
+
+def store_stream(stream, folder, original_name):
+    """Stream a file-like object into `folder` under its content hash."""
+    ext = os.path.splitext(original_name)[1].lower()
+    os.makedirs(folder, exist_ok=True)
+
+    digest, size = hashlib.sha256(), 0
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        content_hash = digest.hexdigest()
+        filename = f"{content_hash}{ext}"
+        path = os.path.join(folder, filename)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return StoredUpload(content_hash, filename, path, size, original_name)
+
+
+def save_upload(file_storage, folder, default_name="upload.pdf"):
+    """Stream an uploaded file into `folder` under its content hash."""
+    return store_stream(file_storage.stream, folder, file_storage.filename or default_name)
+
+
+def hash_file(path):
+    """sha256 of a file already on disk (drop-folder ingestion leaves files where they are)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ─────────────── per-hash cache ───────────────
+
+def _entry(content_hash, create=False, **defaults):
+    entry = DocumentCache.query.filter_by(content_hash=content_hash).first()
+    if entry is None and create:
+        entry = DocumentCache(content_hash=content_hash, **defaults)
+        db.session.add(entry)
+    if entry is not None:
+        entry.last_used_at = datetime.utcnow()
+    return entry
+
+
+def cached_text(content_hash):
+    entry = _entry(content_hash) if content_hash else None
+    return entry.extracted_text if entry else None
+
+
+def cached_documents(content_hashes):
+    """{content_hash: DocumentCache} for those of `content_hashes` already cached, in one query."""
+    hashes = sorted({h for h in content_hashes if h})
+    if not hashes:
+        return {}
+    entries = DocumentCache.query.filter(DocumentCache.content_hash.in_(hashes)).all()
+    now = datetime.utcnow()
+    for entry in entries:
+        entry.last_used_at = now
+    return {entry.content_hash: entry for entry in entries}
+
+
+def cached_embedding(entry):
+    if entry is not None and entry.embedding_blob and entry.embedding_model == SENTENCE_MODEL_NAME:
+        return load_embedding(entry).tolist()
+    return None
+
+
+def cached_features(entry):
+    """Cached features, with only the skills re-extracted after a taxonomy edit; None if stale."""
+    features = json.loads(entry.features) if entry is not None and entry.features else None
+    if features is None or not features_fresh(features):
+        return None
+    if not skills_fresh(features) and entry.extracted_text:
+        features.update(refresh_skills(entry.extracted_text))
+        entry.features = json.dumps(features)
+    return features if skills_fresh(features) else None
+
+
+def remember(content_hash, text, embedding=None, features=None, extension=None, size=None):
+    """
+    Record what bulk / drop-folder ingestion computed for a document, so a
+    later upload or ingest of the same bytes reuses it. The caller commits.
+    """
+    entry = _entry(content_hash, create=True, extension=extension, size=size)
+    if text and not entry.extracted_text:
+        entry.extracted_text = text
+    if embedding is not None and len(embedding) and cached_embedding(entry) is None:
+        for key, value in pack_embedding(embedding).items():
+            setattr(entry, key, value)
+    if features is not None:
+        entry.features = json.dumps(features)
+        entry.feature_version = FEATURE_VERSION
+    return entry
+
+
+def process_upload(upload):
+    """
+    (text, embedding, features) for a stored upload, computing only what the
+    document cache does not already hold. The caller commits the session.
+    Returns text=None when the file has no extractable text.
+    """
+    entry = _entry(upload.content_hash, create=True,
+                   extension=os.path.splitext(upload.filename)[1], size=upload.size)
+
+    # Only real text is cached: an empty result may be a transient failure, so it is retried
+    if not entry.extracted_text:
+        entry.extracted_text = extract_text(upload.path)
+    text = entry.extracted_text
+    if not text or not text.strip():
+        return None, [], None
+
+    embedding = cached_embedding(entry)
+    if not embedding:
+        embedding = generate_embedding(text)
+        for key, value in pack_embedding(embedding).items():
+            setattr(entry, key, value)
+
+    features = cached_features(entry)
+    if features is None:
+        features = compute_features(text)
+        entry.features = json.dumps(features)
+        entry.feature_version = FEATURE_VERSION
+    else:
+        logger.info(f"Upload {upload.original_name}: reused cached extraction for {upload.content_hash[:12]}")
+
+    return text, embedding, features
+
+
+# ─────────────── text of existing rows ───────────────
+
+def resolve_upload_path(path):
+    """Stored paths look like '/uploads/jds/x.pdf'; map them onto the backend folder."""
+    if not path:
+        return None
+    if os.path.exists(path):
+        return path
+    candidate = os.path.join(BASE_DIR, path.lstrip("/\\"))
+    return candidate if os.path.exists(candidate) else path
+
+
+def document_text(row, path=None):
+    """
+    Extracted text of a JD / Profile / Resume row: the stored column, else the
+    document cache for its content hash, else a fresh extraction of its file.
+    A recovered text is written back onto the row (the caller commits).
+    """
+    if row.extracted_text:
+        return row.extracted_text
+    text = cached_text(getattr(row, "content_hash", None))
+    if not text and path:
+        text = extract_text(resolve_upload_path(path))
+    if text:
+        row.extracted_text = text
+    return text
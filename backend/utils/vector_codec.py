@@ -0,0 +1,65 @@
+import json
+import numpy as np
+from utils.model_registry import SENTENCE_MODEL_NAME
+
+# ─────────────────────────────────────────────
+# Binary embedding storage
+# ─────────────────────────────────────────────
+# Embeddings are stored as raw little-endian float32 bytes together with their
+# dimension and the model that produced them. Decoding is a zero-copy view.
+
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+def encode_vector(vec):
+    """List / ndarray of floats → raw float32 bytes."""
+    return np.asarray(vec, dtype=VECTOR_DTYPE).tobytes()
+
+
+def decode_vector(blob, dim=None):
+    """Raw float32 bytes → read-only NumPy view (no copy, no parsing)."""
+    if not blob:
+        return None
+    vec = np.frombuffer(blob, dtype=VECTOR_DTYPE)
+    if dim is not None and vec.shape[0] != dim:
+        raise ValueError(f"Embedding has {vec.shape[0]} dims, expected {dim}")
+    return vec
+
+
+def pack_embedding(vec, model_name=SENTENCE_MODEL_NAME):
+    """Column values for a freshly computed embedding."""
+    if vec is None or len(vec) == 0:
+        return {"embedding_blob": None, "embedding_dim": None, "embedding_model": None}
+    return {
+        "embedding_blob": encode_vector(vec),
+        "embedding_dim": len(vec),
+        "embedding_model": model_name
+    }
+
+
+def load_embedding(row):
+    """
+    Embedding of a JD / Profile / Resume row as a float32 array.
+    Falls back to the legacy JSON column for rows that were not migrated yet.
+    """
+    blob = getattr(row, "embedding_blob", None)
+    if blob:
+        return decode_vector(blob, getattr(row, "embedding_dim", None))
+
+    legacy = getattr(row, "embedding_vector", None)
+    if legacy:
+        return np.asarray(json.loads(legacy), dtype=VECTOR_DTYPE)
+    return None
+
+
+def as_vector(value):
+    """Accept an ndarray, a list, raw bytes or a legacy JSON string."""
+    if value is None:
+        return None
+    if isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return decode_vector(bytes(value))
+    if isinstance(value, str):
+        return np.asarray(json.loads(value), dtype=VECTOR_DTYPE)
+    return np.asarray(value, dtype=VECTOR_DTYPE)
@@ -0,0 +1,244 @@
+import os
+import time
+import queue
+import threading
+from collections import deque
+from models import db, Resume, IngestCheckpoint
+from utils.logger import logger
+from utils.bulk_ingest import parse_document, extraction_pool, SUPPORTED_EXTENSIONS
+from utils.parser import extraction_settings
+from utils.embedding import generate_embeddings
+from utils.concept_cache import encode_texts
+from utils.vector_codec import pack_embedding
+from utils.feature_store import compute_features, resume_feature_columns
+from utils.upload_store import hash_file, remember
+from utils.skill_taxonomy import refresh_matcher
+from utils.skill_extractor import current_skill_version
+
+# ─────────────────────────────────────────────
+# Drop-folder ingestion (resumable)
+# ─────────────────────────────────────────────
+# New files in the watched folder flow through
+#     scan → extract → batch → embed → store
+# Each stage is a generator. Stages are joined by bounded queues, so a slow
+# stage pushes back on the ones before it and memory stays flat however many
+# files are waiting. The store stage commits every batch of Resume rows in
+# the same transaction as their ingest_checkpoint rows. After a restart, any
+# file whose (size, mtime) is already checkpointed is skipped. Files are
+# hashed alongside extraction, and what each one yields is recorded in the
+# shared document cache (utils/upload_store.py) under that hash.
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_WATCH_DIR = os.path.join(BASE_DIR, '..', 'uploads', 'incoming')
+
+SETTLE_SECONDS = 2.0   # ignore files modified more recently than this (still being copied)
+_DONE = object()
+
+
+# ─────────────── plumbing ───────────────
+
+def buffered(generator, maxsize):
+    """
+    Run `generator` in a thread and yield its items through a bounded queue.
+    Closing the consumer (or an error downstream) stops the producer thread.
+    """
+    q = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    failure = []
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def pump():
+        try:
+            for item in generator:
+                if not put(item):
+                    return
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            put(_DONE)
+
+    threading.Thread(target=pump, daemon=True, name="ingest-stage").start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        stop.set()
+    if failure:
+        raise failure[0]
+
+
+# ─────────────── stages ───────────────
+
+def scan(folder, known):
+    """Yield (path, size, mtime_ns) for settled, supported files not already checkpointed."""
+    cutoff = time.time_ns() - int(SETTLE_SECONDS * 1e9)
+    for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+        if not entry.is_file() or entry.name.startswith("."):
+            continue
+        if os.path.splitext(entry.name)[1].lower() not in SUPPORTED_EXTENSIONS:
+            continue
+        stat = entry.stat()
+        path = os.path.abspath(entry.path)
+        if stat.st_mtime_ns > cutoff or known.get(path) == (stat.st_size, stat.st_mtime_ns):
+            continue
+        yield path, stat.st_size, stat.st_mtime_ns
+
+
+def parse_file(path, settings=None):
+    """parse_document() plus the file's content hash. Runs in a pool worker."""
+    doc = parse_document(path, settings)
+    try:
+        doc["content_hash"] = hash_file(path)
+    except OSError as e:
+        doc.setdefault("error", str(e))
+    return doc
+
+
+def extract(files, pool, window, settings):
+    """Parse files on the process pool with at most `window` in flight, preserving order."""
+    in_flight = deque()
+    for item in files:
+        in_flight.append((item, pool.submit(parse_file, item[0], settings)))
+        if len(in_flight) >= window:
+            item, future = in_flight.popleft()
+            yield item, future.result()
+    while in_flight:
+        item, future = in_flight.popleft()
+        yield item, future.result()
+
+
+def batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def embed(batches, batch_size):
+    """Batch-encode the successfully parsed docs of each batch; failures pass through untouched."""
+    for batch in batches:
+        texts = [doc["text"] for _, doc in batch if not doc.get("error")]
+        try:
+            embeddings = generate_embeddings(texts, batch_size=batch_size) if texts else []
+            text_vecs = encode_texts(texts, batch_size=batch_size) if texts else []
+        except Exception as e:
+            yield [(item, {"error": f"Embedding failed: {e}"}, None, None) for item, _ in batch]
+            continue
+        vectors = iter(zip(embeddings, text_vecs))
+        yield [(item, doc, *((None, None) if doc.get("error") else next(vectors))) for item, doc in batch]
+
+
+def store(batches, stats):
+    """Write Resume rows and their checkpoints, one commit per batch."""
+    for batch in batches:
+        checkpoints = {c.path: c for c in IngestCheckpoint.query.filter(
+            IngestCheckpoint.path.in_([item[0] for item, _, _, _ in batch])).all()}
+        for (path, size, mtime_ns), doc, embedding, text_vec in batch:
+            checkpoint = checkpoints.get(path) or IngestCheckpoint(path=path)
+            checkpoint.size, checkpoint.mtime_ns = size, mtime_ns
+            if doc.get("error"):
+                checkpoint.status, checkpoint.error = "failed", doc["error"]
+                stats["failed"] += 1
+            else:
+                features = compute_features(doc["text"], text_vec=text_vec, text_features=doc["text_features"])
+                remember(doc["content_hash"], doc["text"], embedding=embedding, features=features,
+                         extension=os.path.splitext(path)[1].lower(), size=size)
+                columns = dict(
+                    name=os.path.basename(path),
+                    file_path=path,
+                    email=doc["email"] or "not available",
+                    content_hash=doc["content_hash"],
+                    **resume_feature_columns(features),
+                    extracted_text=doc["text"],
+                    **pack_embedding(embedding)
+                )
+                # A file that changed since it was ingested updates its Resume instead of duplicating it
+                resume = Resume.query.get(checkpoint.resume_id) if checkpoint.resume_id else None
+                if resume is None:
+                    resume = Resume(**columns)
+                    db.session.add(resume)
+                else:
+                    for key, value in columns.items():
+                        setattr(resume, key, value)
+                db.session.flush()
+                checkpoint.status, checkpoint.error, checkpoint.resume_id = "done", None, resume.id
+                stats["ingested"] += 1
+            db.session.add(checkpoint)
+        db.session.commit()
+        yield len(batch)
+
+
+# ─────────────── driver ───────────────
+
+def _checkpointed(folder):
+    prefix = os.path.abspath(folder) + os.sep
+    rows = db.session.query(IngestCheckpoint.path, IngestCheckpoint.size, IngestCheckpoint.mtime_ns).filter(
+        IngestCheckpoint.path.like(prefix + "%")).all()
+    return {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+
+
+def ingest_pending(folder, pool, batch_size=16, queue_size=4, window=8):
+    """One pass over the folder: ingest every new or changed file. Requires an app context."""
+    stats = {"ingested": 0, "failed": 0}
+    start = time.time()
+    files = buffered(scan(folder, _checkpointed(folder)), queue_size * batch_size)
+    parsed = buffered(extract(files, pool, window, extraction_settings()), queue_size * batch_size)
+    encoded = buffered(embed(batched(parsed, batch_size), batch_size), queue_size)
+    for _ in store(encoded, stats):
+        pass
+
+    processed = stats["ingested"] + stats["failed"]
+    if processed:
+        elapsed = time.time() - start
+        stats["docs_per_second"] = round(processed / elapsed, 2) if elapsed > 0 else 0.0
+        logger.info(f"Watch ingest {folder}: {stats}")
+    return stats
+
+
+def watch(folder=None, workers=None, batch_size=16, queue_size=4, poll_interval=5.0, once=False):
+    folder = os.path.abspath(folder or DEFAULT_WATCH_DIR)
+    os.makedirs(folder, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"Watching {folder} for resumes ({workers} extraction workers)")
+
+    totals = {"ingested": 0, "failed": 0}
+    pool, pool_version = None, None
+    try:
+        while True:
+            try:
+                refresh_matcher()
+                if pool is None or pool_version != current_skill_version():
+                    # Workers hold the taxonomy they were started with; restart them after an edit
+                    if pool is not None:
+                        pool.shutdown()
+                    pool, pool_version = extraction_pool(workers), current_skill_version()
+                stats = ingest_pending(folder, pool, batch_size=batch_size, queue_size=queue_size,
+                                       window=workers * 2)
+                totals["ingested"] += stats["ingested"]
+                totals["failed"] += stats["failed"]
+            except Exception:
+                db.session.rollback()
+                logger.exception("Watch ingest pass failed; retrying next poll")
+            finally:
+                db.session.remove()
+            if once:
+                return totals
+            time.sleep(poll_interval)
+    finally:
+        if pool is not None:
+            pool.shutdown()
@@ -11,9 +11,12 @@ import {
   FileText,
 } from 'lucide-react';
 import { motion } from 'framer-motion';
+import axios from 'axios';
 
 export default function MatchCard({ match }) {
   const [isExpanded, setIsExpanded] = useState(false);
+  const [lazyExplanation, setLazyExplanation] = useState(null);
+  const [loadingExplanation, setLoadingExplanation] = useState(false);
   const [showPreview, setShowPreview] = useState(false);
 
   const {
@@ -26,10 +29,31 @@ export default function MatchCard({ match }) {
     resume_path,
     file_path,
     rank = 1,
+    match_id,
   } = match;
 
+  const rawExplanation = explanation || lazyExplanation;
   const safeExplanation =
-    typeof explanation === 'string' ? JSON.parse(explanation || '{}') : explanation || {};
+    typeof rawExplanation === 'string'
+      ? JSON.parse(rawExplanation || '{}')
+      : rawExplanation || {};
+
+  // Explanations are generated on first expand and cached server-side
+  const toggleExplanation = async () => {
+    const next = !isExpanded;
+    setIsExpanded(next);
+    if (next && !rawExplanation && match_id && !loadingExplanation) {
+      setLoadingExplanation(true);
+      try {
+        const res = await axios.get(`http://127.0.0.1:5000/match/explanation/${match_id}`);
+        setLazyExplanation(res.data.explanation || {});
+      } catch (err) {
+        console.error('Failed to load explanation', err);
+      } finally {
+        setLoadingExplanation(false);
+      }
+    }
+  };
 
   const labelColors = {
     "Highly Recommended": "bg-green-100 text-green-700 border-green-300",
@@ -76,9 +100,9 @@ export default function MatchCard({ match }) {
           <div className="flex gap-4 text-sm">
             <button
               className="flex items-center gap-1 px-3 py-1.5 rounded-full bg-purple-50 text-purple-600 hover:bg-purple-100 transition"
-              onClick={() => setIsExpanded(!isExpanded)}
+              onClick={toggleExplanation}
             >
-              Explain Match {isExpanded ? <ChevronUp size={16} /> : <ChevronDown size={16} />}
+              {loadingExplanation ? 'Explaining…' : 'Explain Match'} {isExpanded ? <ChevronUp size={16} /> : <ChevronDown size={16} />}
             </button>
             {previewURL && (
               <button
@@ -16,10 +16,13 @@ import {
 } from 'lucide-react';
 
 import { motion } from 'framer-motion';
+import axios from 'axios';
 import ConsultantEmailModal from './ConsultantEmailModal';
  
 export default function TopMatchCard({ match }) {
   const [isExpanded, setIsExpanded] = useState(false);
+  const [lazyExplanation, setLazyExplanation] = useState(null);
+  const [loadingExplanation, setLoadingExplanation] = useState(false);
   const [showPreview, setShowPreview] = useState(false);
   const [showConsultantEmailModal, setShowConsultantEmailModal] = useState(false);
  
@@ -38,13 +41,32 @@ export default function TopMatchCard({ match }) {
     rank = 1,
     email,
     jd_id,
-    jd_title
+    jd_title,
+    match_id
   } = match;
  
+  const rawExplanation = explanation || lazyExplanation;
   const safeExplanation =
-    typeof explanation === 'string'
-      ? JSON.parse(explanation || '{}')
-      : explanation || {};
+    typeof rawExplanation === 'string'
+      ? JSON.parse(rawExplanation || '{}')
+      : rawExplanation || {};
+
+  // Explanations are generated on first expand and cached server-side
+  const toggleExplanation = async () => {
+    const next = !isExpanded;
+    setIsExpanded(next);
+    if (next && !rawExplanation && match_id && !loadingExplanation) {
+      setLoadingExplanation(true);
+      try {
+        const res = await axios.get(`http://127.0.0.1:5000/match/explanation/${match_id}`);
+        setLazyExplanation(res.data.explanation || {});
+      } catch (err) {
+        console.error('Failed to load explanation', err);
+      } finally {
+        setLoadingExplanation(false);
+      }
+    }
+  };
  
   const labelColors = {
     "Highly Recommended": "bg-green-100 text-green-700 border-green-300",
@@ -167,9 +189,9 @@ export default function TopMatchCard({ match }) {
           <div className="flex gap-4 text-sm">
             <button
               className="flex items-center gap-1 px-3 py-1.5 rounded-full bg-purple-50 text-purple-600 hover:bg-purple-100 transition"
-              onClick={() => setIsExpanded(!isExpanded)}
+              onClick={toggleExplanation}
             >
-              Explain Match {isExpanded ? <ChevronUp size={16} /> : <ChevronDown size={16} />}
+              {loadingExplanation ? 'Explaining…' : 'Explain Match'} {isExpanded ? <ChevronUp size={16} /> : <ChevronDown size={16} />}
             </button>
             {previewURL && (
               <button